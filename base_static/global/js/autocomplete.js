@@ -0,0 +1,38 @@
+// Sugestões da busca do cabeçalho a cada tecla (/api/contacts/autocomplete/)
+(function () {
+  const input = document.getElementById('search');
+  const list = document.getElementById('search-suggestions');
+  if (!input || !list) return;
+
+  const url = input.dataset.autocompleteUrl;
+  let controller = null;
+
+  input.addEventListener('input', async () => {
+    const term = input.value.trim();
+    // Só a resposta da última tecla interessa
+    if (controller) controller.abort();
+    if (!term) {
+      list.replaceChildren();
+      return;
+    }
+
+    controller = new AbortController();
+    try {
+      const response = await fetch(`${url}?q=${encodeURIComponent(term)}`, {
+        signal: controller.signal,
+        credentials: 'same-origin',
+      });
+      if (!response.ok) return;
+
+      const data = await response.json();
+      list.replaceChildren(...data.results.map((contact) => {
+        const option = document.createElement('option');
+        option.value = contact[contact.match];
+        option.label = `${contact.first_name} ${contact.last_name}`.trim();
+        return option;
+      }));
+    } catch (error) {
+      if (error.name !== 'AbortError') throw error;
+    }
+  });
+})();
@@ -1,5 +1,7 @@
 from django.contrib import admin
+from django.utils import timezone
 from contact import models
+from contact.forms import CategoryChoiceField
 
 @admin.register(models.Contact)
 class ContactAdmin(admin.ModelAdmin):
@@ -11,6 +13,9 @@ class ContactAdmin(admin.ModelAdmin):
     list_max_show_all = 100
     list_editable = 'first_name', 'last_name', 'category', 'show',
     list_display_links = 'id', 'phone',
+    list_select_related = 'category',
+    # Evita o segundo COUNT(*) (total sem filtros) em tabelas grandes
+    show_full_result_count = False
     date_hierarchy = 'create_date'
     
     fieldsets = (
@@ -30,6 +35,13 @@ class ContactAdmin(admin.ModelAdmin):
     )
     readonly_fields = ('create_date',)
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # list_editable monta um select de categoria por linha: todos leem o
+        # cache de categorias (contact/categories.py), sem consultar a tabela
+        if db_field.name == 'category':
+            kwargs.setdefault('form_class', CategoryChoiceField)
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
 @admin.register(models.Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = 'id', 'name',
@@ -64,3 +76,30 @@ class ProfileAdmin(admin.ModelAdmin):
     ordering = '-id',
     search_fields = 'user__username', 'user__email', 'public_id',
     list_per_page = 20
+
+
+@admin.register(models.PictureUpload)
+class PictureUploadAdmin(admin.ModelAdmin):
+    list_display = 'id', 'contact', 'file_name', 'status', 'attempts', 'next_attempt_at', 'created_at',
+    ordering = '-id',
+    list_filter = 'status',
+    search_fields = 'file_name', 'contact__first_name',
+    list_per_page = 20
+    readonly_fields = 'staged_path', 'created_at', 'last_error',
+
+
+@admin.register(models.OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = 'id', 'subject', 'to', 'status', 'attempts', 'next_attempt_at', 'created_at',
+    ordering = '-id',
+    list_filter = 'status',
+    search_fields = 'subject',
+    list_per_page = 20
+    readonly_fields = 'created_at', 'last_error',
+    actions = 'retry',
+
+    @admin.action(description='Reenviar emails selecionados')
+    def retry(self, request, queryset):
+        queryset.update(
+            status=models.OutgoingEmail.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now(),
+        )
@@ -0,0 +1,67 @@
+"""
+Backend de autenticação com o usuário logado em cache.
+
+O ``AuthenticationMiddleware`` lê o usuário da sessão em toda requisição
+(``get_user``): com ``ModelBackend`` é um ``SELECT`` em ``auth_user`` antes
+mesmo da view. Aqui o usuário fica no cache padrão por
+``CONTACT_USER_CACHE_TIMEOUT`` segundos; dentro da requisição o Django já o
+guarda em ``request.user``.
+
+Qualquer ``save()``/``delete()`` do usuário (user_update, troca de senha,
+``last_login`` no login) apaga a entrada (contact/signals.py), e o hash da
+senha continua sendo conferido com o da sessão a cada requisição. Alterações
+feitas com ``update()`` ou direto no banco valem em até
+``CONTACT_USER_CACHE_TIMEOUT`` segundos.
+
+A entrada só é apagada no cache padrão: com local-memory, no processo que
+fez a alteração. Por isso o cache do usuário vem desligado sem um cache
+compartilhado (project/settings.py).
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+
+
+def user_cache_key(user_id):
+    return f'contact:user:{user_id}'
+
+
+def forget_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def _timeout():
+    return getattr(settings, 'CONTACT_USER_CACHE_TIMEOUT', 0)
+
+
+class CachedModelBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(request, username, password, **kwargs)
+        if user is None and password is not None:
+            # Encerra a tentativa: o ModelBackend seguinte (sessões antigas,
+            # ver settings.AUTHENTICATION_BACKENDS) conferiria a senha de novo
+            raise PermissionDenied
+        return user
+
+    def get_user(self, user_id):
+        if _timeout() <= 0:
+            return super().get_user(user_id)
+
+        user = cache.get(user_cache_key(user_id))
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(user_cache_key(user_id), user, _timeout())
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        if _timeout() <= 0:
+            return await super().aget_user(user_id)
+
+        user = await cache.aget(user_cache_key(user_id))
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is not None:
+                await cache.aset(user_cache_key(user_id), user, _timeout())
+        return user if user is not None and self.user_can_authenticate(user) else None
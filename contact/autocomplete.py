@@ -0,0 +1,195 @@
+"""
+Autocomplete dos contatos: os primeiros ``limit`` contatos cujo nome,
+sobrenome, e-mail ou telefone começa com o prefixo digitado.
+
+Feito para ser chamado a cada tecla: uma única consulta (``UNION ALL`` de
+uma subconsulta por coluna), cada uma lendo só ``limit`` entradas do índice
+de prefixo ``(owner_id, lower(coluna))`` criado pela migração
+0021_contact_prefix_index (ver migrations/_prefix_index.py):
+
+- PostgreSQL: ``lower(coluna) LIKE 'pre%'`` e ``ORDER BY ... USING ~<~``,
+  ambos atendidos pelo índice ``text_pattern_ops``;
+- SQLite: intervalo ``lower(coluna) >= 'pre' AND lower(coluna) < 'prf'``
+  (o ``lower()`` do SQLite só converte letras ASCII);
+- demais bancos: ``istartswith`` pelo ORM.
+
+Com ``CONTACT_AUTOCOMPLETE_CACHE_SIZE`` > 0 os resultados também ficam num
+LRU em memória do processo, por dono e versão da lista do dono
+(contact/cache.py): qualquer alteração nos contatos invalida as entradas. Um
+prefixo mais longo é respondido a partir de um mais curto cuja lista veio
+completa (menos de ``limit`` resultados), sem ir ao banco.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+from contact import cache as contact_cache
+from contact.models import Contact
+
+LIMIT = 8
+MAX_LIMIT = 20
+MAX_PREFIX_LENGTH = 50
+
+# Em ordem de prioridade: um contato que casa pelo nome vem antes de um que
+# casa só pelo e-mail
+FIELDS = ('first_name', 'last_name', 'email', 'phone')
+RESULT_FIELDS = ('id', 'first_name', 'last_name', 'phone', 'email')
+
+
+def normalize(prefix):
+    return prefix.strip().lower()[:MAX_PREFIX_LENGTH]
+
+
+def _match(row, prefix):
+    """``(prioridade, valor)`` do primeiro campo de ``row`` que começa com ``prefix``"""
+    for position, field in enumerate(FIELDS):
+        value = (row[field] or '').lower()
+        if value.startswith(prefix):
+            return position, value
+    return None
+
+
+def _rank(rows, prefix, limit):
+    ranked = {}
+    for row in rows:
+        match = _match(row, prefix)
+        if match is not None and row['id'] not in ranked:
+            ranked[row['id']] = (match, row)
+
+    ordered = sorted(ranked.values(), key=lambda item: (item[0], item[1]['id']))
+    return [{**row, 'match': FIELDS[match[0]]} for match, row in ordered[:limit]]
+
+
+# Consulta ----------------------------------------------------------------------
+
+def _like_pattern(prefix):
+    escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'{escaped}%'
+
+
+def _prefix_end(prefix):
+    # Menor texto maior que todos os que começam com ``prefix``
+    last = ord(prefix[-1])
+    if last >= 0x10FFFF:
+        return prefix + chr(0x10FFFF)
+    return prefix[:-1] + chr(last + 1)
+
+
+def _union_sql(owner_id, prefix, limit):
+    table = connection.ops.quote_name(Contact._meta.db_table)
+    columns = ', '.join(RESULT_FIELDS)
+    parts, params = [], []
+
+    for field in FIELDS:
+        if connection.vendor == 'postgresql':
+            where, where_params = f'lower({field}) LIKE %s', [_like_pattern(prefix)]
+            order = f'lower({field}) USING ~<~'
+        else:
+            where, where_params = f'lower({field}) >= %s AND lower({field}) < %s', [prefix, _prefix_end(prefix)]
+            order = f'lower({field})'
+
+        parts.append(
+            f'SELECT * FROM (SELECT {columns} FROM {table} '
+            f'WHERE owner_id = %s AND show = %s AND {where} ORDER BY {order} LIMIT %s) AS {field}_matches'
+        )
+        params += [owner_id, True, *where_params, limit]
+
+    return ' UNION ALL '.join(parts), params
+
+
+def _query(owner_id, prefix, limit):
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        rows = []
+        for field in FIELDS:
+            rows += Contact.objects.filter(
+                Q(**{f'{field}__istartswith': prefix}), owner_id=owner_id, show=True,
+            ).order_by(field).values(*RESULT_FIELDS)[:limit]
+        return rows
+
+    sql, params = _union_sql(owner_id, prefix, limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [dict(zip(RESULT_FIELDS, row)) for row in cursor.fetchall()]
+
+
+# Cache em memória ---------------------------------------------------------------
+
+class PrefixCache:
+    """LRU ``(dono, versão, prefixo) -> (limit, resultados)`` com trava."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, owner_id, version, prefix, limit):
+        with self._lock:
+            # O próprio prefixo ou o mais longo já buscado com a lista completa
+            for length in range(len(prefix), 0, -1):
+                key = (owner_id, version, prefix[:length])
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+
+                entry_limit, rows = entry
+                complete = len(rows) < entry_limit
+                if length == len(prefix) and (complete or entry_limit >= limit):
+                    self._entries.move_to_end(key)
+                    return rows[:limit]
+                if length < len(prefix) and complete:
+                    self._entries.move_to_end(key)
+                    return _rank(rows, prefix, limit)
+        return None
+
+    def set(self, owner_id, version, prefix, limit, rows):
+        with self._lock:
+            self._entries[(owner_id, version, prefix)] = (limit, rows)
+            self._entries.move_to_end((owner_id, version, prefix))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_prefix_cache = None
+
+
+def get_prefix_cache():
+    """O LRU do processo, ou ``None`` se ``CONTACT_AUTOCOMPLETE_CACHE_SIZE`` é 0."""
+    global _prefix_cache
+    size = getattr(settings, 'CONTACT_AUTOCOMPLETE_CACHE_SIZE', 0)
+    if size <= 0:
+        return None
+    if _prefix_cache is None or _prefix_cache.max_entries != size:
+        _prefix_cache = PrefixCache(size)
+    return _prefix_cache
+
+
+def suggest(owner_id, prefix, limit=LIMIT):
+    """
+    Até ``limit`` contatos visíveis de ``owner_id`` que começam com
+    ``prefix``: dicts com ``RESULT_FIELDS`` e ``match`` (o campo que casou).
+    """
+    prefix = normalize(prefix)
+    if not prefix:
+        return []
+
+    prefix_cache = get_prefix_cache()
+    version = None
+    if prefix_cache is not None:
+        version = contact_cache.get_versions(owner_id)[1]
+        if version is not None:
+            rows = prefix_cache.get(owner_id, version, prefix, limit)
+            if rows is not None:
+                return rows
+
+    rows = _rank(_query(owner_id, prefix, limit), prefix, limit)
+
+    if prefix_cache is not None and version is not None:
+        prefix_cache.set(owner_id, version, prefix, limit, rows)
+    return rows
@@ -0,0 +1,171 @@
+"""
+Orçamento de consultas das views de contatos.
+
+Executa cada view de contact/urls.py (e a listagem do admin) pelo cliente de
+teste, registra as consultas SQL e compara com o ``@query_budget`` da view
+(contact/query_budget.py). Os cenários incluem os caminhos mais caros de
+cada view (mudar a categoria, excluir em lote, importar com e sem
+categoria), então os orçamentos podem ser os números medidos; a
+importação, que cresce com o arquivo, é isenta (``@query_budget(None)``).
+Usado pelo comando check_query_budgets e pelos testes
+(contact/tests/test_query_budgets.py).
+"""
+import json
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.files.storage import InMemoryStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.urls import NoReverseMatch, resolve, reverse
+
+from contact import categories
+from contact.models import Category, CategoryCount, Contact
+from contact.query_budget import check_budget, get_budget, record_queries
+
+# Cache local e vazio: nenhuma página da lista vem pronta (as views consultam
+# o banco), mas as categorias ficam em memória como num processo em uso
+EMPTY_CACHE = {'default': {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'check-query-budgets',
+}}
+
+# O admin não é nosso: só checamos duplicadas e N+1 (list_select_related).
+# A lista de categorias é lida pelo filtro lateral.
+ADMIN_BUDGET = {'max_queries': 50, 'max_duplicates': 1}
+
+
+@contextmanager
+def picture_storage():
+    """
+    Troca o storage das fotos por um em memória: as views só montam URLs,
+    e o cenário não depende do Supabase configurado.
+    """
+    field = Contact._meta.get_field('picture')
+    original = field.storage
+    field.storage = InMemoryStorage(base_url='/media/')
+    try:
+        yield
+    finally:
+        field.storage = original
+
+
+def populate(count):
+    """Cria um superusuário com ``count`` contatos em três categorias; retorna o usuário."""
+    owner = User.objects.create_superuser('__budget_owner__', password='budget-pass')
+    created = [Category.objects.create(name=f'Categoria {index}') for index in range(3)]
+
+    Contact.objects.bulk_create(
+        Contact(
+            owner=owner, first_name=f'Nome{index}', last_name='Silva',
+            phone=f'1199999{index:04}', category=created[index % 3],
+        )
+        for index in range(count)
+    )
+    # bulk_create não passa pelo save(): contadores do filtro por categoria
+    CategoryCount.rebuild([owner.pk])
+
+    # Categorias em memória, como num processo já em uso
+    categories.clear()
+    categories.category_choices()
+    return owner
+
+
+def view_logs(owner):
+    """Gera ``(rótulo, url, QueryLog)`` de cada view; precisa de ``picture_storage()``."""
+    client = Client()
+    contacts = Contact.objects.filter(owner=owner).order_by('id')
+    contact = contacts.last()
+    contact.picture = 'contacts/budget.jpg'
+    contact.save()
+    to_delete = contacts.first()
+    # Ações em lote: contatos do meio, com e sem categoria
+    ids = list(contacts.values_list('pk', flat=True))
+    hide_ids, move_ids, delete_ids, api_delete_ids = ids[1:6], ids[6:11], ids[11:16], ids[16:21]
+    Contact.objects.filter(pk__in=ids[1:21:2]).update(category=None)
+    CategoryCount.rebuild([owner.pk])
+    other_category = Category.objects.exclude(pk=contact.category_id).first()
+
+    csv_file = SimpleUploadedFile(
+        'contatos.csv',
+        f'nome,telefone,categoria\nAna,11999990000,{other_category.name}\nBia,11999990001,\n'.encode(),
+    )
+    # Cria sem categoria; altera mudando a categoria (dois contadores)
+    new_contact = {'first_name': 'Orcamento', 'phone': '11999990000'}
+    changed_contact = {**new_contact, 'category': other_category.pk}
+
+    requests = [
+        ('login (get)', 'get', reverse('contact:login'), {}),
+        ('login (post)', 'post', reverse('contact:login'), {'username': owner.username, 'password': 'budget-pass'}),
+        ('index', 'get', reverse('contact:index'), {}),
+        ('index (category)', 'get', reverse('contact:index'), {'category': contact.category_id}),
+        ('search', 'get', reverse('contact:search'), {'q': 'Nome1'}),
+        ('search (category)', 'get', reverse('contact:search'), {'q': 'Nome1', 'category': contact.category_id}),
+        ('contact', 'get', reverse('contact:contact', args=(contact.pk,)), {}),
+        ('picture', 'get', reverse('contact:picture', args=(contact.pk,)), {'w': '64'}),
+        ('create (get)', 'get', reverse('contact:create'), {}),
+        ('create (post)', 'post', reverse('contact:create'), changed_contact),
+        ('update (get)', 'get', reverse('contact:update', args=(contact.pk,)), {}),
+        ('update (post)', 'post', reverse('contact:update', args=(contact.pk,)), changed_contact),
+        ('delete (confirm)', 'post', reverse('contact:delete', args=(to_delete.pk,)), {}),
+        ('delete (post)', 'post', reverse('contact:delete', args=(to_delete.pk,)), {'confirmation': 'yes'}),
+        ('import (post)', 'post', reverse('contact:import'), {'file': csv_file}),
+        ('export', 'get', reverse('contact:export'), {'format': 'vcard'}),
+        ('bulk (hide)', 'post', reverse('contact:bulk'), {'action': 'hide', 'ids': hide_ids}),
+        ('bulk (move)', 'post', reverse('contact:bulk'), {
+            'action': 'move', 'ids': move_ids, 'category': other_category.pk,
+        }),
+        ('bulk (delete)', 'post', reverse('contact:bulk'), {'action': 'delete', 'ids': delete_ids}),
+        ('hidden', 'get', reverse('contact:hidden'), {}),
+        ('api list', 'get', reverse('contact:api_contacts'), {}),
+        ('api create', 'post', reverse('contact:api_contacts'), json.dumps(changed_contact)),
+        ('api sync', 'get', reverse('contact:api_sync'), {}),
+        ('api detail', 'get', reverse('contact:api_contact', args=(contact.pk,)), {}),
+        ('api patch', 'patch', reverse('contact:api_contact', args=(contact.pk,)), json.dumps({
+            'last_name': 'Api', 'category': contact.category_id,
+        })),
+        ('api delete', 'delete', reverse('contact:api_contact', args=(ids[21],)), {}),
+        ('api autocomplete', 'get', reverse('contact:api_autocomplete'), {'q': 'Nome1'}),
+        ('api bulk (delete)', 'post', reverse('contact:api_bulk'), json.dumps({'action': 'delete', 'ids': api_delete_ids})),
+        ('user_update (get)', 'get', reverse('contact:user_update'), {}),
+        ('user_update (post)', 'post', reverse('contact:user_update'), {
+            'first_name': 'Dono', 'last_name': 'Orcamento', 'email': 'dono@example.com',
+            'username': owner.username,
+        }),
+        ('logout', 'get', reverse('contact:logout'), {}),
+        ('register (get)', 'get', reverse('contact:register'), {}),
+        ('register (post)', 'post', reverse('contact:register'), {
+            'first_name': 'Novo', 'last_name': 'Usuario', 'username': '__budget_new__',
+            'password1': 'Senha-Forte-123', 'password2': 'Senha-Forte-123',
+        }),
+    ]
+
+    try:
+        # Enquanto ainda logado (o usuário é superusuário)
+        admin_url = reverse('admin:contact_contact_changelist')
+        logout = [label for label, *_ in requests].index('logout')
+        requests.insert(logout, ('admin changelist', 'get', admin_url, {}))
+    except NoReverseMatch:
+        pass  # admin só é publicado com DEBUG
+
+    for label, method, url, data in requests:
+        with record_queries() as log:
+            # Corpo já serializado: requisição da API JSON
+            extra = {'content_type': 'application/json'} if isinstance(data, str) else {}
+            response = getattr(client, method)(url, data, secure=True, **extra)
+            # Respostas em streaming consultam o banco enquanto são lidas
+            if getattr(response, 'streaming', False):
+                b''.join(response.streaming_content)
+
+        yield label, url, log
+
+
+def view_budget(url):
+    match = resolve(url.split('?')[0])
+    return get_budget(match.func) if match.app_name == 'contact' else ADMIN_BUDGET
+
+
+def problems(url, log):
+    """``(orçamento, problemas)`` da requisição a ``url``."""
+    budget = view_budget(url)
+    return budget, check_budget(log, budget)
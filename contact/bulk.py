@@ -0,0 +1,140 @@
+"""
+Ações em lote sobre os contatos de um usuário: excluir, ocultar, restaurar
+e mover para uma categoria.
+
+Cada ação é um único ``UPDATE``/``DELETE ... WHERE owner_id = %s AND id IN
+(...)``, qualquer que seja a quantidade de contatos: ids de outro usuário
+simplesmente não casam. Como ``update()`` e o DELETE direto não passam pelo
+``save()``/``delete()`` nem pelos sinais, aqui também se faz o que eles
+fariam: nova ``version`` e ``updated_at`` (API e sincronização), registro
+das exclusões (``ContactTombstone``), contadores por categoria
+(``CategoryCount``) e invalidação do cache da lista.
+"""
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from contact import cache as contact_cache
+from contact.models import Category, CategoryCount, Contact, ContactTombstone, PictureUpload
+
+# Limite de ids por requisição (o SQLite aceita até 32766 parâmetros)
+MAX_IDS = 10_000
+
+DELETE = 'delete'
+HIDE = 'hide'
+RESTORE = 'restore'
+MOVE = 'move'
+
+ACTIONS = {
+    DELETE: 'Excluir',
+    HIDE: 'Ocultar',
+    RESTORE: 'Restaurar',
+    MOVE: 'Mover para a categoria',
+}
+
+# Ações oferecidas na lista de contatos e na lista de ocultos
+LIST_ACTIONS = (HIDE, MOVE, DELETE)
+HIDDEN_ACTIONS = (RESTORE, DELETE)
+
+
+class CategoryNotFound(ValueError):
+    pass
+
+
+def apply(owner, action, ids, category_id=None):
+    """
+    Executa ``action`` nos contatos ``ids`` de ``owner`` e retorna quantos
+    foram alterados. ``category_id`` (``None`` para "sem categoria") só vale
+    para ``MOVE``; se a categoria não existir mais, ``CategoryNotFound``.
+    """
+    if action not in ACTIONS:
+        raise ValueError(f'Ação desconhecida: {action}')
+
+    ids = sorted({int(pk) for pk in ids})
+    if not ids:
+        return 0
+    if len(ids) > MAX_IDS:
+        raise ValueError(f'No máximo {MAX_IDS} contatos por vez.')
+
+    queryset = Contact.objects.filter(owner=owner, pk__in=ids)
+    if action == HIDE:
+        queryset = queryset.filter(show=True)
+    elif action == RESTORE:
+        queryset = queryset.filter(show=False)
+    elif action == MOVE:
+        queryset = queryset.exclude(category_id=category_id)
+
+    # Sem savepoint: dentro de outra transação, uma falha desfaz tudo mesmo
+    with transaction.atomic(savepoint=False):
+        # As categorias oferecidas vêm do cache (contact/categories.py): a
+        # escolhida pode ter sido apagada. Travada, não some antes do UPDATE;
+        # o erro só é levantado fora do bloco, sem estragar a transação em volta
+        missing = action == MOVE and category_id is not None and not (
+            Category.objects.select_for_update().filter(pk=category_id).exists()
+        )
+        if not missing:
+            count = _apply(owner, action, ids, queryset, category_id)
+
+    if missing:
+        raise CategoryNotFound('A categoria escolhida não existe mais.')
+    if count:
+        contact_cache.bump_owner_version_on_commit(owner.pk)
+    return count
+
+
+def _apply(owner, action, ids, queryset, category_id):
+    # Categoria e show das linhas afetadas (travadas até o fim): o quanto
+    # cada contador de categoria muda
+    rows = list(queryset.select_for_update().values_list('category_id', 'show'))
+    deltas = _counter_deltas(action, rows, category_id)
+
+    if action == DELETE:
+        count = _delete(owner, ids)
+    elif action == HIDE:
+        count = _update(queryset, show=False)
+    elif action == RESTORE:
+        count = _update(queryset, show=True)
+    else:
+        count = _update(queryset, category_id=category_id)
+
+    CategoryCount.apply_deltas(owner.pk, deltas)
+    return count
+
+
+def _counter_deltas(action, rows, category_id):
+    deltas = Counter()
+    for row_category_id, show in rows:
+        if show:
+            deltas[row_category_id] -= 1
+        if action == RESTORE:
+            deltas[row_category_id] += 1
+        elif action == MOVE and show:
+            deltas[category_id] += 1
+    return deltas
+
+
+def _update(queryset, **values):
+    return queryset.update(**values, version=F('version') + 1, updated_at=timezone.now())
+
+
+def _delete(owner, ids):
+    quote = connection.ops.quote_name
+    contacts = quote(Contact._meta.db_table)
+    tombstones = quote(ContactTombstone._meta.db_table)
+    where = f'owner_id = %s AND id IN ({", ".join(["%s"] * len(ids))})'
+
+    # Envios de foto pendentes (on_delete=CASCADE só existe no Django); o
+    # sinal post_delete de PictureUpload apaga o arquivo local
+    PictureUpload.objects.filter(contact__owner=owner, contact_id__in=ids).delete()
+
+    with connection.cursor() as cursor:
+        # Registros da exclusão copiados das próprias linhas, num só INSERT
+        cursor.execute(
+            f'INSERT INTO {tombstones} (owner_id, contact_id, deleted_at) '
+            f'SELECT owner_id, id, %s FROM {contacts} WHERE {where}',
+            [connection.ops.adapt_datetimefield_value(timezone.now()), owner.pk, *ids],
+        )
+        cursor.execute(f'DELETE FROM {contacts} WHERE {where}', [owner.pk, *ids])
+        return cursor.rowcount
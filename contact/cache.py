@@ -0,0 +1,139 @@
+"""
+Cache dos fragmentos renderizados da lista de contatos.
+
+A chave de cada fragmento inclui um contador de versão por dono e um global
+(categorias). Qualquer post_save/post_delete em Contact ou Category incrementa
+o contador correspondente (ver contact/signals.py), então uma página antiga
+nunca é servida: ela simplesmente deixa de ser referenciada e expira.
+
+O incremento acontece depois do commit: antes dele, outra requisição ainda lê
+as linhas antigas e guardaria a página velha sob a versão nova.
+
+Com o backend local-memory cada processo tem seu próprio cache; com vários
+workers use um backend compartilhado (Redis, Memcached, banco) para que a
+invalidação valha para todos.
+
+A versão das categorias (``get_categories_version``) segue a mesma ideia:
+ela marca a lista de categorias guardada na memória de cada processo (ver
+contact/categories.py).
+"""
+import hashlib
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.safestring import mark_safe
+
+GLOBAL_VERSION_KEY = 'contact:list-version:global'
+CATEGORIES_VERSION_KEY = 'contact:categories-version'
+
+
+def _owner_version_key(owner_id):
+    return f'contact:list-version:owner:{owner_id}'
+
+
+def _initial_version():
+    # Se a chave de versão for despejada do cache, recomeçar em 1 poderia
+    # reaproveitar fragmentos antigos; o relógio garante um número novo.
+    return time.time_ns()
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), None)
+
+
+def bump_owner_version(owner_id):
+    _bump(_owner_version_key(owner_id))
+
+
+def bump_owner_version_on_commit(owner_id):
+    """``bump_owner_version`` ao fim da transação atual (na hora, fora de uma)."""
+    transaction.on_commit(partial(bump_owner_version, owner_id))
+
+
+def bump_global_version():
+    _bump(GLOBAL_VERSION_KEY)
+
+
+def bump_categories_version():
+    _bump(CATEGORIES_VERSION_KEY)
+
+
+def get_categories_version():
+    """Versão atual das categorias; ``None`` se o cache não guarda nada (DummyCache)."""
+    version = cache.get(CATEGORIES_VERSION_KEY)
+    if version is None:
+        cache.add(CATEGORIES_VERSION_KEY, _initial_version(), None)
+        version = cache.get(CATEGORIES_VERSION_KEY)
+    return version
+
+
+async def aget_categories_version():
+    version = await cache.aget(CATEGORIES_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CATEGORIES_VERSION_KEY, _initial_version(), None)
+        version = await cache.aget(CATEGORIES_VERSION_KEY)
+    return version
+
+
+def get_versions(owner_id):
+    """Retorna ``(versão global, versão do dono)`` com uma única ida ao cache."""
+    owner_key = _owner_version_key(owner_id)
+    versions = cache.get_many([GLOBAL_VERSION_KEY, owner_key])
+
+    for key in (GLOBAL_VERSION_KEY, owner_key):
+        if key not in versions:
+            cache.add(key, _initial_version(), None)
+            versions[key] = cache.get(key)
+
+    return versions[GLOBAL_VERSION_KEY], versions[owner_key]
+
+
+async def aget_versions(owner_id):
+    """Versão assíncrona de ``get_versions`` (views async)."""
+    owner_key = _owner_version_key(owner_id)
+    versions = await cache.aget_many([GLOBAL_VERSION_KEY, owner_key])
+
+    for key in (GLOBAL_VERSION_KEY, owner_key):
+        if key not in versions:
+            await cache.aadd(key, _initial_version(), None)
+            versions[key] = await cache.aget(key)
+
+    return versions[GLOBAL_VERSION_KEY], versions[owner_key]
+
+
+def _list_key(owner_id, versions, query_string):
+    global_version, owner_version = versions
+    digest = hashlib.md5(query_string.encode()).hexdigest()
+    return f'contact:list:{global_version}:{owner_id}:{owner_version}:{digest}'
+
+
+def list_cache_key(owner_id, query_string):
+    return _list_key(owner_id, get_versions(owner_id), query_string)
+
+
+async def alist_cache_key(owner_id, query_string):
+    return _list_key(owner_id, await aget_versions(owner_id), query_string)
+
+
+def get_list_fragment(key):
+    fragment = cache.get(key)
+    return mark_safe(fragment) if fragment is not None else None
+
+
+async def aget_list_fragment(key):
+    fragment = await cache.aget(key)
+    return mark_safe(fragment) if fragment is not None else None
+
+
+def set_list_fragment(key, fragment):
+    cache.set(key, str(fragment), getattr(settings, 'CONTACT_LIST_CACHE_TIMEOUT', 300))
+
+
+async def aset_list_fragment(key, fragment):
+    await cache.aset(key, str(fragment), getattr(settings, 'CONTACT_LIST_CACHE_TIMEOUT', 300))
@@ -0,0 +1,75 @@
+"""
+Categorias ``(id, nome)`` em cache na memória do processo.
+
+Todo formulário de contato (criação, edição, API, ações em lote, importação
+e admin) precisa da lista de categorias para montar o ``<select>`` e validar
+a escolha. As categorias são poucas e quase nunca mudam: a lista fica na
+memória, marcada com a versão lida do cache compartilhado
+(``contact.cache.get_categories_version``). Salvar ou apagar uma categoria
+incrementa essa versão depois do commit (contact/signals.py) e cada processo
+relê a lista do banco na próxima vez que precisar dela.
+
+Com o cache local (LocMemCache) a versão só muda no processo que alterou a
+categoria; por isso a lista também expira depois de
+``CONTACT_CATEGORY_CACHE_TIMEOUT`` segundos.
+
+Sem cache compartilhado (DummyCache) não há versão: a lista é lida do banco
+a cada chamada.
+"""
+import time
+
+from django.conf import settings
+
+from contact import cache as contact_cache
+from contact.models import Category
+
+# (versão, expira em, categorias); a tupla inteira é trocada de uma vez, sem lock
+_cached = (None, 0.0, ())
+
+
+def _timeout():
+    return float(getattr(settings, 'CONTACT_CATEGORY_CACHE_TIMEOUT', 60))
+
+
+def _is_current(version, cached_version, expires_at):
+    return version is not None and version == cached_version and time.monotonic() < expires_at
+
+
+def _load():
+    return tuple((category.pk, category.name) for category in Category.objects.order_by('name'))
+
+
+async def _aload():
+    return tuple([(category.pk, category.name) async for category in Category.objects.order_by('name')])
+
+
+def category_choices():
+    """``(id, nome)`` das categorias, em ordem de nome"""
+    global _cached
+    version = contact_cache.get_categories_version()
+    cached_version, expires_at, choices = _cached
+
+    if not _is_current(version, cached_version, expires_at):
+        choices = _load()
+        if version is not None:
+            _cached = (version, time.monotonic() + _timeout(), choices)
+    return choices
+
+
+async def acategory_choices():
+    """Versão assíncrona de ``category_choices`` (views async)."""
+    global _cached
+    version = await contact_cache.aget_categories_version()
+    cached_version, expires_at, choices = _cached
+
+    if not _is_current(version, cached_version, expires_at):
+        choices = await _aload()
+        if version is not None:
+            _cached = (version, time.monotonic() + _timeout(), choices)
+    return choices
+
+
+def clear():
+    """Esquece a lista deste processo (a próxima leitura vai ao banco)."""
+    global _cached
+    _cached = (None, 0.0, ())
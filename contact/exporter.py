@@ -0,0 +1,133 @@
+"""
+Exportação da agenda em CSV ou vCard 4.0, em streaming.
+
+Os contatos são lidos com ``iterator(chunk_size=...)`` (cursor no servidor no
+PostgreSQL) e convertidos em texto aos poucos, agrupados em blocos de
+~64 KB para a ``StreamingHttpResponse``: a memória fica constante qualquer
+que seja o tamanho da agenda. As URLs das fotos são montadas só no momento
+em que a linha é gerada (sem rede; ver SupabaseStorage.url).
+
+O CSV usa os mesmos cabeçalhos aceitos pela importação (contact/importer.py).
+"""
+import csv
+
+CHUNK_SIZE = 2000
+BUFFER_SIZE = 64 * 1024
+
+CSV_HEADER = ['Nome', 'Sobrenome', 'Telefone', 'E-mail', 'Descrição', 'Categoria', 'Foto']
+
+EXPORT_FIELDS = (
+    'id', 'first_name', 'last_name', 'phone', 'email', 'description',
+    'picture', 'category__name',
+)
+
+FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'vcard': ('text/vcard; charset=utf-8', 'vcf'),
+}
+
+
+def export_queryset(queryset):
+    return (
+        queryset
+        .select_related('category')
+        .only(*EXPORT_FIELDS)
+        .order_by('id')
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+def export_contacts(queryset, file_format='csv'):
+    """Gera o arquivo exportado em blocos de bytes."""
+    contacts = export_queryset(queryset)
+    lines = vcard_lines(contacts) if file_format == 'vcard' else csv_lines(contacts)
+    return _buffered(lines)
+
+
+def _buffered(lines):
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= BUFFER_SIZE:
+            yield ''.join(buffer).encode()
+            buffer, size = [], 0
+
+    if buffer:
+        yield ''.join(buffer).encode()
+
+
+class _Echo:
+    """Destino do csv.writer que devolve a linha em vez de gravá-la."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(contacts):
+    writer = csv.writer(_Echo())
+    # BOM: o Excel reconhece o arquivo como UTF-8
+    yield '\ufeff' + writer.writerow(CSV_HEADER)
+
+    for contact in contacts:
+        yield writer.writerow([
+            contact.first_name,
+            contact.last_name,
+            contact.phone,
+            contact.email,
+            contact.description,
+            contact.category.name if contact.category else '',
+            contact.picture_url(),
+        ])
+
+
+def vcard_lines(contacts):
+    for contact in contacts:
+        full_name = f'{contact.first_name} {contact.last_name}'.strip()
+        properties = [
+            'BEGIN:VCARD',
+            'VERSION:4.0',
+            f'FN:{_escape(full_name)}',
+            f'N:{_escape(contact.last_name)};{_escape(contact.first_name)};;;',
+        ]
+
+        if contact.phone:
+            properties.append(f'TEL;VALUE=uri;TYPE=cell:tel:{contact.phone}')
+        if contact.email:
+            properties.append(f'EMAIL:{_escape(contact.email)}')
+        if contact.description:
+            properties.append(f'NOTE:{_escape(contact.description)}')
+        if contact.category:
+            properties.append(f'CATEGORIES:{_escape(contact.category.name)}')
+        if contact.picture:
+            properties.append(f'PHOTO:{contact.picture_url()}')
+
+        properties.append('END:VCARD')
+        yield ''.join(_fold(line) + '\r\n' for line in properties)
+
+
+def _escape(value):
+    return (
+        (value or '')
+        .replace('\\', '\\\\').replace('\r\n', '\\n').replace('\n', '\\n')
+        .replace(',', '\\,').replace(';', '\\;')
+    )
+
+
+def _fold(line, limit=75):
+    """Quebra linhas com mais de 75 octetos (RFC 6350), sem partir caracteres UTF-8."""
+    if len(line.encode()) <= limit:
+        return line
+
+    parts, current, size = [], '', 0
+    for char in line:
+        char_size = len(char.encode())
+        if size + char_size > limit:
+            parts.append(current)
+            # A continuação começa com um espaço, que conta no limite
+            current, size = ' ', 1
+        current += char
+        size += char_size
+
+    parts.append(current)
+    return '\r\n'.join(parts)
@@ -0,0 +1,88 @@
+"""
+Filtro por categoria das listas de contatos (``?category=<id>`` ou
+``?category=none``) e o painel lateral com quantos contatos há em cada
+categoria.
+
+As quantidades vêm de ``CategoryCount``: uma consulta pelas linhas do dono,
+sem ``GROUP BY`` sobre os contatos. O filtro usa o índice
+``contact_owner_category_idx`` (dono, categoria, id decrescente), na mesma
+ordem da paginação.
+"""
+from contact.models import CategoryCount
+
+UNCATEGORIZED = 'none'
+
+
+def selected_category(request):
+    """``None`` (todas), ``UNCATEGORIZED`` ou o id da categoria escolhida."""
+    value = request.GET.get('category', '').strip()
+    if value == UNCATEGORIZED:
+        return UNCATEGORIZED
+    return int(value) if value.isdigit() else None
+
+
+def filter_category(queryset, selected):
+    if selected is None:
+        return queryset
+    if selected == UNCATEGORIZED:
+        return queryset.filter(category__isnull=True)
+    return queryset.filter(category_id=selected)
+
+
+def _counters(owner):
+    return (
+        CategoryCount.objects.filter(owner=owner, count__gt=0)
+        .select_related('category')
+        .order_by('category__name', 'category_id')
+    )
+
+
+def _url(request, value):
+    params = request.GET.copy()
+    # Outra categoria é outra lista: recomeça da primeira página
+    for key in ('cursor', 'page', 'category'):
+        params.pop(key, None)
+    if value is not None:
+        params['category'] = value
+    return f'?{params.urlencode()}'
+
+
+def _facets(request, counters, selected):
+    """
+    Retorna ``(facetas, total)``: a lista para o painel ("Todos", as
+    categorias por nome e "Sem categoria") e o total da seleção atual.
+    """
+    total = sum(counter.count for counter in counters)
+    facets = [{'label': 'Todos', 'count': total, 'url': _url(request, None), 'active': selected is None}]
+    uncategorized = None
+
+    for counter in counters:
+        if counter.category_id is None:
+            uncategorized = counter
+            continue
+        facets.append({
+            'label': counter.category.name,
+            'count': counter.count,
+            'url': _url(request, str(counter.category_id)),
+            'active': selected == counter.category_id,
+        })
+
+    if uncategorized is not None:
+        facets.append({
+            'label': 'Sem categoria',
+            'count': uncategorized.count,
+            'url': _url(request, UNCATEGORIZED),
+            'active': selected == UNCATEGORIZED,
+        })
+
+    selected_count = next((facet['count'] for facet in facets if facet['active']), 0)
+    return facets, selected_count
+
+
+def category_facets(request, owner, selected):
+    return _facets(request, list(_counters(owner)), selected)
+
+
+async def acategory_facets(request, owner, selected):
+    """Versão assíncrona de ``category_facets`` (views async)."""
+    return _facets(request, [counter async for counter in _counters(owner)], selected)
@@ -0,0 +1,204 @@
+"""
+Servidor HTTP local que imita a API do Supabase Storage usada pelo projeto.
+
+Serve para benchmarks e verificações sem rede (``bench_storage``): guarda os
+objetos em memória, conta as requisições por operação e pode simular a
+latência de rede (por requisição) e o custo de abrir uma conexão (handshake
+TCP/TLS), que é o que o pool keep-alive economiza.
+
+    server = FakeStorageServer(connect_latency=0.02).start()
+    ...  # SUPABASE_URL = server.url
+    server.stop()
+"""
+import json
+import threading
+import time
+from collections import Counter
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+PREFIX = '/storage/v1/'
+
+
+class FakeStorageServer:
+    def __init__(self, latency=0.0, connect_latency=0.0):
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.objects = {}
+        self.requests = Counter()
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        handler = type('Handler', (_Handler,), {'storage': self})
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def count(self, operation):
+        with self._lock:
+            self.requests[operation] += 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    storage = None
+
+    def setup(self):
+        super().setup()
+        # Uma vez por conexão: simula o handshake que o keep-alive evita
+        with self.storage._lock:
+            self.storage.connections += 1
+        if self.storage.connect_latency:
+            time.sleep(self.storage.connect_latency)
+
+    def log_message(self, format, *args):
+        pass
+
+    # Roteamento -------------------------------------------------------------
+
+    def _route(self):
+        path = unquote(urlsplit(self.path).path)
+        if not path.startswith(PREFIX):
+            return None, []
+        return self.command, path[len(PREFIX):].split('/')
+
+    def _dispatch(self):
+        if self.storage.latency:
+            time.sleep(self.storage.latency)
+
+        method, parts = self._route()
+        body = self._read_body()
+
+        if parts[:2] == ['object', 'info'] and method == 'GET':
+            return self._info(parts[2], '/'.join(parts[3:]))
+        if parts[:2] == ['object', 'list'] and method == 'POST':
+            return self._list(parts[2], json.loads(body or b'{}'))
+        if parts[:2] == ['object', 'sign'] and method == 'POST':
+            return self._sign(parts[2], '/'.join(parts[3:]), json.loads(body or b'{}'))
+        if parts[:2] == ['object', 'public'] and method in ('GET', 'HEAD'):
+            return self._download(parts[2], '/'.join(parts[3:]), head=method == 'HEAD')
+        if parts[:1] == ['object'] and len(parts) == 2 and method == 'DELETE':
+            return self._remove(parts[1], json.loads(body or b'{}'))
+        if parts[:1] == ['object'] and len(parts) > 2:
+            bucket, name = parts[1], '/'.join(parts[2:])
+            if method in ('POST', 'PUT'):
+                return self._upload(bucket, name, body)
+            if method in ('GET', 'HEAD'):
+                return self._download(bucket, name, head=method == 'HEAD')
+
+        return self._json(404, {'statusCode': '404', 'error': 'not_found', 'message': 'Route not found'})
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _dispatch
+
+    # Operações --------------------------------------------------------------
+
+    def _upload(self, bucket, name, body):
+        self.storage.count('upload')
+        self.storage.objects[(bucket, name)] = self._multipart_file(body)
+        return self._json(200, {'Key': f'{bucket}/{name}'})
+
+    def _download(self, bucket, name, head=False):
+        self.storage.count('head' if head else 'download')
+        data = self.storage.objects.get((bucket, name))
+
+        if data is None:
+            if head:
+                return self._send(404, b'', 'application/json', send_body=False)
+            return self._not_found()
+
+        return self._send(200, data, 'application/octet-stream', send_body=not head)
+
+    def _info(self, bucket, name):
+        self.storage.count('info')
+        data = self.storage.objects.get((bucket, name))
+
+        if data is None:
+            return self._not_found()
+
+        return self._json(200, {'name': name, 'bucket_id': bucket, 'size': len(data)})
+
+    def _list(self, bucket, options):
+        self.storage.count('list')
+        prefix = options.get('prefix', '').strip('/')
+        search = options.get('search', '')
+        entries = []
+
+        for (object_bucket, name), data in self.storage.objects.items():
+            folder, _, file_name = name.rpartition('/')
+            if object_bucket == bucket and folder == prefix and file_name.startswith(search):
+                entries.append({'name': file_name, 'metadata': {'size': len(data)}})
+
+        return self._json(200, entries[:options.get('limit', 100)])
+
+    def _sign(self, bucket, name, options):
+        self.storage.count('sign')
+        token = f'fake-{int(time.time())}-{options.get("expiresIn")}'
+        return self._json(200, {'signedURL': f'/object/sign/{bucket}/{name}?token={token}'})
+
+    def _remove(self, bucket, options):
+        self.storage.count('remove')
+        removed = []
+
+        for name in options.get('prefixes', []):
+            if self.storage.objects.pop((bucket, name), None) is not None:
+                removed.append({'name': name, 'bucket_id': bucket})
+
+        return self._json(200, removed)
+
+    # Utilidades -------------------------------------------------------------
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _multipart_file(self, body):
+        content_type = self.headers.get('Content-Type', '')
+        if not content_type.startswith('multipart/'):
+            return body
+
+        message = BytesParser(policy=HTTP).parsebytes(
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + body
+        )
+        for part in message.iter_parts():
+            if part.get_param('name', header='content-disposition') == 'file':
+                return part.get_payload(decode=True)
+
+        return body
+
+    def _not_found(self):
+        return self._json(404, {'statusCode': '404', 'error': 'not_found', 'message': 'Object not found'})
+
+    def _json(self, status, payload):
+        return self._send(status, json.dumps(payload).encode(), 'application/json')
+
+    def _send(self, status, data, content_type, send_body=True):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(data)
@@ -1,10 +1,56 @@
 from django import forms
-from contact.models import Contact
+from django.forms.models import ModelChoiceIterator
+from contact.models import Category, Contact
+from contact import bulk, validation
+from contact.categories import acategory_choices, category_choices
 from django.core.exceptions import ValidationError
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django.contrib.auth import password_validation
 
+class CategoryChoiceIterator(ModelChoiceIterator):
+    """Opções do select lidas do cache de categorias, não do queryset"""
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from category_choices()
+
+    def __len__(self):
+        return len(category_choices()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(category_choices())
+
+
+class CategoryChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField de Category que renderiza e valida a escolha com o cache
+    de categorias (contact/categories.py), sem listar a tabela. A validação
+    do ForeignKey no modelo ainda confere se a categoria existe: a lista em
+    memória pode ter uma categoria já apagada.
+    """
+    iterator = CategoryChoiceIterator
+
+    def __init__(self, queryset=None, **kwargs):
+        super().__init__(Category.objects.all() if queryset is None else queryset, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, Category):
+            value = value.pk
+
+        names = dict(category_choices())
+        try:
+            pk = int(value)
+            name = names[pk]
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError(
+                self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value},
+            )
+        return Category.from_db(self.queryset.db, ['id', 'name'], [pk, name])
+
+
 class ContactForm(forms.ModelForm):
     picture = forms.ImageField(
         label='Foto',
@@ -43,72 +89,25 @@ class ContactForm(forms.ModelForm):
             'description': 'Informações adicionais sobre o contato',
             'category': 'Selecione uma categoria para organizar seus contatos'
         }
+        field_classes = {
+            'category': CategoryChoiceField,
+        }
 
+    # As regras ficam em contact/validation.py, compartilhadas com a importação em lote
     def clean_first_name(self):
-        first_name = self.cleaned_data.get('first_name')
-
-        if not first_name:
-            raise ValidationError("Nome é obrigatório.", code='invalid')
-
-        if len(first_name.strip()) < 2:
-            raise ValidationError("Nome deve ter pelo menos 2 caracteres.", code='invalid')
-
-        # Permitir acentos e espaços, apenas não permitir números
-        if any(char.isdigit() for char in first_name):
-            raise ValidationError("Nome não pode conter números.", code='invalid')
-
-        return first_name.strip().title()
+        return validation.clean_first_name(self.cleaned_data.get('first_name'))
 
     def clean_last_name(self):
-        last_name = self.cleaned_data.get('last_name')
-
-        if last_name:  # Campo opcional
-            if len(last_name.strip()) < 2:
-                raise ValidationError("Sobrenome deve ter pelo menos 2 caracteres.", code='invalid')
-
-            if any(char.isdigit() for char in last_name):
-                raise ValidationError("Sobrenome não pode conter números.", code='invalid')
-            
-            return last_name.strip().title()
-        
-        return last_name
+        return validation.clean_last_name(self.cleaned_data.get('last_name'))
 
     def clean_phone(self):
-        phone = self.cleaned_data.get('phone')
-
-        if not phone:
-            raise ValidationError("Telefone é obrigatório.", code='invalid')
-
-        # Remove caracteres especiais e espaços
-        phone_digits = ''.join(filter(str.isdigit, phone))
-
-        if len(phone_digits) < 10:
-            raise ValidationError("Telefone deve ter pelo menos 10 dígitos.", code='invalid')
-
-        if len(phone_digits) > 15:
-            raise ValidationError("Telefone deve ter no máximo 15 dígitos.", code='invalid')
-
-        return phone_digits
+        return validation.clean_phone(self.cleaned_data.get('phone'))
 
     def clean_email(self):
-        email = self.cleaned_data.get('email')
-
-        if email:  # Campo opcional
-            if '@' not in email or '.' not in email.split('@')[-1]:
-                raise ValidationError("Insira um endereço de e-mail válido.", code='invalid')
-            return email.lower().strip()
-        
-        return email
+        return validation.clean_email(self.cleaned_data.get('email'))
 
     def clean_description(self):
-        description = self.cleaned_data.get('description')
-
-        if description:  # Campo opcional
-            if len(description.strip()) < 5:
-                raise ValidationError("Descrição deve ter pelo menos 5 caracteres.", code='invalid')
-            return description.strip()
-        
-        return description
+        return validation.clean_description(self.cleaned_data.get('description'))
 
 class RegisterForm(UserCreationForm):
     class Meta:
@@ -126,6 +125,9 @@ class RegisterForm(UserCreationForm):
             'last_name': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Digite seu sobrenome'}),
             'username': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Nome de usuário único'}),
         }
+        error_messages = {
+            'username': {'unique': 'Este nome de usuário já está em uso.'},
+        }
         help_texts = {
             'username': 'Obrigatório. 150 caracteres ou menos. Apenas letras, números e @/./+/-/_ permitidos.',
             'password1': 'Sua senha deve ter pelo menos 8 caracteres.',
@@ -168,9 +170,8 @@ class RegisterForm(UserCreationForm):
         if len(username) < 4:
             raise ValidationError("Nome de usuário deve ter pelo menos 4 caracteres.", code='invalid')
 
-        if User.objects.filter(username=username).exists():
-            raise ValidationError("Este nome de usuário já está em uso.", code='invalid')
-
+        # Unicidade fica com a validação do modelo (uma consulta só); a
+        # mensagem está em Meta.error_messages
         return username
 
 class RegisterUpdateForm(forms.ModelForm):
@@ -286,3 +287,62 @@ class EmailVerificationForm(forms.Form):
             raise ValidationError("O código deve ter exatamente 6 dígitos.", code='invalid')
 
         return code
+
+
+class ContactImportForm(forms.Form):
+    """Upload do arquivo CSV ou vCard para importação em lote"""
+    file = forms.FileField(
+        label='Arquivo',
+        widget=forms.FileInput(attrs={
+            'accept': '.csv,.vcf,.vcard,text/csv,text/vcard',
+            'class': 'form-control',
+        }),
+        help_text='CSV (com cabeçalho: nome, sobrenome, telefone, email, descricao, categoria) ou vCard (.vcf).'
+    )
+
+
+class ContactIdsField(forms.Field):
+    """Lista de ids (checkboxes ``ids`` da lista ou lista JSON na API)"""
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {
+        'required': 'Selecione pelo menos um contato.',
+        'invalid': 'Seleção de contatos inválida.',
+    }
+
+    def to_python(self, value):
+        if not value:
+            return []
+        if isinstance(value, (str, int)):
+            value = [value]
+        try:
+            ids = {int(pk) for pk in value}
+        except (TypeError, ValueError):
+            raise ValidationError(self.error_messages['invalid'], code='invalid')
+        if len(ids) > bulk.MAX_IDS:
+            raise ValidationError(f'Selecione no máximo {bulk.MAX_IDS} contatos por vez.', code='max_ids')
+        return sorted(ids)
+
+
+class BulkActionForm(forms.Form):
+    """Ação em lote sobre os contatos selecionados (contact/bulk.py)"""
+    action = forms.ChoiceField(
+        label='Ação',
+        widget=forms.Select(attrs={'class': 'form-control'}),
+    )
+    category = forms.TypedChoiceField(
+        label='Categoria',
+        required=False,
+        coerce=int,
+        empty_value=None,
+        widget=forms.Select(attrs={'class': 'form-control'}),
+        help_text='Usada ao mover os contatos',
+    )
+    ids = ContactIdsField()
+
+    def __init__(self, *args, actions=bulk.ACTIONS, categories=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['action'].choices = [('', 'Ação em lote...'), *((key, bulk.ACTIONS[key]) for key in actions)]
+        if bulk.MOVE in actions:
+            self.fields['category'].choices = [('', 'Sem categoria'), *categories]
+        else:
+            del self.fields['category']
@@ -0,0 +1,82 @@
+"""
+Pipeline de imagens das fotos de contato.
+
+No upload a foto original é regravada sem metadados (EXIF, GPS etc., com a
+orientação já aplicada) e são geradas variantes quadradas de tamanho fixo em
+WebP (ou JPEG, se o Pillow não tiver suporte a WebP). Os nomes das variantes
+ficam em ``Contact.picture_variants`` e os templates/API pedem a menor
+variante que atende ao tamanho exibido.
+"""
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+DEFAULT_SIZES = (64, 256, 640)
+
+# Formatos que regravamos sem metadados; outros ficam como vieram
+REENCODE_FORMATS = {
+    'JPEG': {'quality': 90, 'optimize': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 90},
+}
+
+
+def picture_sizes():
+    return tuple(sorted(getattr(settings, 'CONTACT_PICTURE_SIZES', DEFAULT_SIZES)))
+
+
+def variant_format():
+    if features.check('webp'):
+        return 'WEBP', 'webp', {'quality': 80, 'method': 4}
+    return 'JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}
+
+
+def process_picture(file):
+    """
+    Retorna ``(original, variantes)``: o original sem metadados (ou ``None``
+    se o formato não é regravado) e um dict ``{tamanho: ContentFile}``.
+    Levanta ``ValueError`` se o arquivo não é uma imagem.
+    """
+    file.seek(0)
+
+    try:
+        source = Image.open(file)
+        source.load()
+    except (UnidentifiedImageError, OSError) as error:
+        raise ValueError(f'Imagem inválida: {error}') from error
+
+    source_format = source.format
+    image = ImageOps.exif_transpose(source)
+
+    original = None
+    if source_format in REENCODE_FORMATS:
+        original = _encode(image, source_format, REENCODE_FORMATS[source_format])
+
+    image_format, _, options = variant_format()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if image.has_transparency_data else 'RGB')
+
+    variants = {}
+    for size in picture_sizes():
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        variants[size] = _encode(thumbnail, image_format, options)
+
+    return original, variants
+
+
+def variant_name(original_name, size):
+    stem = os.path.splitext(os.path.basename(original_name))[0]
+    _, extension, _ = variant_format()
+    return f'contacts/variants/{stem}_{size}.{extension}'
+
+
+def _encode(image, image_format, options):
+    buffer = BytesIO()
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    # Sem "exif=" / "icc_profile=": o arquivo gerado não leva metadados
+    image.save(buffer, format=image_format, **options)
+    return ContentFile(buffer.getvalue())
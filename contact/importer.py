@@ -0,0 +1,238 @@
+"""
+Importação de contatos em lote (CSV e vCard).
+
+O arquivo é lido linha a linha (nunca inteiro em memória), cada registro é
+validado com as mesmas regras do ContactForm (contact/validation.py) e os
+válidos são gravados com ``bulk_create`` em lotes. O resultado é um
+``ImportReport`` com o total criado e os erros por linha.
+
+CSV: cabeçalho obrigatório, separador "," ou ";", colunas em inglês
+(first_name, phone, ...) ou português (nome, telefone, ...). vCard: versões
+2.1, 3.0 e 4.0 (N/FN, TEL, EMAIL, NOTE, CATEGORIES).
+"""
+import csv
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+from contact import cache as contact_cache
+from contact.categories import category_choices
+from contact.models import CategoryCount, Contact
+from contact.validation import validate_contact_data
+
+BATCH_SIZE = 1000
+
+# Guarda no relatório só os primeiros erros; os demais entram apenas na contagem
+MAX_REPORTED_ERRORS = 1000
+
+CSV_COLUMNS = {
+    'first_name': 'first_name', 'nome': 'first_name', 'primeiro_nome': 'first_name',
+    'last_name': 'last_name', 'sobrenome': 'last_name',
+    'phone': 'phone', 'telefone': 'phone', 'celular': 'phone',
+    'email': 'email', 'e_mail': 'email',
+    'description': 'description', 'descricao': 'description', 'notes': 'description',
+    'category': 'category', 'categoria': 'category',
+}
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+
+    @property
+    def total(self):
+        return self.created + self.failed
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, errors))
+
+    @property
+    def truncated(self):
+        return self.failed > len(self.errors)
+
+
+def detect_format(file_name, first_bytes=b''):
+    name = (file_name or '').lower()
+    if name.endswith(('.vcf', '.vcard')) or first_bytes.lstrip(b'\xef\xbb\xbf \r\n').upper().startswith(b'BEGIN:VCARD'):
+        return 'vcard'
+    return 'csv'
+
+
+def import_contacts(owner, file, file_format='csv', batch_size=BATCH_SIZE):
+    """
+    Importa os contatos de ``file`` (binário, aberto para leitura) para
+    ``owner``. Retorna um ``ImportReport``.
+    """
+    rows = iter_vcard(file) if file_format == 'vcard' else iter_csv(file)
+    categories = {_normalize(name): pk for pk, name in category_choices()}
+
+    report = ImportReport()
+    batch = []
+
+    for line, data in rows:
+        cleaned, errors = validate_contact_data(data)
+        if errors:
+            report.add_error(line, errors)
+            continue
+
+        category_id = categories.get(_normalize(data.get('category') or ''))
+        batch.append(Contact(owner=owner, category_id=category_id, **cleaned))
+
+        if len(batch) >= batch_size:
+            report.created += _insert(batch)
+            batch = []
+
+    if batch:
+        report.created += _insert(batch)
+
+    if report.created:
+        # bulk_create não dispara post_save: invalida as listas do dono aqui
+        contact_cache.bump_owner_version_on_commit(owner.pk)
+
+    return report
+
+
+def _insert(batch):
+    with transaction.atomic():
+        Contact.objects.bulk_create(batch)
+        # bulk_create não passa pelo save(): contadores por categoria aqui
+        CategoryCount.apply_deltas(batch[0].owner_id, Counter(contact.category_id for contact in batch))
+    return len(batch)
+
+
+# Leitura -------------------------------------------------------------------
+
+def _text_lines(file):
+    """Linhas do arquivo binário já decodificadas (UTF-8, com ou sem BOM)."""
+    for index, line in enumerate(file):
+        text = line.decode('utf-8', errors='replace')
+        if index == 0:
+            text = text.lstrip('\ufeff')
+        yield text
+
+
+def _normalize(name):
+    name = unicodedata.normalize('NFKD', name.strip().lower())
+    name = ''.join(char for char in name if not unicodedata.combining(char))
+    return name.replace('-', '_').replace(' ', '_')
+
+
+def iter_csv(file):
+    """Gera ``(linha, {campo: valor})`` para cada registro do CSV."""
+    lines = _text_lines(file)
+    header_line = next(lines, '')
+    delimiter = ';' if header_line.count(';') > header_line.count(',') else ','
+
+    header = next(csv.reader([header_line], delimiter=delimiter), [])
+    columns = [CSV_COLUMNS.get(_normalize(column)) for column in header]
+
+    reader = csv.reader(lines, delimiter=delimiter)
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+
+        data = {}
+        for column, value in zip(columns, values):
+            if column and not data.get(column):
+                data[column] = value
+
+        # +1 pelo cabeçalho, já consumido
+        yield reader.line_num + 1, data
+
+
+def iter_vcard(file):
+    """Gera ``(linha inicial, {campo: valor})`` para cada cartão."""
+    card = None
+    start = 0
+
+    for number, line in _unfold(_text_lines(file)):
+        name, params, value = _parse_property(line)
+
+        if name == 'BEGIN' and value.upper() == 'VCARD':
+            card, start = {}, number
+        elif name == 'END' and value.upper() == 'VCARD':
+            if card is not None:
+                yield start, card
+            card = None
+        elif card is not None:
+            _apply_property(card, name, params, value)
+
+
+def _unfold(lines):
+    """Junta as linhas de continuação (começam com espaço ou tab)."""
+    current, start = None, 0
+
+    for number, line in enumerate(lines, start=1):
+        line = line.rstrip('\r\n')
+        if current is not None and line[:1] in (' ', '\t'):
+            current += line[1:]
+            continue
+
+        if current:
+            yield start, current
+        current, start = line, number
+
+    if current:
+        yield start, current
+
+
+def _parse_property(line):
+    head, _, value = line.partition(':')
+    parts = head.split(';')
+    # "item1.TEL" -> "TEL"
+    name = parts[0].rpartition('.')[2].upper()
+    params = [param.upper() for param in parts[1:]]
+    return name, params, value
+
+
+def _unescape(value):
+    return (
+        value.replace('\\n', '\n').replace('\\N', '\n')
+        .replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\')
+    )
+
+
+def _split_structured(value):
+    parts, current, escaped = [], '', False
+    for char in value:
+        if escaped:
+            current += '\\' + char
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == ';':
+            parts.append(_unescape(current))
+            current = ''
+        else:
+            current += char
+    parts.append(_unescape(current))
+    return parts
+
+
+def _apply_property(card, name, params, value):
+    if name == 'N':
+        parts = _split_structured(value) + ['', '']
+        if parts[0] or parts[1]:
+            card['last_name'], card['first_name'] = parts[0], parts[1]
+    elif name == 'FN':
+        card['_full_name'] = _unescape(value)
+        if not card.get('first_name'):
+            first, _, last = card['_full_name'].strip().partition(' ')
+            card['first_name'], card['last_name'] = first, last
+    elif name == 'TEL':
+        # Prefere o telefone marcado como preferido; senão, o primeiro
+        value = value.removeprefix('tel:')
+        if not card.get('phone') or any('PREF' in param for param in params):
+            card['phone'] = value
+    elif name == 'EMAIL' and not card.get('email'):
+        card['email'] = _unescape(value)
+    elif name == 'NOTE':
+        card['description'] = _unescape(value)
+    elif name == 'CATEGORIES' and not card.get('category'):
+        card['category'] = _split_structured(value.replace(',', ';'))[0]
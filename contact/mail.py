@@ -0,0 +1,260 @@
+"""
+Fila de emails transacionais.
+
+As views nunca falam com o servidor de email: ``enqueue()`` só grava um
+``OutgoingEmail`` (uma inserção, dentro da transação do request). O comando
+``send_queued_emails`` reserva os emails pendentes em lotes e os entrega
+por uma conexão que fica aberta entre os lotes:
+
+* ``'resend'``: API de lote do Resend (até 100 emails por requisição HTTP,
+  cliente keep-alive; um lote recusado é dividido até isolar os emails
+  inválidos);
+* ``'smtp'``: o ``EMAIL_BACKEND`` do Django com uma sessão SMTP persistente;
+* ``'fake'``: guarda os emails em ``FakeBackend.outbox`` (testes e
+  desenvolvimento), podendo simular falhas.
+
+``EMAIL_QUEUE_BACKEND = 'auto'`` usa o Resend se ``RESEND_API_KEY`` estiver
+definida e SMTP caso contrário. Falhas temporárias são repetidas com backoff
+exponencial até ``EMAIL_QUEUE_RETRIES`` tentativas; erros permanentes
+(endereço recusado, requisição inválida) marcam o email como falho na hora.
+"""
+import logging
+import smtplib
+from datetime import timedelta
+
+import httpx
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from contact.models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+# Tempo que um worker "segura" o lote antes que outro possa retomá-lo
+LEASE = timedelta(minutes=5)
+
+RESEND_BATCH_URL = 'https://api.resend.com/emails/batch'
+
+# Lote recusado pela validação de algum email (endereço inválido etc.)
+RESEND_REJECTED = (400, 422)
+
+
+class DeliveryError(Exception):
+    def __init__(self, message, permanent=False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+def enqueue(to, subject, body, html_body='', from_email=''):
+    """Coloca um email na fila. ``to`` é um endereço ou uma lista deles."""
+    if isinstance(to, str):
+        to = [to]
+    return OutgoingEmail.objects.create(
+        to=list(to), subject=subject, body=body, html_body=html_body, from_email=from_email,
+    )
+
+
+def max_attempts():
+    return int(getattr(settings, 'EMAIL_QUEUE_RETRIES', 6))
+
+
+def retry_delay(attempts):
+    base = float(getattr(settings, 'EMAIL_QUEUE_BACKOFF', 30))
+    return timedelta(seconds=base * 2 ** (attempts - 1))
+
+
+def get_backend(name=None):
+    name = name or getattr(settings, 'EMAIL_QUEUE_BACKEND', 'auto')
+    if name == 'auto':
+        name = 'resend' if getattr(settings, 'RESEND_API_KEY', '') else 'smtp'
+
+    if name == 'resend':
+        return ResendBackend(settings.RESEND_API_KEY)
+    if name == 'smtp':
+        return SmtpBackend()
+    if name == 'fake':
+        return FakeBackend()
+    raise ValueError(f'EMAIL_QUEUE_BACKEND desconhecido: {name}')
+
+
+def claim_batch(limit):
+    """
+    Reserva até ``limit`` emails vencidos para este worker. No PostgreSQL
+    ``SKIP LOCKED`` deixa vários workers pegarem lotes diferentes sem espera.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutgoingEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=OutgoingEmail.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('pk', flat=True)[:limit]
+        )
+        OutgoingEmail.objects.filter(pk__in=ids).update(next_attempt_at=now + LEASE)
+
+    return list(OutgoingEmail.objects.filter(pk__in=ids).order_by('pk'))
+
+
+def deliver(backend, limit=100):
+    """Entrega um lote de emails pendentes. Retorna ``(enviados, falhas)``."""
+    emails = claim_batch(limit)
+    sent = failed = 0
+
+    for start in range(0, len(emails), backend.max_batch):
+        chunk = emails[start:start + backend.max_batch]
+        try:
+            errors = backend.send(chunk)
+        except DeliveryError as error:
+            logger.warning('Lote de %s emails falhou: %s', len(chunk), error)
+            errors = [error] * len(chunk)
+        except Exception as error:
+            logger.exception('Erro inesperado ao enviar emails')
+            errors = [DeliveryError(str(error))] * len(chunk)
+
+        delivered = [email.pk for email, error in zip(chunk, errors) if error is None]
+        OutgoingEmail.objects.filter(pk__in=delivered).delete()
+        sent += len(delivered)
+
+        for email, error in zip(chunk, errors):
+            if error is not None:
+                _failed(email, error)
+                failed += 1
+
+    return sent, failed
+
+
+def _failed(email, error):
+    email.attempts += 1
+    email.last_error = str(error)
+
+    if error.permanent or email.attempts >= max_attempts():
+        email.status = OutgoingEmail.STATUS_FAILED
+        email.save(update_fields=['attempts', 'last_error', 'status'])
+        logger.error('Email %s desistido após %s tentativas: %s', email.pk, email.attempts, error)
+        return
+
+    email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+    email.save(update_fields=['attempts', 'last_error', 'next_attempt_at'])
+
+
+# Backends ------------------------------------------------------------------------
+#
+# send(emails) devolve, na mesma ordem, None (enviado) ou um DeliveryError;
+# um DeliveryError lançado vale para o lote inteiro.
+
+class ResendBackend:
+    max_batch = 100
+
+    def __init__(self, api_key, url=RESEND_BATCH_URL, timeout=10, transport=None):
+        self.url = url
+        self.from_email = getattr(settings, 'RESEND_FROM_EMAIL', None) or settings.DEFAULT_FROM_EMAIL
+        self.client = httpx.Client(
+            headers={'Authorization': f'Bearer {api_key}'}, timeout=timeout, transport=transport,
+        )
+
+    def send(self, emails):
+        payload = [self._payload(email) for email in emails]
+        try:
+            response = self.client.post(self.url, json=payload)
+        except httpx.HTTPError as error:
+            raise DeliveryError(f'Resend indisponível: {error}')
+
+        if response.status_code == 429 or response.status_code >= 500:
+            raise DeliveryError(f'Resend {response.status_code}: {response.text[:200]}')
+        if response.status_code in RESEND_REJECTED and len(emails) > 1:
+            # A API de lote é tudo ou nada: um endereço inválido derruba os
+            # outros. Divide o lote ao meio até isolar os emails recusados.
+            middle = len(emails) // 2
+            return self._send_part(emails[:middle]) + self._send_part(emails[middle:])
+        if response.status_code >= 400:
+            # Requisição rejeitada (endereço ou remetente inválido): repetir não adianta
+            raise DeliveryError(f'Resend {response.status_code}: {response.text[:200]}', permanent=True)
+
+        # 2xx: todos os emails do lote foram aceitos
+        return [None] * len(emails)
+
+    def _send_part(self, emails):
+        # Uma falha temporária numa metade não reenvia a outra, já aceita
+        try:
+            return self.send(emails)
+        except DeliveryError as error:
+            return [error] * len(emails)
+
+    def _payload(self, email):
+        payload = {
+            'from': email.from_email or self.from_email,
+            'to': email.to,
+            'subject': email.subject,
+            'text': email.body,
+        }
+        if email.html_body:
+            payload['html'] = email.html_body
+        return payload
+
+    def close(self):
+        self.client.close()
+
+
+class SmtpBackend:
+    max_batch = 100
+
+    def __init__(self):
+        # O EMAIL_BACKEND configurado (SMTP em produção), aberto uma vez só
+        self.connection = get_connection(fail_silently=False)
+        self.from_email = settings.DEFAULT_FROM_EMAIL
+
+    def send(self, emails):
+        errors = []
+        for email in emails:
+            message = EmailMultiAlternatives(
+                email.subject, email.body, email.from_email or self.from_email, email.to,
+                connection=self.connection,
+            )
+            if email.html_body:
+                message.attach_alternative(email.html_body, 'text/html')
+
+            try:
+                # Não faz nada se a sessão já estiver aberta
+                self.connection.open()
+                self.connection.send_messages([message])
+                errors.append(None)
+            except smtplib.SMTPRecipientsRefused as error:
+                errors.append(DeliveryError(f'Destinatário recusado: {error}', permanent=True))
+            except (smtplib.SMTPException, OSError) as error:
+                # Sessão perdida: reabre no próximo email
+                logger.warning('Falha no envio SMTP para %s: %s', ', '.join(email.to), error)
+                self.close()
+                errors.append(DeliveryError(str(error)))
+        return errors
+
+    def close(self):
+        try:
+            self.connection.close()
+        except (smtplib.SMTPException, OSError):
+            pass
+
+
+class FakeBackend:
+    """Não envia nada: acumula em ``FakeBackend.outbox``. Para testes."""
+    max_batch = 100
+    outbox = []
+    # Próximos envios que devem falhar: lista de DeliveryError
+    failures = []
+
+    def send(self, emails):
+        errors = []
+        for email in emails:
+            if FakeBackend.failures:
+                errors.append(FakeBackend.failures.pop(0))
+                continue
+            FakeBackend.outbox.append({
+                'to': email.to, 'subject': email.subject, 'body': email.body, 'html_body': email.html_body,
+            })
+            errors.append(None)
+        return errors
+
+    def close(self):
+        pass
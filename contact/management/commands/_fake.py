@@ -0,0 +1,38 @@
+"""Gerador simples de dados falsos (pt-BR) para comandos de carga e benchmark."""
+import random
+
+FIRST_NAMES = (
+    'Ana', 'João', 'Maria', 'José', 'Antônio', 'Francisco', 'Carlos', 'Paulo',
+    'Pedro', 'Lucas', 'Luiz', 'Marcos', 'Luís', 'Gabriel', 'Rafael', 'Daniel',
+    'Marcelo', 'Bruno', 'Eduardo', 'Felipe', 'Raimundo', 'Rodrigo', 'Juliana',
+    'Márcia', 'Fernanda', 'Patrícia', 'Aline', 'Sandra', 'Camila', 'Amanda',
+    'Bruna', 'Jéssica', 'Letícia', 'Júlia', 'Luciana', 'Vanessa', 'Mariana',
+    'Gabriela', 'Vitória', 'Larissa', 'Beatriz', 'Débora', 'Conceição', 'Inês',
+)
+
+LAST_NAMES = (
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves',
+    'Pereira', 'Lima', 'Gomes', 'Costa', 'Ribeiro', 'Martins', 'Carvalho',
+    'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira', 'Barbosa', 'Rocha',
+    'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes', 'Marques', 'Machado',
+    'Mendes', 'Freitas', 'Cardoso', 'Ramos', 'Gonçalves', 'Santana', 'Teixeira',
+    'Araújo', 'Mourão', 'Conceição', 'Brandão', 'Magalhães', 'Simões', 'Assunção',
+)
+
+EMAIL_DOMAINS = ('gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com.br', 'uol.com.br')
+
+_ASCII = str.maketrans('áàâãéêíóôõúüçÁÀÂÃÉÊÍÓÔÕÚÜÇ', 'aaaaeeiooouucAAAAEEIOOOUUC')
+
+
+def fake_contact(rng=random):
+    """Retorna um dicionário com os campos de um contato plausível."""
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    local_part = f'{first_name}.{last_name}{rng.randint(1, 9999)}'.lower().translate(_ASCII)
+
+    return {
+        'first_name': first_name,
+        'last_name': last_name,
+        'phone': f'{rng.randint(11, 99)}9{rng.randint(10000000, 99999999)}',
+        'email': f'{local_part}@{rng.choice(EMAIL_DOMAINS)}',
+    }
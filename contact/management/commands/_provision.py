@@ -0,0 +1,74 @@
+"""
+Criação de usuários em massa (provision_users, seed_contacts).
+
+Usuários e perfis são inseridos com ``bulk_create`` em lotes, sem o sinal
+post_save de cada usuário: o ``public_id`` vem do id (contact/public_ids.py),
+então o perfil é montado sem consultar o banco.
+"""
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from contact.models import Profile
+
+BATCH_SIZE = 1000
+
+
+def provision_users(rows, password=None, batch_size=BATCH_SIZE):
+    """
+    Cria os usuários de ``rows`` (dicts com ``username`` e, opcionalmente,
+    ``email``, ``first_name`` e ``last_name``) e seus perfis. Nomes que já
+    existem são ignorados. Todos recebem a mesma senha (hash calculado uma
+    vez) ou, sem ``password``, uma senha inutilizável.
+
+    Retorna ``(criados, existentes)``, listas de usuários.
+    """
+    password_hash = make_password(password)
+    created, existing = [], []
+    batch = []
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            _provision_batch(batch, password_hash, created, existing)
+            batch = []
+    if batch:
+        _provision_batch(batch, password_hash, created, existing)
+
+    return created, existing
+
+
+def _provision_batch(rows, password_hash, created, existing):
+    usernames = [row['username'] for row in rows]
+    found = {user.username: user for user in User.objects.filter(username__in=usernames)}
+    existing.extend(found[username] for username in usernames if username in found)
+
+    new_users, seen = [], set(found)
+    for row in rows:
+        if row['username'] in seen:
+            continue
+        seen.add(row['username'])
+        new_users.append(User(
+            username=row['username'],
+            email=row.get('email', ''),
+            first_name=row.get('first_name', ''),
+            last_name=row.get('last_name', ''),
+            password=password_hash,
+        ))
+    if not new_users:
+        return
+
+    with transaction.atomic():
+        User.objects.bulk_create(new_users)
+        if any(user.pk is None for user in new_users):
+            # Bancos sem RETURNING no INSERT em massa (MySQL)
+            ids = dict(User.objects.filter(username__in=[user.username for user in new_users])
+                       .values_list('username', 'pk'))
+            for user in new_users:
+                user.pk = ids[user.username]
+
+        Profile.objects.bulk_create(
+            Profile(user=user, public_id=Profile.generate_public_id(user.pk)) for user in new_users
+        )
+
+    created.extend(new_users)
@@ -0,0 +1,247 @@
+"""
+Geração e inserção em massa de contatos sintéticos (seed_contacts, bench_views).
+
+As linhas são geradas em processos paralelos (só Python, sem banco) e
+inseridas pelo processo principal: com ``bulk_create`` em lotes grandes ou,
+no PostgreSQL, com ``COPY``. Colunas que o gerador não preenche recebem o
+default do campo no modelo, então novos campos com default não quebram o
+COPY.
+"""
+import io
+import json
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import islice
+
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from contact import cache as contact_cache
+from contact.management.commands._fake import fake_contact
+from contact.management.commands._provision import provision_users
+from contact.models import CategoryCount, Contact
+from contact.search import search_key
+
+# Campos preenchidos pelo gerador, na ordem das tuplas geradas
+GENERATED_FIELDS = (
+    'owner_id', 'first_name', 'last_name', 'phone', 'email', 'description',
+    'create_date', 'show', 'category_id', 'picture', 'picture_variants',
+    # O COPY não passa pelo pre_save() do SearchKeyField: a chave vem pronta
+    'search_key',
+)
+
+DESCRIPTIONS = (
+    '', '', '', '',
+    'Colega de trabalho',
+    'Conhecido da faculdade',
+    'Vizinho do prédio',
+    'Contato do fornecedor',
+    'Amigo de infância, mora em outra cidade',
+    'Ligar apenas em horário comercial',
+)
+
+# Linhas por tarefa enviada a um processo gerador
+TASK_SIZE = 20_000
+
+
+def skewed_counts(total, users, skew=1.1):
+    """
+    Divide ``total`` contatos entre ``users`` donos seguindo uma lei de
+    potência (Zipf): poucos donos com agendas enormes, muitos com poucas.
+    """
+    if users <= 0:
+        return []
+
+    weights = [1 / (rank + 1) ** skew for rank in range(users)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+
+    # Distribui o resto do arredondamento entre os maiores
+    for index in range(total - sum(counts)):
+        counts[index % users] += 1
+
+    return counts
+
+
+def ensure_users(count, prefix='seed_user_', password='seed'):
+    """Cria (ou reaproveita) ``count`` usuários ``<prefix>0000``, ``<prefix>0001``..."""
+    usernames = [f'{prefix}{index:04}' for index in range(count)]
+    created, existing = provision_users(({'username': username} for username in usernames), password)
+
+    users = {user.username: user for user in created + existing}
+    return [users[username] for username in usernames]
+
+
+def build_tasks(owner_counts, categories, pictures, picture_ratio, hidden_ratio, seed):
+    """Quebra a carga de cada dono em tarefas de até TASK_SIZE linhas."""
+    tasks = []
+    for owner_id, count in owner_counts:
+        for offset in range(0, count, TASK_SIZE):
+            tasks.append({
+                'seed': hash((seed, owner_id, offset)),
+                'owner_id': owner_id,
+                'count': min(TASK_SIZE, count - offset),
+                'categories': categories,
+                'pictures': pictures,
+                'picture_ratio': picture_ratio,
+                'hidden_ratio': hidden_ratio,
+                'now': timezone.now(),
+            })
+    return tasks
+
+
+def generate_rows(task):
+    """Executado nos processos geradores: devolve tuplas em GENERATED_FIELDS."""
+    rng = random.Random(task['seed'])
+    now = task['now']
+    rows = []
+
+    for _ in range(task['count']):
+        contact = fake_contact(rng)
+        picture, variants = '', {}
+        if task['pictures'] and rng.random() < task['picture_ratio']:
+            picture, variants = rng.choice(task['pictures'])
+
+        email = contact['email'] if rng.random() < 0.8 else ''
+
+        rows.append((
+            task['owner_id'],
+            contact['first_name'],
+            contact['last_name'],
+            contact['phone'],
+            email,
+            rng.choice(DESCRIPTIONS),
+            now - timedelta(seconds=rng.randint(0, 2 * 365 * 24 * 3600)),
+            rng.random() >= task['hidden_ratio'],
+            rng.choice(task['categories']) if task['categories'] and rng.random() < 0.7 else None,
+            picture,
+            variants,
+            search_key(contact['first_name'], contact['last_name'], email, contact['phone']),
+        ))
+
+    return rows
+
+
+def generated_rows(tasks, workers):
+    """Gera as linhas de cada tarefa, em paralelo se ``workers`` > 1."""
+    if workers <= 1:
+        for task in tasks:
+            yield generate_rows(task)
+        return
+
+    # Os processos filhos não usam o banco; não herdam conexões abertas
+    connections.close_all()
+    pending = deque()
+    tasks = iter(tasks)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # No máximo 2 tarefas por processo em andamento: se a inserção for mais
+        # lenta que a geração, as linhas não se acumulam na memória
+        for task in islice(tasks, workers * 2):
+            pending.append(executor.submit(generate_rows, task))
+
+        while pending:
+            rows = pending.popleft().result()
+            for task in islice(tasks, 1):
+                pending.append(executor.submit(generate_rows, task))
+            yield rows
+
+
+def insert_rows(rows, method='bulk', batch_size=10_000):
+    if method == 'copy':
+        _copy_rows(rows)
+    else:
+        for start in range(0, len(rows), batch_size):
+            with transaction.atomic():
+                Contact.objects.bulk_create(
+                    (Contact(**dict(zip(GENERATED_FIELDS, row))) for row in rows[start:start + batch_size]),
+                    batch_size=batch_size,
+                )
+
+
+def seed_contacts(owner_counts, categories=(), pictures=(), picture_ratio=0.0, hidden_ratio=0.05,
+                  workers=None, method='auto', batch_size=10_000, seed=42, progress=None):
+    """
+    Gera e insere ``count`` contatos para cada ``(owner_id, count)``.
+    ``pictures`` é uma lista de ``(nome no storage, variantes)``.
+    Retorna o total inserido.
+    """
+    if method == 'auto':
+        method = 'copy' if connection.vendor == 'postgresql' else 'bulk'
+    workers = workers or os.cpu_count() or 1
+
+    tasks = build_tasks(owner_counts, list(categories), list(pictures), picture_ratio, hidden_ratio, seed)
+    inserted = 0
+
+    for rows in generated_rows(tasks, workers):
+        insert_rows(rows, method, batch_size)
+        inserted += len(rows)
+        if progress:
+            progress(inserted)
+
+    # Inserções em massa não disparam post_save
+    for owner_id, _ in owner_counts:
+        contact_cache.bump_owner_version(owner_id)
+    CategoryCount.rebuild([owner_id for owner_id, _ in owner_counts])
+
+    if connection.vendor == 'postgresql':
+        # Estatísticas atualizadas para o planner enxergar os dados novos
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Contact._meta.db_table}')
+
+    return inserted
+
+
+# COPY (PostgreSQL) -------------------------------------------------------------
+
+def _copy_columns():
+    """Colunas do COPY: as geradas e, depois, as demais com o default do modelo."""
+    fields = {field.attname: field for field in Contact._meta.concrete_fields if not field.primary_key}
+    # pre_save() de um contato novo: default do campo, auto_now etc.
+    template = Contact()
+    extra = [
+        (fields[name].column, _copy_text(fields[name].pre_save(template, True)))
+        for name in fields if name not in GENERATED_FIELDS
+    ]
+    columns = [fields[name].column for name in GENERATED_FIELDS] + [column for column, _ in extra]
+    return columns, '\t'.join(value for _, value in extra)
+
+
+def _copy_rows(rows):
+    columns, defaults = _copy_columns()
+    buffer = io.StringIO()
+
+    for row in rows:
+        line = '\t'.join(_copy_text(value) for value in row)
+        buffer.write(f'{line}\t{defaults}\n' if defaults else f'{line}\n')
+
+    buffer.seek(0)
+    sql = f'COPY {Contact._meta.db_table} ({", ".join(columns)}) FROM STDIN'
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, 'copy_expert'):  # psycopg2
+            raw.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+
+def _copy_text(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+
+    return (
+        str(value)
+        .replace('\\', '\\\\').replace('\t', '\\t')
+        .replace('\n', '\\n').replace('\r', '\\r')
+    )
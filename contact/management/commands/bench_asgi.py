@@ -0,0 +1,272 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import override_settings
+
+from contact.management.commands import _seed
+from contact.models import Contact
+
+BENCH_USERNAME = '__bench_asgi__'
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+VIEWS = ('index', 'search', 'contact')
+
+MODES = ('wsgi', 'asgi')
+
+
+class Command(BaseCommand):
+    help = (
+        'Teste de carga das views index, search e contact: WSGI (project/wsgi.py, '
+        'views síncronas, N threads) contra ASGI (project/asgi.py, views async, '
+        'N requisições simultâneas). Mede requisições/s e latência p50/p99 e '
+        'grava o resultado em JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--contacts', type=int, default=5_000, help='Contatos do usuário de teste')
+        parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 10, 50])
+        parser.add_argument('--requests', type=int, default=500, help='Requisições por view e concorrência')
+        parser.add_argument('--views', nargs='+', choices=VIEWS, default=list(VIEWS))
+        parser.add_argument(
+            '--threads', type=int, default=8,
+            help='Threads do servidor WSGI (gunicorn --threads); acima disso as requisições esperam',
+        )
+        parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+        parser.add_argument(
+            '--db-latency', type=float, default=0,
+            help='Atraso (ms) somado a cada consulta, simulando um banco remoto',
+        )
+        parser.add_argument('--with-cache', action='store_true', help='Mantém o cache configurado (padrão: sem cache)')
+        parser.add_argument('--output', help='Arquivo JSON (padrão: bench_results/asgi-<data>.json)')
+        parser.add_argument('--keep', action='store_true', help='Mantém o usuário e os contatos gerados')
+        # Uso interno: processo filho que roda um dos modos
+        parser.add_argument('--worker', choices=MODES, help='(interno)')
+        parser.add_argument('--session', help='(interno)')
+        parser.add_argument('--contact-id', type=int, help='(interno)')
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            return self._worker(options)
+
+        owner, _ = User.objects.get_or_create(username=BENCH_USERNAME)
+        Contact.objects.filter(owner=owner).delete()
+        results = {}
+
+        try:
+            _seed.seed_contacts([(owner.pk, options['contacts'])], hidden_ratio=0, seed=options['contacts'])
+            contact_id = Contact.objects.filter(owner=owner).order_by('-id').values_list('pk', flat=True).first()
+
+            client = Client()
+            client.force_login(owner)
+            session = client.cookies[settings.SESSION_COOKIE_NAME].value
+
+            for mode in options['modes']:
+                self.stdout.write(self.style.MIGRATE_HEADING(mode.upper()))
+                results[mode] = self._run_worker(mode, session, contact_id, options)
+                for concurrency, views in results[mode].items():
+                    for view, stats in views.items():
+                        self.stdout.write(f'  c={concurrency:<4} {view:8} {self._format(stats)}')
+
+            self._compare(results, options)
+        finally:
+            if not options['keep']:
+                Contact.objects.filter(owner=owner).delete()
+                owner.delete()
+
+        path = Path(options['output'] or f'bench_results/asgi-{datetime.now():%Y%m%d-%H%M%S}.json')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'meta': self._meta(options), 'results': results}, indent=2))
+        self.stdout.write(self.style.SUCCESS(f'Resultados gravados em {path}'))
+
+    def _run_worker(self, mode, session, contact_id, options):
+        """Cada modo roda num processo novo: as URLs escolhem as views na importação."""
+        command = [
+            sys.executable, sys.argv[0], 'bench_asgi',
+            '--worker', mode, '--session', session, '--contact-id', str(contact_id),
+            '--requests', str(options['requests']), '--db-latency', str(options['db_latency']),
+            '--threads', str(options['threads']),
+            '--concurrency', *map(str, options['concurrency']), '--views', *options['views'],
+        ]
+        if options['with_cache']:
+            command.append('--with-cache')
+
+        env = {**os.environ, 'CONTACT_ASYNC_VIEWS': 'true' if mode == 'asgi' else 'false'}
+        process = subprocess.run(command, env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            raise CommandError(f'Falha no modo {mode}:\n{process.stderr[-2000:]}')
+
+        return json.loads(process.stdout.strip().splitlines()[-1])
+
+    # Processo filho -----------------------------------------------------------------
+
+    def _worker(self, options):
+        if options['db_latency']:
+            delay = options['db_latency'] / 1000
+
+            def slow(execute, sql, params, many, context):
+                time.sleep(delay)
+                return execute(sql, params, many, context)
+
+            # Toda conexão nova (uma por thread) recebe o atraso. Na frente da
+            # lista: execute_wrapper() (QueryBudgetMiddleware) remove com pop()
+            connection_created.connect(
+                lambda sender, connection, **kwargs: connection.execute_wrappers.insert(0, slow), weak=False,
+            )
+
+        urls = {
+            'index': '/',
+            'search': '/search/?q=silva',
+            'contact': f'/contact/{options["contact_id"]}/',
+        }
+        overrides = {'ALLOWED_HOSTS': ['*']}
+        if not options['with_cache']:
+            overrides['CACHES'] = NO_CACHE
+
+        results = {}
+        with override_settings(**overrides):
+            if options['worker'] == 'wsgi':
+                from django.core.wsgi import get_wsgi_application
+                application = self._limit_threads(get_wsgi_application(), options['threads'])
+                run = self._load_wsgi
+            else:
+                from django.core.asgi import get_asgi_application
+                application = get_asgi_application()
+                run = self._load_asgi
+
+            cookies = {settings.SESSION_COOKIE_NAME: options['session']}
+            for concurrency in options['concurrency']:
+                results[concurrency] = {}
+                for view in options['views']:
+                    # Aquecimento: conexões, templates, caches internos
+                    run(application, cookies, urls[view], concurrency, concurrency * 2)
+                    results[concurrency][view] = run(
+                        application, cookies, urls[view], concurrency, options['requests'],
+                    )
+
+        self.stdout.write(json.dumps(results))
+
+    def _limit_threads(self, application, threads):
+        """No máximo ``threads`` requisições sendo atendidas; as demais esperam na fila."""
+        slots = threading.BoundedSemaphore(threads)
+
+        def limited(environ, start_response):
+            with slots:
+                response = application(environ, start_response)
+                try:
+                    return [b''.join(response)]
+                finally:
+                    if hasattr(response, 'close'):
+                        response.close()
+
+        return limited
+
+    def _load_wsgi(self, application, cookies, url, concurrency, total):
+        """N clientes simultâneos contra o servidor WSGI de ``--threads`` threads."""
+        counter = iter(range(total))
+        lock = threading.Lock()
+        timings, errors = [], []
+
+        def work():
+            with httpx.Client(
+                transport=httpx.WSGITransport(app=application), base_url='https://testserver', cookies=cookies,
+            ) as client:
+                while True:
+                    with lock:
+                        if next(counter, None) is None:
+                            return
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    timings.append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        errors.append(response.status_code)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for future in [executor.submit(work) for _ in range(concurrency)]:
+                future.result()
+        return self._stats(timings, errors, time.perf_counter() - start)
+
+    def _load_asgi(self, application, cookies, url, concurrency, total):
+        """N requisições simultâneas num único event loop."""
+        async def load():
+            counter = iter(range(total))
+            timings, errors = [], []
+
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=application), base_url='https://testserver', cookies=cookies,
+            ) as client:
+                async def work():
+                    while next(counter, None) is not None:
+                        start = time.perf_counter()
+                        response = await client.get(url)
+                        timings.append(time.perf_counter() - start)
+                        if response.status_code != 200:
+                            errors.append(response.status_code)
+
+                start = time.perf_counter()
+                await asyncio.gather(*(work() for _ in range(concurrency)))
+                return timings, errors, time.perf_counter() - start
+
+        return self._stats(*asyncio.run(load()))
+
+    def _stats(self, timings, errors, elapsed):
+        timings = sorted(timing * 1000 for timing in timings)
+        return {
+            'requests_per_s': round(len(timings) / elapsed, 1),
+            'p50_ms': round(statistics.median(timings), 3),
+            'p99_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 3),
+            'errors': len(errors),
+        }
+
+    # Relatório ----------------------------------------------------------------------
+
+    def _format(self, stats):
+        text = (
+            f'{stats["requests_per_s"]:8.1f} req/s  p50 {stats["p50_ms"]:8.2f} ms  '
+            f'p99 {stats["p99_ms"]:8.2f} ms'
+        )
+        if stats['errors']:
+            text += self.style.ERROR(f'  {stats["errors"]} erros')
+        return text
+
+    def _compare(self, results, options):
+        if set(results) != set(MODES):
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING('ASGI vs WSGI'))
+        for concurrency, views in results['asgi'].items():
+            for view, stats in views.items():
+                baseline = results['wsgi'][concurrency][view]
+                change = (stats['requests_per_s'] - baseline['requests_per_s']) / baseline['requests_per_s'] * 100
+                self.stdout.write(
+                    f'  c={concurrency:<4} {view:8} {change:+6.1f}% req/s, '
+                    f'p99 {baseline["p99_ms"]:.2f} -> {stats["p99_ms"]:.2f} ms'
+                )
+
+    def _meta(self, options):
+        return {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'database': connection.vendor,
+            'contacts': options['contacts'],
+            'requests': options['requests'],
+            'db_latency_ms': options['db_latency'],
+            'wsgi_threads': options['threads'],
+            'cache': options['with_cache'],
+        }
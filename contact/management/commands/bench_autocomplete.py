@@ -0,0 +1,93 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+
+from contact import autocomplete
+from contact import cache as contact_cache
+from contact.management.commands._fake import fake_contact
+from contact.models import CategoryCount, Contact
+
+BENCH_USERNAME = '__bench_autocomplete__'
+
+# Meta de latência por tecla
+TARGET_P95_MS = 10
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a latência do autocomplete (uma consulta por tecla, índices de '
+        'prefixo) para um dono com 10k, 100k e 1M contatos, com e sem o LRU '
+        'de prefixos em memória.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--repeat', type=int, default=20, help='Vezes que cada palavra é digitada')
+        parser.add_argument('--cache-size', type=int, default=1_000, help='Entradas do LRU na segunda medição')
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--keep', action='store_true', help='Mantém o usuário e os contatos gerados')
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        owner, _ = User.objects.get_or_create(username=BENCH_USERNAME)
+        Contact.objects.filter(owner=owner).delete()
+
+        # Cada palavra é digitada uma letra por vez, como no campo de busca
+        words = ['maria', 'Silva', 'jose.s', '1198', 'zzzz']
+        total = 0
+
+        try:
+            for size in sorted(options['sizes']):
+                total = self._grow(owner, total, size, options['batch_size'], rng)
+                if connection.vendor == 'postgresql':
+                    with connection.cursor() as cursor:
+                        cursor.execute('ANALYZE contact_contact')
+                self.stdout.write(self.style.MIGRATE_HEADING(f'{size} contatos'))
+
+                for label, cache_size in (('sem cache', 0), (f'LRU de {options["cache_size"]}', options['cache_size'])):
+                    with override_settings(CONTACT_AUTOCOMPLETE_CACHE_SIZE=cache_size):
+                        timings = self._measure(owner, words, options['repeat'])
+                    self.stdout.write(f'  {label:16} {self._format(timings)}')
+        finally:
+            if not options['keep']:
+                Contact.objects.filter(owner=owner).delete()
+                owner.delete()
+
+    def _grow(self, owner, current, target, batch_size, rng):
+        while current < target:
+            count = min(batch_size, target - current)
+            Contact.objects.bulk_create(
+                Contact(owner=owner, **fake_contact(rng)) for _ in range(count)
+            )
+            CategoryCount.apply_deltas(owner.pk, {None: count})
+            current += count
+        # bulk_create não passa pelos sinais: invalida as listas (e o LRU)
+        contact_cache.bump_owner_version(owner.pk)
+        return current
+
+    def _measure(self, owner, words, repeat):
+        prefix_cache = autocomplete.get_prefix_cache()
+        if prefix_cache is not None:
+            prefix_cache.clear()
+
+        timings = []
+        for _ in range(repeat):
+            for word in words:
+                for length in range(1, len(word) + 1):
+                    start = time.perf_counter()
+                    autocomplete.suggest(owner.pk, word[:length])
+                    timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def _format(self, timings):
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        line = f'mediana {statistics.median(timings):6.2f} ms, p95 {p95:6.2f} ms'
+        if p95 <= TARGET_P95_MS:
+            return f'{line}  {self.style.SUCCESS("ok")}'
+        return f'{line}  {self.style.WARNING(f"acima de {TARGET_P95_MS} ms")}'
@@ -0,0 +1,84 @@
+import statistics
+import time
+
+from django import forms
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from contact import categories
+from contact.forms import ContactForm
+from contact.models import Category
+
+BENCH_PREFIX = '__bench_forms__'
+
+
+class QuerysetContactForm(ContactForm):
+    """ContactForm como era antes: o select e a validação consultam Category"""
+    category = forms.ModelChoiceField(
+        Category.objects.all(), required=False, label='Categoria',
+        widget=forms.Select(attrs={'class': 'form-control'}),
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a renderização e a validação do ContactForm com o select de '
+        'categorias lido do banco (antes) e do cache de categorias em memória '
+        '(depois, contact/categories.py).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--categories', type=int, default=20, help='Categorias criadas para a medição')
+        parser.add_argument('--repeat', type=int, default=500, help='Medições por operação')
+        parser.add_argument('--warmup', type=int, default=20)
+
+    def handle(self, *args, **options):
+        created = Category.objects.bulk_create(
+            Category(name=f'{BENCH_PREFIX}{index:03}') for index in range(options['categories'])
+        )
+        # bulk_create não dispara sinais: a lista em memória precisa ser relida
+        categories.clear()
+
+        data = {
+            'first_name': 'Bench', 'last_name': 'Formulario', 'phone': '11999990000',
+            'category': str(created[len(created) // 2].pk) if created else '',
+        }
+        operations = {
+            'render': lambda form_class: str(form_class()),
+            'validate': lambda form_class: form_class(data).is_valid(),
+        }
+
+        try:
+            for label, form_class in (('antes (consulta a Category)', QuerysetContactForm),
+                                      ('depois (cache de categorias)', ContactForm)):
+                self.stdout.write(self.style.MIGRATE_HEADING(label))
+
+                for name, operation in operations.items():
+                    stats = self._bench(lambda: operation(form_class), options['repeat'], options['warmup'])
+                    self.stdout.write(
+                        f'  {name:8} mediana {stats["median_ms"]:7.3f} ms, p95 {stats["p95_ms"]:7.3f} ms, '
+                        f'{stats["queries"]:.1f} consultas'
+                    )
+        finally:
+            Category.objects.filter(pk__in=[category.pk for category in created]).delete()
+            categories.clear()
+
+    def _bench(self, operation, repeat, warmup):
+        for _ in range(warmup):
+            operation()
+
+        timings = []
+        with CaptureQueriesContext(connection) as captured:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                operation()
+                timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        return {
+            'median_ms': statistics.median(timings),
+            'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+            # Por operação
+            'queries': len(captured.captured_queries) / repeat,
+        }
@@ -0,0 +1,92 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from contact.management.commands._fake import fake_contact
+from contact.models import CategoryCount, Contact
+from contact.search import search_contacts
+
+BENCH_USERNAME = '__bench_search__'
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a latência da busca de contatos (indexada x icontains) '
+        'para um dono com 10k, 100k e 1M contatos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--repeat', type=int, default=20, help='Execuções por termo')
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--skip-legacy', action='store_true', help='Não mede o icontains antigo')
+        parser.add_argument('--keep', action='store_true', help='Mantém o usuário e os contatos gerados')
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        owner, _ = User.objects.get_or_create(username=BENCH_USERNAME)
+        Contact.objects.filter(owner=owner).delete()
+
+        terms = ['silva', 'Jos', 'maria.souza', '9876', 'gmail', 'zzzz-sem-resultado']
+        total = 0
+
+        try:
+            for size in sorted(options['sizes']):
+                total = self._grow(owner, total, size, options['batch_size'], rng)
+                self.stdout.write(self.style.MIGRATE_HEADING(f'{size} contatos'))
+
+                for term in terms:
+                    indexed = self._measure(
+                        lambda: search_contacts(self._base(owner), term),
+                        options['repeat'],
+                    )
+                    line = f'  {term!r:24} indexada: {self._format(indexed)}'
+
+                    if not options['skip_legacy']:
+                        legacy = self._measure(lambda: self._legacy(owner, term), options['repeat'])
+                        line += f' | icontains: {self._format(legacy)}'
+
+                    self.stdout.write(line)
+        finally:
+            if not options['keep']:
+                Contact.objects.filter(owner=owner).delete()
+                owner.delete()
+
+    def _base(self, owner):
+        return Contact.objects.filter(show=True, owner=owner)
+
+    def _legacy(self, owner, term):
+        return self._base(owner).filter(
+            Q(first_name__icontains=term) |
+            Q(last_name__icontains=term) |
+            Q(phone__icontains=term) |
+            Q(email__icontains=term)
+        ).order_by('-id')
+
+    def _grow(self, owner, current, target, batch_size, rng):
+        while current < target:
+            count = min(batch_size, target - current)
+            Contact.objects.bulk_create(
+                Contact(owner=owner, **fake_contact(rng)) for _ in range(count)
+            )
+            CategoryCount.apply_deltas(owner.pk, {None: count})
+            current += count
+        return current
+
+    def _measure(self, build_queryset, repeat):
+        # Mede a primeira página, como a view faz
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(build_queryset()[:10])
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def _format(self, timings):
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        return f'mediana {statistics.median(timings):7.2f} ms, p95 {p95:7.2f} ms'
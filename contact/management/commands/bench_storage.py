@@ -0,0 +1,79 @@
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from supabase import create_client
+
+from contact import supabase_storage
+from contact.fake_storage import FakeStorageServer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara a latência de upload/download no Storage com um cliente novo '
+        'por operação (antes) e com o cliente compartilhado (depois), contra '
+        'um servidor local que imita o Supabase Storage.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Operações por cenário')
+        parser.add_argument('--size', type=int, default=50_000, help='Tamanho (bytes) de cada arquivo')
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--latency', type=float, default=0.002, help='Latência (s) por requisição')
+        parser.add_argument(
+            '--connect-latency', type=float, default=0.03,
+            help='Custo (s) de abrir uma conexão, simulando o handshake TCP/TLS',
+        )
+
+    def handle(self, *args, **options):
+        payload = os.urandom(options['size'])
+        server = FakeStorageServer(options['latency'], options['connect_latency'])
+
+        with server, override_settings(SUPABASE_URL=server.url, SUPABASE_SERVICE_KEY='bench', SUPABASE_HTTP2='false'):
+            supabase_storage.close_storage_client()
+            bucket = 'media'
+
+            def per_operation_client():
+                # Comportamento antigo: create_client a cada SupabaseStorage()
+                return create_client(server.url, 'bench').storage.from_(bucket)
+
+            def shared_client():
+                return supabase_storage.get_storage_client().from_(bucket)
+
+            for label, get_bucket in (('antes (cliente por operação)', per_operation_client),
+                                      ('depois (cliente compartilhado)', shared_client)):
+                connections = server.connections
+                prefix = 'before' if get_bucket is per_operation_client else 'after'
+
+                uploads = self._run(
+                    lambda i: get_bucket().upload(f'{prefix}/{i}.bin', payload),
+                    options['requests'], options['threads'],
+                )
+                downloads = self._run(
+                    lambda i: get_bucket().download(f'{prefix}/{i}.bin'),
+                    options['requests'], options['threads'],
+                )
+
+                self.stdout.write(self.style.MIGRATE_HEADING(label))
+                self.stdout.write(f'  upload:   {self._format(uploads)}')
+                self.stdout.write(f'  download: {self._format(downloads)}')
+                self.stdout.write(f'  conexões abertas: {server.connections - connections}')
+
+            supabase_storage.close_storage_client()
+
+    def _run(self, operation, count, threads):
+        def timed(i):
+            start = time.perf_counter()
+            operation(i)
+            return (time.perf_counter() - start) * 1000
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return list(executor.map(timed, range(count)))
+
+    def _format(self, timings):
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        return f'média {statistics.mean(timings):7.2f} ms, p95 {p95:7.2f} ms'
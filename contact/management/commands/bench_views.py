@@ -0,0 +1,176 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from contact.management.commands import _seed
+from contact.models import Contact
+
+BENCH_USERNAME = '__bench_views__'
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+VIEWS = ('index', 'search', 'contact', 'create', 'update', 'delete')
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede as views index, search, contact, create, update e delete com '
+        'um dono de N contatos, para vários N, e grava o resultado em JSON '
+        '(use --compare para ver a diferença em relação a uma execução anterior).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1_000, 10_000, 100_000])
+        parser.add_argument('--repeat', type=int, default=30, help='Medições por view')
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--workers', type=int, default=None, help='Processos geradores de dados')
+        parser.add_argument('--with-cache', action='store_true', help='Mantém o cache configurado (padrão: sem cache)')
+        parser.add_argument('--output', help='Arquivo JSON (padrão: bench_results/views-<data>.json)')
+        parser.add_argument('--compare', help='JSON de uma execução anterior para comparar')
+        parser.add_argument('--keep', action='store_true', help='Mantém o usuário e os contatos gerados')
+
+    def handle(self, *args, **options):
+        baseline = self._load(options['compare']) if options['compare'] else None
+
+        owner, _ = User.objects.get_or_create(username=BENCH_USERNAME)
+        Contact.objects.filter(owner=owner).delete()
+
+        results = {}
+        total = 0
+        overrides = {'ALLOWED_HOSTS': ['*']}
+        if not options['with_cache']:
+            overrides['CACHES'] = NO_CACHE
+
+        try:
+            with override_settings(**overrides):
+                for size in sorted(options['sizes']):
+                    if size > total:
+                        _seed.seed_contacts(
+                            [(owner.pk, size - total)], hidden_ratio=0,
+                            workers=options['workers'], seed=size,
+                        )
+                        total = size
+
+                    self.stdout.write(self.style.MIGRATE_HEADING(f'{size} contatos'))
+                    results[str(size)] = self._bench(owner, options['repeat'], options['warmup'])
+
+                    for view, stats in results[str(size)].items():
+                        line = f'  {view:8} {self._format(stats)}'
+                        previous = (baseline or {}).get('results', {}).get(str(size), {}).get(view)
+                        if previous:
+                            line += f'  {self._delta(previous, stats)}'
+                        self.stdout.write(line)
+        finally:
+            if not options['keep']:
+                Contact.objects.filter(owner=owner).delete()
+                owner.delete()
+
+        path = Path(options['output'] or f'bench_results/views-{datetime.now():%Y%m%d-%H%M%S}.json')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({'meta': self._meta(options), 'results': results}, indent=2))
+        self.stdout.write(self.style.SUCCESS(f'Resultados gravados em {path}'))
+
+    def _bench(self, owner, repeat, warmup):
+        client = Client()
+        client.force_login(owner)
+        contact_id = Contact.objects.filter(owner=owner).order_by('-id').values_list('pk', flat=True).first()
+        created = []
+
+        def create():
+            client.post(reverse('contact:create'), {'first_name': 'Bench', 'phone': '11999990000'}, secure=True)
+            created.append(Contact.objects.filter(owner=owner).order_by('-id').values_list('pk', flat=True).first())
+
+        # O delete apaga os contatos criados pelo create: o tamanho não muda
+        requests = {
+            'index': lambda: client.get(reverse('contact:index'), secure=True),
+            'search': lambda: client.get(reverse('contact:search'), {'q': 'silva'}, secure=True),
+            'contact': lambda: client.get(reverse('contact:contact', args=(contact_id,)), secure=True),
+            'create': create,
+            'update': lambda: client.post(
+                reverse('contact:update', args=(contact_id,)),
+                {'first_name': 'Bench', 'last_name': 'Atualizado', 'phone': '11999990001'},
+                secure=True,
+            ),
+            'delete': lambda: client.post(
+                reverse('contact:delete', args=(created.pop(),)), {'confirmation': 'yes'}, secure=True,
+            ),
+        }
+
+        results = {}
+        for view in VIEWS:
+            for _ in range(warmup):
+                requests[view]()
+
+            timings = []
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    requests[view]()
+                    timings.append((time.perf_counter() - start) * 1000)
+
+            results[view] = self._stats(timings, len(captured.captured_queries))
+
+        return results
+
+    def _stats(self, timings, queries):
+        timings = sorted(timings)
+        return {
+            'median_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            'mean_ms': round(statistics.mean(timings), 3),
+            'min_ms': round(timings[0], 3),
+            'queries': queries,
+        }
+
+    def _meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+
+        return {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'commit': commit,
+            'database': connection.vendor,
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'pagination': getattr(settings, 'CONTACT_PAGINATION', 'offset'),
+            'cache': options['with_cache'],
+            'repeat': options['repeat'],
+        }
+
+    def _load(self, path):
+        try:
+            return json.loads(Path(path).read_text())
+        except (OSError, ValueError) as error:
+            raise CommandError(f'Não foi possível ler {path}: {error}')
+
+    def _format(self, stats):
+        return (
+            f'mediana {stats["median_ms"]:8.2f} ms, p95 {stats["p95_ms"]:8.2f} ms, '
+            f'{stats["queries"]:2} consultas'
+        )
+
+    def _delta(self, previous, current):
+        change = (current['median_ms'] - previous['median_ms']) / previous['median_ms'] * 100
+        text = f'({change:+.1f}% vs {previous["median_ms"]:.2f} ms)'
+        if change > 10:
+            return self.style.ERROR(text)
+        if change < -10:
+            return self.style.SUCCESS(text)
+        return text
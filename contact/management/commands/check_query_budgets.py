@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from contact import budget_checks
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa cada view de contact/urls.py (e a listagem do admin), registra '
+        'as consultas SQL e falha se alguma estourar o orçamento declarado com '
+        '@query_budget, repetir consultas ou fizer N+1. Os testes '
+        '(contact/tests/test_query_budgets.py) fazem a mesma verificação; o '
+        'comando mostra as contagens e roda num banco com dados reais.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--contacts', type=int, default=30, help='Contatos gerados para o usuário')
+
+    def handle(self, *args, **options):
+        failures = []
+
+        # Transação desfeita ao final
+        with (
+            transaction.atomic(),
+            override_settings(ALLOWED_HOSTS=['*'], CACHES=budget_checks.EMPTY_CACHE),
+            budget_checks.picture_storage(),
+        ):
+            owner = budget_checks.populate(options['contacts'])
+
+            for label, url, log in budget_checks.view_logs(owner):
+                budget, problems = budget_checks.problems(url, log)
+                summary = log.summary()
+
+                status = self.style.ERROR('FALHOU') if problems else self.style.SUCCESS('ok')
+                limit = budget['max_queries'] if budget and budget['max_queries'] is not None else '-'
+                self.stdout.write(
+                    f'{label:22} {summary["queries"]:3}/{limit:<3} consultas '
+                    f'{summary["time_ms"]:7.2f} ms  {status}'
+                )
+
+                for problem in problems:
+                    self.stdout.write(f'  {problem}')
+                if options['verbosity'] > 1:
+                    for query in log.queries:
+                        self.stdout.write(f'    {query["sql"]}')
+
+                if problems:
+                    failures.append(label)
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f'Orçamento de consultas excedido em: {", ".join(failures)}')
+
+        self.stdout.write(self.style.SUCCESS('Todas as views dentro do orçamento.'))
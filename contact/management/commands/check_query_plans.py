@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from contact import query_plans
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa as views de contatos, captura o SQL gerado pelo ORM e roda '
+        'EXPLAIN em cada consulta. Falha se alguma fizer varredura completa '
+        'de contact_contact. Os testes (contact/tests/test_query_plans.py) '
+        'fazem a mesma verificação; o comando serve para rodá-la num banco '
+        'com dados reais.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--contacts', type=int, default=500, help='Contatos gerados por usuário')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'Banco não suportado: {connection.vendor}')
+
+        failures = []
+
+        # Tudo roda numa transação desfeita ao final: nenhum dado fica no banco
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['*'], CACHES=query_plans.NO_CACHE):
+            owner = query_plans.populate(options['contacts'])
+
+            for label, queries in query_plans.view_queries(owner):
+                for sql in queries:
+                    plan = query_plans.explain(sql)
+                    scan = query_plans.full_scan(plan)
+                    status = self.style.ERROR('FULL SCAN') if scan else self.style.SUCCESS('ok')
+                    self.stdout.write(f'{label:16} {status}')
+
+                    if scan or options['verbosity'] > 1:
+                        self.stdout.write(f'  {sql}\n  {plan}')
+
+                    if scan:
+                        failures.append(label)
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f'Varredura completa em: {", ".join(sorted(set(failures)))}')
+
+        self.stdout.write(self.style.SUCCESS('Todas as consultas usam índice.'))
@@ -0,0 +1,47 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from contact import importer
+
+
+class Command(BaseCommand):
+    help = 'Importa contatos de um arquivo CSV ou vCard para um usuário, em lotes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Arquivo .csv ou .vcf')
+        parser.add_argument('--user', required=True, help='Nome do usuário dono dos contatos')
+        parser.add_argument('--format', choices=('auto', 'csv', 'vcard'), default='auto')
+        parser.add_argument('--batch-size', type=int, default=importer.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'Usuário não encontrado: {options["user"]}')
+
+        try:
+            file = open(options['path'], 'rb')
+        except OSError as error:
+            raise CommandError(f'Não foi possível abrir o arquivo: {error}')
+
+        with file:
+            file_format = options['format']
+            if file_format == 'auto':
+                file_format = importer.detect_format(options['path'], file.read(64))
+                file.seek(0)
+
+            start = time.perf_counter()
+            report = importer.import_contacts(owner, file, file_format, options['batch_size'])
+            elapsed = time.perf_counter() - start
+
+        for line, errors in report.errors:
+            details = '; '.join(f'{field}: {message}' for field, message in errors.items())
+            self.stderr.write(f'linha {line}: {details}')
+        if report.truncated:
+            self.stderr.write(f'... e mais {report.failed - len(report.errors)} linhas com erro')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{report.created} contatos importados, {report.failed} com erro ({elapsed:.1f}s)'
+        ))
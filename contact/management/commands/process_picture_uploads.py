@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from contact import uploads
+from contact.models import PictureUpload
+
+
+class Command(BaseCommand):
+    help = (
+        'Envia ao storage as fotos guardadas localmente (CONTACT_PICTURE_UPLOAD '
+        '= "queue"), repetindo as que falharam. Também recolhe envios do modo '
+        '"thread" interrompidos por um restart.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Processa o que estiver pendente e sai')
+        parser.add_argument('--interval', type=float, default=2.0, help='Espera (s) quando a fila está vazia')
+        parser.add_argument('--batch', type=int, default=50, help='Envios reservados por rodada')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            pending = uploads.due_uploads(options['batch'])
+
+            for upload_id in pending:
+                upload = uploads.process(upload_id)
+                if upload is not None:
+                    self._report(upload)
+
+            if options['once'] and not pending:
+                break
+            if not pending:
+                time.sleep(options['interval'])
+
+    def _report(self, upload):
+        if upload.pk is None:
+            self.stdout.write(self.style.SUCCESS(f'enviada: {upload.file_name}'))
+        elif upload.status == PictureUpload.STATUS_FAILED:
+            self.stdout.write(self.style.ERROR(f'desistido: {upload.file_name} ({upload.last_error})'))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f'falhou (tentativa {upload.attempts}): {upload.file_name}, nova tentativa às '
+                f'{timezone.localtime(upload.next_attempt_at):%H:%M:%S}'
+            ))
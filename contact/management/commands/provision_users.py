@@ -0,0 +1,65 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from contact.management.commands import _provision
+
+
+class Command(BaseCommand):
+    help = (
+        'Cria usuários (com Profile) em massa, em lotes de INSERT, sem o sinal '
+        'de cada usuário. Gera <prefixo>0000, <prefixo>0001... ou lê um CSV com '
+        'as colunas username, email, first_name e last_name.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=0, help='Quantidade de usuários gerados')
+        parser.add_argument('--prefix', default='user_', help='Prefixo dos nomes gerados')
+        parser.add_argument('--start', type=int, default=0, help='Número do primeiro usuário gerado')
+        parser.add_argument('--email-domain', help='Gera email <usuário>@<domínio>')
+        parser.add_argument('--csv', dest='csv_path', help='Arquivo CSV com os usuários')
+        parser.add_argument('--password', help='Senha de todos (sem ela a senha fica inutilizável)')
+        parser.add_argument('--batch-size', type=int, default=_provision.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['csv_path']:
+            rows = self._read_csv(options['csv_path'])
+        elif options['count'] > 0:
+            rows = self._generate(options)
+        else:
+            raise CommandError('Informe --count ou --csv.')
+
+        start = time.perf_counter()
+        created, existing = _provision.provision_users(
+            rows, password=options['password'], batch_size=options['batch_size'],
+        )
+        elapsed = time.perf_counter() - start
+
+        if existing:
+            self.stdout.write(f'{len(existing)} usuários já existiam e foram ignorados')
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(created)} usuários criados em {elapsed:.1f}s'
+        ))
+
+    def _generate(self, options):
+        for number in range(options['start'], options['start'] + options['count']):
+            username = f'{options["prefix"]}{number:04}'
+            row = {'username': username}
+            if options['email_domain']:
+                row['email'] = f'{username}@{options["email_domain"]}'
+            yield row
+
+    def _read_csv(self, path):
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as file:
+                rows = list(csv.DictReader(file))
+        except OSError as error:
+            raise CommandError(f'Não foi possível ler {path}: {error}')
+
+        if rows and 'username' not in rows[0]:
+            raise CommandError('O CSV precisa da coluna username.')
+        return [
+            {key: (value or '').strip() for key, value in row.items() if key}
+            for row in rows if (row.get('username') or '').strip()
+        ]
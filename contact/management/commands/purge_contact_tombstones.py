@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from contact import sync
+from contact.models import ContactTombstone
+
+
+class Command(BaseCommand):
+    help = (
+        'Apaga os registros de contatos apagados mais antigos que '
+        'CONTACT_SYNC_TOMBSTONE_DAYS, em lotes pequenos. Clientes com token '
+        'anterior a isso recebem 410 e sincronizam tudo de novo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Linhas apagadas por lote')
+        parser.add_argument('--pause', type=float, default=0.01, help='Espera (s) entre lotes')
+        parser.add_argument('--interval', type=float, help='Repete a limpeza a cada N segundos')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            deleted = self._purge(options['batch_size'], options['pause'])
+            self.stdout.write(self.style.SUCCESS(f'{deleted} registros apagados'))
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def _purge(self, batch_size, pause):
+        before = timezone.now() - sync.tombstone_retention()
+        total = 0
+        while True:
+            deleted = ContactTombstone.purge(before, batch_size)
+            total += deleted
+            if not deleted:
+                return total
+            # Deixa outras escritas passarem entre os lotes
+            time.sleep(pause)
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from contact.models import EmailVerification
+
+
+class Command(BaseCommand):
+    help = (
+        'Apaga os códigos de verificação de email expirados ou já usados, em '
+        'lotes pequenos (uma transação curta por lote). Com --interval fica '
+        'rodando e repete a limpeza periodicamente.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Linhas apagadas por lote')
+        parser.add_argument('--pause', type=float, default=0.01, help='Espera (s) entre lotes')
+        parser.add_argument('--interval', type=float, help='Repete a limpeza a cada N segundos')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            deleted = self._purge(options['batch_size'], options['pause'])
+            self.stdout.write(self.style.SUCCESS(f'{deleted} códigos apagados'))
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def _purge(self, batch_size, pause):
+        total = 0
+        while True:
+            deleted = EmailVerification.purge(batch_size)
+            total += deleted
+            if not deleted:
+                return total
+            # Deixa outras escritas passarem entre os lotes
+            time.sleep(pause)
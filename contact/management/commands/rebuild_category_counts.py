@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from contact import cache as contact_cache
+from contact.models import CategoryCount
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula os contadores de contatos por categoria (CategoryCount) a '
+        'partir dos contatos, com um GROUP BY por lote de usuários. Use se os '
+        'contadores divergirem (ex.: alterações feitas direto no banco).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', action='append', default=[],
+            help='Só os contadores deste usuário (pode repetir); sem a opção, todos',
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Usuários por transação')
+
+    def handle(self, *args, **options):
+        if options['user']:
+            owner_ids = list(User.objects.filter(username__in=options['user']).values_list('pk', flat=True))
+            if len(owner_ids) != len(set(options['user'])):
+                raise CommandError('Usuário não encontrado.')
+        else:
+            owner_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+
+        batch_size = max(options['batch_size'], 1)
+        changed = set()
+        for start in range(0, len(owner_ids), batch_size):
+            changed |= CategoryCount.rebuild(owner_ids[start:start + batch_size])
+
+        # O painel de categorias vai no cache da lista: descarta as páginas antigas
+        for owner_id in changed:
+            contact_cache.bump_owner_version(owner_id)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(owner_ids)} usuários verificados, {len(changed)} com contadores corrigidos'
+        ))
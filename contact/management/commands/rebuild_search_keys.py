@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from contact.models import Contact
+from contact.search import rebuild_search_keys
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula a chave de busca normalizada (Contact.search_key) dos '
+        'contatos, em lotes. Use depois de alterar nome, sobrenome, e-mail ou '
+        'telefone com update() ou direto no banco, ou se a normalização mudar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', action='append', default=[],
+            help='Só os contatos deste usuário (pode repetir); sem a opção, todos',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Contatos por lote')
+
+    def handle(self, *args, **options):
+        contacts = Contact.objects.all()
+        if options['user']:
+            owner_ids = list(User.objects.filter(username__in=options['user']).values_list('pk', flat=True))
+            if len(owner_ids) != len(set(options['user'])):
+                raise CommandError('Usuário não encontrado.')
+            contacts = contacts.filter(owner_id__in=owner_ids)
+
+        changed = rebuild_search_keys(contacts, max(options['batch_size'], 1))
+
+        self.stdout.write(self.style.SUCCESS(f'{changed} chaves de busca atualizadas'))
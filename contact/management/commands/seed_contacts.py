@@ -0,0 +1,111 @@
+import os
+import random
+import time
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from PIL import Image, ImageDraw
+
+from contact import images
+from contact.management.commands import _seed
+from contact.models import Category, Contact, get_supabase_storage
+
+DEFAULT_CATEGORIES = ['Amigos', 'Família', 'Conhecidos', 'Trabalho']
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera dados sintéticos: N usuários com quantidades de contatos '
+        'desiguais (lei de potência), categorias e fotos. As linhas são '
+        'geradas em processos paralelos e inseridas com bulk_create ou COPY.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Quantidade de usuários')
+        parser.add_argument('--contacts', type=int, default=10_000, help='Total de contatos, somando todos os usuários')
+        parser.add_argument('--skew', type=float, default=1.1, help='Expoente da distribuição (0 = uniforme)')
+        parser.add_argument('--categories', nargs='*', default=DEFAULT_CATEGORIES)
+        parser.add_argument('--picture-ratio', type=float, default=0.2, help='Fração de contatos com foto')
+        parser.add_argument(
+            '--upload-pictures', type=int, default=0,
+            help='Gera e envia ao storage esta quantidade de fotos (com miniaturas) '
+                 'para os contatos compartilharem. Sem isso, as fotos são só nomes.',
+        )
+        parser.add_argument('--hidden-ratio', type=float, default=0.05, help='Fração de contatos ocultos (show=False)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Processos geradores')
+        parser.add_argument('--method', choices=('auto', 'bulk', 'copy'), default='auto',
+                            help='auto = COPY no PostgreSQL, bulk_create nos demais')
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='seed_user_', help='Prefixo dos nomes de usuário')
+        parser.add_argument('--reset', action='store_true', help='Apaga antes os contatos dos usuários gerados')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+
+        users = _seed.ensure_users(options['users'], options['prefix'])
+        if options['reset']:
+            deleted, _ = Contact.objects.filter(owner__in=users).delete()
+            self.stdout.write(f'{deleted} registros apagados')
+
+        categories = [
+            Category.objects.get_or_create(name=name)[0].pk
+            for name in options['categories']
+        ]
+        pictures = self._pictures(options['upload_pictures'], rng)
+
+        counts = _seed.skewed_counts(options['contacts'], len(users), options['skew'])
+        owner_counts = [(user.pk, count) for user, count in zip(users, counts) if count]
+        if counts:
+            self.stdout.write(f'{len(users)} usuários: maior agenda {counts[0]}, menor {counts[-1]}')
+
+        start = time.perf_counter()
+        inserted = _seed.seed_contacts(
+            owner_counts,
+            categories=categories,
+            pictures=pictures,
+            picture_ratio=options['picture_ratio'],
+            hidden_ratio=options['hidden_ratio'],
+            workers=options['workers'],
+            method=options['method'],
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+            progress=lambda done: self.stdout.write(f'  {done} contatos...'),
+        )
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{inserted} contatos em {elapsed:.1f}s ({inserted / max(elapsed, 1e-9):,.0f}/s)'
+        ))
+
+    def _pictures(self, count, rng):
+        """Fotos compartilhadas: ``(nome, variantes)``, enviadas ou só nomes."""
+        if not count:
+            return [(f'contacts/seed/avatar_{index:02}.jpg', {}) for index in range(20)]
+
+        storage = get_supabase_storage()
+        pool = []
+
+        for index in range(count):
+            content = self._avatar(rng)
+            original, variants = images.process_picture(content)
+            name = storage.save(f'contacts/seed_{index:02}.jpg', original or content)
+            pool.append((name, {
+                str(size): storage.save(images.variant_name(name, size), variant)
+                for size, variant in variants.items()
+            }))
+            self.stdout.write(f'  foto {index + 1}/{count} enviada')
+
+        return pool
+
+    def _avatar(self, rng):
+        color = tuple(rng.randint(40, 220) for _ in range(3))
+        image = Image.new('RGB', (800, 800), color)
+        draw = ImageDraw.Draw(image)
+        draw.ellipse((250, 150, 550, 450), fill=(255, 255, 255))
+        draw.ellipse((150, 480, 650, 980), fill=(255, 255, 255))
+
+        buffer = BytesIO()
+        image.save(buffer, format='JPEG', quality=85)
+        return ContentFile(buffer.getvalue(), name='avatar.jpg')
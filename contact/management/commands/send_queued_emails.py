@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from contact import mail
+
+
+class Command(BaseCommand):
+    help = (
+        'Entrega os emails da fila (OutgoingEmail) em lotes, pela API de lote '
+        'do Resend ou por uma sessão SMTP que fica aberta, repetindo os que '
+        'falharam com backoff.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Entrega o que estiver pendente e sai')
+        parser.add_argument('--interval', type=float, default=2.0, help='Espera (s) quando a fila está vazia')
+        parser.add_argument('--batch', type=int, default=100, help='Emails reservados por rodada')
+        parser.add_argument('--backend', choices=('auto', 'resend', 'smtp', 'fake'),
+                            help='Padrão: EMAIL_QUEUE_BACKEND')
+
+    def handle(self, *args, **options):
+        backend = mail.get_backend(options['backend'])
+        try:
+            while True:
+                close_old_connections()
+                sent, failed = mail.deliver(backend, options['batch'])
+
+                if sent or failed:
+                    self.stdout.write(f'{sent} enviados, {failed} falharam')
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        finally:
+            backend.close()
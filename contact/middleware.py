@@ -0,0 +1,45 @@
+"""
+WhiteNoise com suporte a ASGI.
+
+O ``WhiteNoiseMiddleware`` (6.x) só é síncrono: numa pilha ASGI o Django
+passaria a rodar todo o request, inclusive as views ``async``, numa thread.
+Esta versão atende os dois modos com a mesma lógica do original.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # Procura no disco (modo DEBUG)
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            response = self.serve(static_file, request)
+            # Leitura do arquivo fora do event loop, em blocos (HEAD/304: sem arquivo)
+            response.streaming_content = _read_async(response.file_to_stream, response.block_size)
+            return response
+        return await self.get_response(request)
+
+
+async def _read_async(file, block_size):
+    if file is None:
+        return
+    read = sync_to_async(file.read, thread_sensitive=False)
+    while chunk := await read(block_size):
+        yield chunk
@@ -1,6 +1,19 @@
 from django.db import migrations
 
 
+def postgresql_only(sql):
+    """
+    As constraints abaixo só existem com esses nomes no PostgreSQL; no SQLite
+    o Django recria a tabela para mudar uma FK e o ON DELETE já vem do modelo.
+    """
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for statement in schema_editor.connection.ops.prepare_sql_script(sql):
+                schema_editor.execute(statement)
+
+    return run
+
+
 class Migration(migrations.Migration):
 
     dependencies = [
@@ -9,27 +22,27 @@ class Migration(migrations.Migration):
 
     operations = [
         # Alterar constraint EmailVerification.user para ON DELETE CASCADE
-        migrations.RunSQL(
-            sql="""
+        migrations.RunPython(
+            postgresql_only("""
             ALTER TABLE contact_emailverification 
             DROP CONSTRAINT contact_emailverification_user_id_308c14af_fk_auth_user_id;
             
             ALTER TABLE contact_emailverification
             ADD CONSTRAINT contact_emailverification_user_id_308c14af_fk_auth_user_id
             FOREIGN KEY (user_id) REFERENCES auth_user(id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED;
-            """,
-            reverse_sql="""
+            """),
+            postgresql_only("""
             ALTER TABLE contact_emailverification 
             DROP CONSTRAINT contact_emailverification_user_id_308c14af_fk_auth_user_id;
             
             ALTER TABLE contact_emailverification
             ADD CONSTRAINT contact_emailverification_user_id_308c14af_fk_auth_user_id
             FOREIGN KEY (user_id) REFERENCES auth_user(id) DEFERRABLE INITIALLY DEFERRED;
-            """
+            """)
         ),
         # Alterar constraint Profile.user para ON DELETE CASCADE
-        migrations.RunSQL(
-            sql="""
+        migrations.RunPython(
+            postgresql_only("""
             ALTER TABLE contact_profile 
             DROP CONSTRAINT contact_profile_user_id_key;
             
@@ -39,25 +52,25 @@ class Migration(migrations.Migration):
             ALTER TABLE contact_profile
             ADD CONSTRAINT contact_profile_user_id_fk
             FOREIGN KEY (user_id) REFERENCES auth_user(id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED;
-            """,
-            reverse_sql="""
+            """),
+            postgresql_only("""
             ALTER TABLE contact_profile 
             DROP CONSTRAINT IF EXISTS contact_profile_user_id_fk;
-            """
+            """)
         ),
         # Alterar constraint Contact.owner para ON DELETE CASCADE
-        migrations.RunSQL(
-            sql="""
+        migrations.RunPython(
+            postgresql_only("""
             ALTER TABLE contact_contact 
             DROP CONSTRAINT IF EXISTS contact_contact_owner_id_fk;
             
             ALTER TABLE contact_contact
             ADD CONSTRAINT contact_contact_owner_id_fk
             FOREIGN KEY (owner_id) REFERENCES auth_user(id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED;
-            """,
-            reverse_sql="""
+            """),
+            postgresql_only("""
             ALTER TABLE contact_contact 
             DROP CONSTRAINT IF EXISTS contact_contact_owner_id_fk;
-            """
+            """)
         ),
     ]
@@ -0,0 +1,116 @@
+from django.db import migrations
+
+
+# PostgreSQL: vetor de busca mantido pelo próprio banco (coluna gerada) +
+# índices GIN de trigramas para o ILIKE '%termo%' que substitui o icontains.
+POSTGRES_SQL = [
+    """
+    ALTER TABLE contact_contact ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(first_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(last_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(email, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(phone, '')), 'B')
+    ) STORED;
+    """,
+    "CREATE INDEX IF NOT EXISTS contact_search_vector_gin ON contact_contact USING GIN (search_vector);",
+]
+
+POSTGRES_TRIGRAM_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+    "CREATE INDEX IF NOT EXISTS contact_first_name_trgm ON contact_contact USING GIN (first_name gin_trgm_ops);",
+    "CREATE INDEX IF NOT EXISTS contact_last_name_trgm ON contact_contact USING GIN (last_name gin_trgm_ops);",
+    "CREATE INDEX IF NOT EXISTS contact_phone_trgm ON contact_contact USING GIN (phone gin_trgm_ops);",
+    "CREATE INDEX IF NOT EXISTS contact_email_trgm ON contact_contact USING GIN (email gin_trgm_ops);",
+]
+
+POSTGRES_REVERSE_SQL = [
+    "DROP INDEX IF EXISTS contact_first_name_trgm;",
+    "DROP INDEX IF EXISTS contact_last_name_trgm;",
+    "DROP INDEX IF EXISTS contact_phone_trgm;",
+    "DROP INDEX IF EXISTS contact_email_trgm;",
+    "DROP INDEX IF EXISTS contact_search_vector_gin;",
+    "ALTER TABLE contact_contact DROP COLUMN IF EXISTS search_vector;",
+]
+
+# SQLite: tabela FTS5 (tokenizer trigram, equivale a um icontains indexado)
+# sincronizada com contact_contact por triggers.
+SQLITE_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS contact_contact_fts USING fts5(
+        first_name, last_name, phone, email,
+        content='contact_contact', content_rowid='id', tokenize='trigram'
+    );
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contact_contact_fts_ai AFTER INSERT ON contact_contact BEGIN
+        INSERT INTO contact_contact_fts(rowid, first_name, last_name, phone, email)
+        VALUES (new.id, new.first_name, new.last_name, new.phone, new.email);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contact_contact_fts_ad AFTER DELETE ON contact_contact BEGIN
+        INSERT INTO contact_contact_fts(contact_contact_fts, rowid, first_name, last_name, phone, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.phone, old.email);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contact_contact_fts_au AFTER UPDATE ON contact_contact BEGIN
+        INSERT INTO contact_contact_fts(contact_contact_fts, rowid, first_name, last_name, phone, email)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.phone, old.email);
+        INSERT INTO contact_contact_fts(rowid, first_name, last_name, phone, email)
+        VALUES (new.id, new.first_name, new.last_name, new.phone, new.email);
+    END;
+    """,
+    "INSERT INTO contact_contact_fts(contact_contact_fts) VALUES ('rebuild');",
+]
+
+SQLITE_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS contact_contact_fts_ai;",
+    "DROP TRIGGER IF EXISTS contact_contact_fts_ad;",
+    "DROP TRIGGER IF EXISTS contact_contact_fts_au;",
+    "DROP TABLE IF EXISTS contact_contact_fts;",
+]
+
+
+def _execute(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def _pg_trgm_available(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_SQL)
+        # Sem pg_trgm a busca continua correta, só não usa índice no ILIKE
+        if _pg_trgm_available(schema_editor):
+            _execute(schema_editor, POSTGRES_TRIGRAM_SQL)
+    elif vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        _execute(schema_editor, POSTGRES_REVERSE_SQL)
+    elif vendor == 'sqlite':
+        _execute(schema_editor, SQLITE_REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0011_remove_emailverification_user_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
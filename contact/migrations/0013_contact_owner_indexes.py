@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0012_contact_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='emailverification',
+            name='email',
+            field=models.EmailField(max_length=254, verbose_name='Email'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['owner', 'show', '-id'], name='contact_owner_show_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(condition=models.Q(('show', True)), fields=['owner', '-id'], name='contact_owner_visible_idx'),
+        ),
+    ]
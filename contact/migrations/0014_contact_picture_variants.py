@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:52
+
+from django.db import migrations, models
+
+from contact.migrations._sqlite_fts import restore_fts_triggers
+
+# Campo NOT NULL: no SQLite a tabela é recriada e os triggers FTS precisam voltar
+FTS_COLUMNS = ('first_name', 'last_name', 'phone', 'email')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0013_contact_owner_indexes'),
+    ]
+
+    operations = [
+        restore_fts_triggers(FTS_COLUMNS),
+        migrations.AddField(
+            model_name='contact',
+            name='picture_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Variantes da foto'),
+        ),
+        restore_fts_triggers(FTS_COLUMNS),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:59
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+from contact.migrations._sqlite_fts import restore_fts_triggers
+
+# Campo com default: no SQLite a tabela é recriada e os triggers FTS precisam voltar
+FTS_COLUMNS = ('first_name', 'last_name', 'phone', 'email')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0014_contact_picture_variants'),
+    ]
+
+    operations = [
+        restore_fts_triggers(FTS_COLUMNS),
+        migrations.AddField(
+            model_name='contact',
+            name='picture_status',
+            field=models.CharField(choices=[('ready', 'Pronta'), ('pending', 'Enviando'), ('failed', 'Falhou')], default='ready', editable=False, max_length=10, verbose_name='Estado da foto'),
+        ),
+        migrations.CreateModel(
+            name='PictureUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('staged_path', models.CharField(max_length=500, verbose_name='Arquivo local')),
+                ('file_name', models.CharField(max_length=255, verbose_name='Nome do arquivo')),
+                ('status', models.CharField(choices=[('pending', 'Pendente'), ('failed', 'Falhou')], default='pending', max_length=10, verbose_name='Estado')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('last_error', models.TextField(blank=True, verbose_name='Último erro')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próxima tentativa')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('contact', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='picture_uploads', to='contact.contact', verbose_name='Contato')),
+            ],
+            options={
+                'verbose_name': 'Envio de foto',
+                'verbose_name_plural': 'Envios de foto',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='contact_upload_due_idx')],
+            },
+        ),
+        restore_fts_triggers(FTS_COLUMNS),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:31
+
+from django.db import migrations, models
+
+from contact.migrations._sqlite_fts import restore_fts_triggers
+
+# Campo com default: no SQLite a tabela é recriada e os triggers FTS precisam voltar
+FTS_COLUMNS = ('first_name', 'last_name', 'phone', 'email')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0017_outgoing_email'),
+    ]
+
+    operations = [
+        restore_fts_triggers(FTS_COLUMNS),
+        migrations.AddField(
+            model_name='contact',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Versão'),
+        ),
+        restore_fts_triggers(FTS_COLUMNS),
+    ]
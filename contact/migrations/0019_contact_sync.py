@@ -0,0 +1,59 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+from contact.migrations._sqlite_fts import restore_fts_triggers
+
+# Campo com default: no SQLite a tabela é recriada e os triggers FTS precisam voltar
+FTS_COLUMNS = ('first_name', 'last_name', 'phone', 'email')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0018_contact_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        restore_fts_triggers(FTS_COLUMNS),
+        migrations.CreateModel(
+            name='ContactTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contact_id', models.PositiveBigIntegerField(verbose_name='Contato')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Apagado em')),
+            ],
+            options={
+                'verbose_name': 'Contato apagado',
+                'verbose_name_plural': 'Contatos apagados',
+            },
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Alterado em'),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['owner', 'updated_at', 'id'], name='contact_owner_updated_idx'),
+        ),
+        migrations.AddField(
+            model_name='contacttombstone',
+            name='owner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Proprietário'),
+        ),
+        migrations.AddIndex(
+            model_name='contacttombstone',
+            index=models.Index(fields=['owner', 'deleted_at', 'id'], name='contact_tombstone_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contacttombstone',
+            index=models.Index(fields=['deleted_at'], name='contact_tombstone_purge_idx'),
+        ),
+        restore_fts_triggers(FTS_COLUMNS),
+    ]
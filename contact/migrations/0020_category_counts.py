@@ -0,0 +1,66 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_counts(apps, schema_editor):
+    # Contadores iniciais a partir dos contatos existentes (um GROUP BY)
+    Contact = apps.get_model('contact', 'Contact')
+    CategoryCount = apps.get_model('contact', 'CategoryCount')
+    rows = (
+        Contact.objects.filter(show=True, owner__isnull=False)
+        .values('owner_id', 'category_id')
+        .annotate(total=models.Count('id'))
+        .order_by()
+    )
+    CategoryCount.objects.bulk_create(
+        (CategoryCount(owner_id=row['owner_id'], category_id=row['category_id'], count=row['total']) for row in rows),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0019_contact_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0, verbose_name='Contatos')),
+            ],
+            options={
+                'verbose_name': 'Contagem por categoria',
+                'verbose_name_plural': 'Contagens por categoria',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(condition=models.Q(('show', True)), fields=['owner', 'category', '-id'], name='contact_owner_category_idx'),
+        ),
+        migrations.AddField(
+            model_name='categorycount',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contact.category', verbose_name='Categoria'),
+        ),
+        migrations.AddField(
+            model_name='categorycount',
+            name='owner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Proprietário'),
+        ),
+        migrations.AddConstraint(
+            model_name='categorycount',
+            constraint=models.UniqueConstraint(fields=('owner', 'category'), name='category_count_owner_category'),
+        ),
+        migrations.AddConstraint(
+            model_name='categorycount',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('owner',), name='category_count_owner_none'),
+        ),
+        migrations.RunPython(build_counts, migrations.RunPython.noop),
+    ]
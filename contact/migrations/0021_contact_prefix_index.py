@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from contact.migrations._prefix_index import create_prefix_indexes, drop_prefix_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0020_category_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
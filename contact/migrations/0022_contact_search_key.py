@@ -0,0 +1,100 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:00
+
+from importlib import import_module
+
+from django.db import migrations
+
+import contact.search
+from contact.migrations._prefix_index import restore_prefix_indexes
+from contact.migrations._sqlite_fts import restore_fts_triggers, trigger_sql
+
+# Antes desta migração a FTS indexava as quatro colunas; depois, só search_key
+OLD_FTS_COLUMNS = ('first_name', 'last_name', 'phone', 'email')
+FTS_COLUMNS = ('search_key',)
+
+# Estruturas da busca anterior (coluna search_vector, trigramas por coluna),
+# recriadas ao reverter
+search_index = import_module('contact.migrations.0012_contact_search_index')
+
+POSTGRES_SQL = [
+    "DROP INDEX IF EXISTS contact_first_name_trgm;",
+    "DROP INDEX IF EXISTS contact_last_name_trgm;",
+    "DROP INDEX IF EXISTS contact_phone_trgm;",
+    "DROP INDEX IF EXISTS contact_email_trgm;",
+    "DROP INDEX IF EXISTS contact_search_vector_gin;",
+    "ALTER TABLE contact_contact DROP COLUMN IF EXISTS search_vector;",
+]
+
+POSTGRES_TRIGRAM_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+    "CREATE INDEX IF NOT EXISTS contact_search_key_trgm ON contact_contact USING GIN (search_key gin_trgm_ops);",
+]
+
+POSTGRES_REVERSE_SQL = [
+    "DROP INDEX IF EXISTS contact_search_key_trgm;",
+]
+
+SQLITE_SQL = [
+    *search_index.SQLITE_REVERSE_SQL,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS contact_contact_fts USING fts5(
+        search_key, content='contact_contact', content_rowid='id', tokenize='trigram'
+    );
+    """,
+    *trigger_sql(FTS_COLUMNS),
+    "INSERT INTO contact_contact_fts(contact_contact_fts) VALUES ('rebuild');",
+]
+
+SQLITE_REVERSE_SQL = [
+    *search_index.SQLITE_REVERSE_SQL,
+    *search_index.SQLITE_SQL,
+]
+
+
+def backfill_search_keys(apps, schema_editor):
+    Contact = apps.get_model('contact', 'Contact')
+    contact.search.rebuild_search_keys(Contact.objects.using(schema_editor.connection.alias))
+
+
+def index_search_key(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        search_index._execute(schema_editor, POSTGRES_SQL)
+        # Sem pg_trgm a busca continua correta, só não usa índice no LIKE
+        if search_index._pg_trgm_available(schema_editor):
+            search_index._execute(schema_editor, POSTGRES_TRIGRAM_SQL)
+    elif vendor == 'sqlite':
+        search_index._execute(schema_editor, SQLITE_SQL)
+
+
+def unindex_search_key(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        search_index._execute(schema_editor, POSTGRES_REVERSE_SQL)
+        search_index.create_search_index(apps, schema_editor)
+    elif vendor == 'sqlite':
+        search_index._execute(schema_editor, SQLITE_REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0021_contact_prefix_index'),
+    ]
+
+    # Campo com default: no SQLite a tabela é recriada e os triggers FTS e os
+    # índices de prefixo precisam voltar (ao aplicar e ao reverter)
+    operations = [
+        restore_fts_triggers(OLD_FTS_COLUMNS),
+        restore_prefix_indexes(),
+        migrations.AddField(
+            model_name='contact',
+            name='search_key',
+            field=contact.search.SearchKeyField(default='', editable=False, verbose_name='Chave de busca'),
+        ),
+        migrations.RunPython(backfill_search_keys, migrations.RunPython.noop),
+        migrations.RunPython(index_search_key, unindex_search_key),
+        restore_prefix_indexes(),
+    ]
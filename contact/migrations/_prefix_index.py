@@ -0,0 +1,60 @@
+"""
+Índices de prefixo do autocomplete (contact/autocomplete.py): um por coluna,
+``(owner_id, lower(coluna))``.
+
+- PostgreSQL: ``text_pattern_ops``, para ``lower(coluna) LIKE 'pre%'`` e a
+  ordenação ``USING ~<~`` saírem do índice em qualquer collation.
+- SQLite: índice de expressão comum; a consulta usa um intervalo
+  (``>= 'pre' AND < 'prf'``).
+
+Como os triggers FTS (ver _sqlite_fts.py), no SQLite esses índices somem
+quando o Django recria contact_contact: migrações que recriam a tabela
+incluem ``restore_prefix_indexes()`` no fim da lista de operações.
+
+Este módulo começa com "_" para o Django não o tratar como migração.
+"""
+from django.db import migrations
+
+PREFIX_COLUMNS = ('first_name', 'last_name', 'phone', 'email')
+
+
+def index_name(column):
+    return f'contact_{column}_prefix'
+
+
+def create_sql(vendor):
+    if vendor == 'postgresql':
+        expression = 'lower({column}) text_pattern_ops'
+    elif vendor == 'sqlite':
+        expression = 'lower({column})'
+    else:
+        return []
+
+    return [
+        f'CREATE INDEX IF NOT EXISTS {index_name(column)} ON contact_contact '
+        f'(owner_id, {expression.format(column=column)});'
+        for column in PREFIX_COLUMNS
+    ]
+
+
+def drop_sql():
+    return [f'DROP INDEX IF EXISTS {index_name(column)};' for column in PREFIX_COLUMNS]
+
+
+def create_prefix_indexes(apps, schema_editor):
+    for statement in create_sql(schema_editor.connection.vendor):
+        schema_editor.execute(statement)
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if create_sql(schema_editor.connection.vendor):
+        for statement in drop_sql():
+            schema_editor.execute(statement)
+
+
+def restore_prefix_indexes():
+    def restore(apps, schema_editor):
+        if schema_editor.connection.vendor == 'sqlite':
+            create_prefix_indexes(apps, schema_editor)
+
+    return migrations.RunPython(restore, restore)
@@ -0,0 +1,62 @@
+"""
+Triggers de sincronização da tabela FTS5 de contatos (SQLite).
+
+O SQLite não altera colunas no lugar: ao adicionar um campo NOT NULL o Django
+recria contact_contact (cria, copia, apaga a antiga e renomeia) e os triggers
+da tabela antiga somem junto. Migrações que recriam a tabela incluem
+``restore_fts_triggers(...)`` no início e no fim da lista de operações, para
+que os triggers voltem tanto ao aplicar quanto ao reverter.
+
+Este módulo começa com "_" para o Django não o tratar como migração.
+"""
+from django.db import migrations
+
+
+def trigger_sql(columns):
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS contact_contact_fts_ai AFTER INSERT ON contact_contact BEGIN
+            INSERT INTO contact_contact_fts(rowid, {column_list})
+            VALUES (new.id, {new_values});
+        END;
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS contact_contact_fts_ad AFTER DELETE ON contact_contact BEGIN
+            INSERT INTO contact_contact_fts(contact_contact_fts, rowid, {column_list})
+            VALUES ('delete', old.id, {old_values});
+        END;
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS contact_contact_fts_au AFTER UPDATE ON contact_contact BEGIN
+            INSERT INTO contact_contact_fts(contact_contact_fts, rowid, {column_list})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO contact_contact_fts(rowid, {column_list})
+            VALUES (new.id, {new_values});
+        END;
+        """,
+    ]
+
+
+def restore_fts_triggers(columns):
+    def restore(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contact_contact_fts'"
+            )
+            if cursor.fetchone() is None:
+                return
+
+        for statement in trigger_sql(columns):
+            schema_editor.execute(statement)
+
+        # Garante que o índice reflete as linhas copiadas durante a recriação
+        schema_editor.execute("INSERT INTO contact_contact_fts(contact_contact_fts) VALUES ('rebuild');")
+
+    return migrations.RunPython(restore, restore)
@@ -1,12 +1,23 @@
-from django.db import models
+from collections import Counter
+from contextlib import nullcontext
+
+from django.db import connection, models, transaction
 from django.utils import timezone
 from django.contrib.auth.models import User
 from contact.supabase_storage import SupabaseStorage
+from contact import images, public_ids, search
 import random
 import string
 
+_supabase_storage = None
+
+
 def get_supabase_storage():
-    return SupabaseStorage()
+    # Uma instância por processo; o cliente HTTP é compartilhado de qualquer forma
+    global _supabase_storage
+    if _supabase_storage is None:
+        _supabase_storage = SupabaseStorage()
+    return _supabase_storage
 
 class Category(models.Model):
     class Meta:
@@ -19,10 +30,38 @@ class Category(models.Model):
         return f"{self.name}"
 
 class Contact(models.Model):
+    # Estado da foto quando o upload é feito em segundo plano (contact/uploads.py)
+    PICTURE_READY = 'ready'
+    PICTURE_PENDING = 'pending'
+    PICTURE_FAILED = 'failed'
+    PICTURE_STATUS_CHOICES = [
+        (PICTURE_READY, 'Pronta'),
+        (PICTURE_PENDING, 'Enviando'),
+        (PICTURE_FAILED, 'Falhou'),
+    ]
+
     class Meta:
         verbose_name = 'Contato'
         verbose_name_plural = 'Contatos'
-        
+        indexes = [
+            # Listagens e buscas do dono: owner + show, mais recentes primeiro
+            models.Index(fields=['owner', 'show', '-id'], name='contact_owner_show_id_idx'),
+            # Apenas contatos visíveis (caso mais comum: index/search)
+            models.Index(
+                fields=['owner', '-id'],
+                condition=models.Q(show=True),
+                name='contact_owner_visible_idx',
+            ),
+            # Sincronização incremental (contact/sync.py): alterados desde o token
+            models.Index(fields=['owner', 'updated_at', 'id'], name='contact_owner_updated_idx'),
+            # Filtro ?category= das listas (visíveis do dono numa categoria)
+            models.Index(
+                fields=['owner', 'category', '-id'],
+                condition=models.Q(show=True),
+                name='contact_owner_category_idx',
+            ),
+        ]
+
     first_name = models.CharField(max_length=60, verbose_name='Nome')
     last_name = models.CharField(max_length=60, blank=True, verbose_name='Sobrenome')
     phone = models.CharField(max_length=50, verbose_name='Telefone')
@@ -31,17 +70,379 @@ class Contact(models.Model):
     description = models.TextField(blank=True, verbose_name='Descrição')
     show = models.BooleanField(default=True, verbose_name='Exibir')
     picture = models.ImageField(blank=True, upload_to='contacts/', storage=get_supabase_storage, verbose_name='Foto')
+    # {tamanho: nome no storage} das miniaturas geradas no upload (contact/images.py)
+    picture_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Variantes da foto')
+    picture_status = models.CharField(
+        max_length=10, choices=PICTURE_STATUS_CHOICES, default=PICTURE_READY,
+        editable=False, verbose_name='Estado da foto',
+    )
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, blank=True, null=True, verbose_name='Categoria')
     owner = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True, verbose_name='Proprietário')
+    # Incrementada a cada alteração (ETag da API). Quem altera com update()
+    # precisa incrementar também: version=F('version') + 1
+    version = models.PositiveIntegerField(default=1, editable=False, verbose_name='Versão')
+    # Idem para a sincronização: update() precisa de updated_at=timezone.now()
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Alterado em')
+    # Nome, sobrenome, e-mail e dígitos do telefone sem acentos e em
+    # minúsculas (contact/search.py); quem altera esses campos com update()
+    # roda depois o comando rebuild_search_keys
+    search_key = search.SearchKeyField(default='', editable=False, verbose_name='Chave de busca')
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Guarda os valores lidos do banco para os sinais compararem com os novos
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def loaded_value(self, attname):
+        """Valor de ``attname`` como estava no banco (None se o objeto é novo)"""
+        return getattr(self, '_loaded_values', {}).get(attname)
+
+    def save(self, *args, **kwargs):
+        if self.picture and not self.picture._committed:
+            self._process_picture()
+        elif not self.picture:
+            self.picture_variants = {}
+
+        updating = not self._state.adding
+        # Contador da categoria: só muda se dono, categoria ou show mudaram
+        old_key = _counter_key(self._stored_counted_values()) if updating else None
+        new_key = _counter_key(self._saved_counted_values(kwargs.get('update_fields')))
+
+        if updating:
+            # Incremento no banco: dois saves simultâneos não ficam com a mesma versão
+            self.version = models.F('version') + 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version', 'updated_at'}
+                if not kwargs['update_fields'].isdisjoint(search.SEARCH_FIELDS):
+                    kwargs['update_fields'].add('search_key')
+
+        with transaction.atomic(savepoint=False) if old_key != new_key else nullcontext():
+            super().save(*args, **kwargs)
+            if old_key != new_key:
+                CategoryCount.move(old_key, new_key)
+
+        if updating:
+            self.refresh_from_db(fields=['version'])
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in self.get_deferred_fields()
+        }
+
+
+    def _stored_counted_values(self):
+        """``COUNTED_FIELDS`` como estão no banco (lidos agora se não foram carregados)"""
+        loaded = getattr(self, '_loaded_values', {})
+        if all(name in loaded for name in COUNTED_FIELDS):
+            return tuple(loaded[name] for name in COUNTED_FIELDS)
+        return type(self)._base_manager.filter(pk=self.pk).values_list(*COUNTED_FIELDS).first()
+
+    def _saved_counted_values(self, update_fields=None):
+        """``COUNTED_FIELDS`` como ficarão no banco depois do save"""
+        values = tuple(getattr(self, name) for name in COUNTED_FIELDS)
+        if update_fields is None or self._state.adding:
+            return values
+
+        saved = {self._meta.get_field(name).attname for name in update_fields}
+        stored = self._stored_counted_values() or values
+        return tuple(
+            value if name in saved else old
+            for name, value, old in zip(COUNTED_FIELDS, values, stored)
+        )
+
+    def _process_picture(self):
+        """Remove metadados da foto enviada e grava as miniaturas."""
+        try:
+            original, variants = images.process_picture(self.picture.file)
+        except ValueError:
+            self.picture_variants = {}
+            return
+
+        name = self.picture.name
+        if original is not None:
+            self.picture.file = original
+            self.picture.name = name
+
+        storage = self.picture.storage
+        self.picture_variants = {
+            str(size): storage.save(images.variant_name(name, size), content)
+            for size, content in variants.items()
+        }
+
+    def picture_url(self, width=None):
+        """
+        URL da menor variante com pelo menos ``width`` pixels (a maior, se
+        nenhuma atende). Sem ``width`` ou sem variantes, a foto original.
+        """
+        if not self.picture:
+            return ''
+
+        if width and self.picture_variants:
+            sizes = sorted(int(size) for size in self.picture_variants)
+            size = next((size for size in sizes if size >= int(width)), sizes[-1])
+            return self.picture.storage.url(self.picture_variants[str(size)])
+
+        return self.picture.url
+
+    @property
+    def picture_pending(self):
+        return self.picture_status == self.PICTURE_PENDING
+
+
+# Campos que decidem em qual contador (CategoryCount) o contato entra
+COUNTED_FIELDS = ('owner_id', 'category_id', 'show')
+
+
+def _counter_key(values):
+    """``(dono, categoria)`` de um contato visível; ``None`` se não é contado"""
+    if values is None:
+        return None
+    owner_id, category_id, show = values
+    return (owner_id, category_id) if show and owner_id is not None else None
+
+
+class CategoryCount(models.Model):
+    """
+    Quantos contatos visíveis cada dono tem em cada categoria (categoria nula:
+    sem categoria), para o filtro lateral das listas sem ``GROUP BY``.
+
+    Atualizado na mesma transação da alteração: ``Contact.save()``, sinal
+    post_delete e as gravações em massa (importação, ações em lote, exclusão
+    de categoria). ``rebuild_category_counts`` recalcula a partir dos contatos.
+    """
+    class Meta:
+        verbose_name = 'Contagem por categoria'
+        verbose_name_plural = 'Contagens por categoria'
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'category'], name='category_count_owner_category'),
+            # NULL não repete em UNIQUE: "sem categoria" precisa da sua própria restrição
+            models.UniqueConstraint(
+                fields=['owner'], condition=models.Q(category__isnull=True), name='category_count_owner_none',
+            ),
+        ]
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', verbose_name='Proprietário')
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, null=True, blank=True, related_name='+', verbose_name='Categoria',
+    )
+    count = models.IntegerField(default=0, verbose_name='Contatos')
+
+    def __str__(self):
+        return f"{self.category or 'Sem categoria'}: {self.count}"
+
+    @classmethod
+    def adjust(cls, owner_id, category_id, delta):
+        """Soma ``delta`` ao contador (criando a linha se preciso)"""
+        cls.apply_deltas(owner_id, {category_id: delta})
+
+    @classmethod
+    def move(cls, old_key, new_key):
+        """Um contato saiu do contador ``old_key`` e entrou em ``new_key``"""
+        changes = {}
+        for key, delta in ((old_key, -1), (new_key, 1)):
+            if key is not None:
+                owner_id, category_id = key
+                changes.setdefault(owner_id, Counter())[category_id] += delta
+
+        for owner_id, deltas in changes.items():
+            cls.apply_deltas(owner_id, deltas)
+
+    @classmethod
+    def apply_deltas(cls, owner_id, deltas):
+        """
+        Soma ``{category_id: delta}`` aos contadores de um dono, criando as
+        linhas que faltam, com um upsert (``INSERT ... ON CONFLICT DO
+        UPDATE``) para as categorias e outro para "sem categoria": sem
+        savepoint nem corrida entre o UPDATE e o INSERT.
+        """
+        deltas = {category_id: delta for category_id, delta in deltas.items() if delta}
+        categorized = [(category_id, delta) for category_id, delta in deltas.items() if category_id is not None]
+
+        quote = connection.ops.quote_name
+        table, count = quote(cls._meta.db_table), quote('count')
+        statement = (
+            f'INSERT INTO {table} (owner_id, category_id, {count}) VALUES {{values}} '
+            f'ON CONFLICT {{target}} DO UPDATE SET {count} = {table}.{count} + excluded.{count}'
+        )
+
+        with connection.cursor() as cursor:
+            if categorized:
+                cursor.execute(
+                    statement.format(
+                        values=', '.join(['(%s, %s, %s)'] * len(categorized)),
+                        target='(owner_id, category_id)',
+                    ),
+                    [value for category_id, delta in categorized for value in (owner_id, category_id, delta)],
+                )
+            if None in deltas:
+                # Alvo da restrição parcial category_count_owner_none
+                cursor.execute(
+                    statement.format(values='(%s, NULL, %s)', target='(owner_id) WHERE category_id IS NULL'),
+                    [owner_id, deltas[None]],
+                )
+
+    @classmethod
+    def merge_into_uncategorized(cls, category):
+        """Categoria apagada: os contatos dela (SET_NULL) passam para "sem categoria"."""
+        owner_ids = list(cls.objects.filter(category=category, count__gt=0).values_list('owner_id', flat=True))
+        if not owner_ids:
+            return
+
+        cls.objects.bulk_create([cls(owner_id=owner_id) for owner_id in owner_ids], ignore_conflicts=True)
+        cls.objects.filter(category__isnull=True, owner_id__in=owner_ids).update(
+            count=models.F('count') + models.Subquery(
+                cls.objects.filter(owner_id=models.OuterRef('owner_id'), category=category).values('count')[:1]
+            ),
+        )
+
+    @classmethod
+    def rebuild(cls, owner_ids=None):
+        """
+        Recalcula os contadores (de ``owner_ids`` ou de todos) com um
+        ``GROUP BY`` e grava em lote. Retorna os ids dos donos cujos
+        contadores mudaram.
+        """
+        counters = cls.objects.all()
+        contacts = Contact.objects.filter(show=True, owner__isnull=False)
+        if owner_ids is not None:
+            counters = counters.filter(owner_id__in=owner_ids)
+            contacts = contacts.filter(owner_id__in=owner_ids)
+
+        with transaction.atomic():
+            before = {
+                (owner_id, category_id): count
+                for owner_id, category_id, count in counters.values_list('owner_id', 'category_id', 'count')
+            }
+            after = {
+                (row['owner_id'], row['category_id']): row['total']
+                for row in contacts.values('owner_id', 'category_id').annotate(total=models.Count('id')).order_by()
+            }
+            counters.delete()
+            cls.objects.bulk_create(
+                (cls(owner_id=owner_id, category_id=category_id, count=count)
+                 for (owner_id, category_id), count in after.items()),
+                batch_size=1000,
+            )
+
+        return {key[0] for key in before.keys() | after.keys() if before.get(key, 0) != after.get(key, 0)}
+
+
+class ContactTombstone(models.Model):
+    """
+    Registro de um contato apagado, para a sincronização incremental avisar
+    os clientes (contact/sync.py). Gravado pelo sinal post_delete; apagado
+    depois de CONTACT_SYNC_TOMBSTONE_DAYS (purge_contact_tombstones).
+    """
+    class Meta:
+        verbose_name = 'Contato apagado'
+        verbose_name_plural = 'Contatos apagados'
+        indexes = [
+            models.Index(fields=['owner', 'deleted_at', 'id'], name='contact_tombstone_sync_idx'),
+            models.Index(fields=['deleted_at'], name='contact_tombstone_purge_idx'),
+        ]
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', verbose_name='Proprietário')
+    contact_id = models.PositiveBigIntegerField(verbose_name='Contato')
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name='Apagado em')
+
+    def __str__(self):
+        return f"Contato {self.contact_id} apagado em {self.deleted_at:%d/%m/%Y %H:%M}"
+
+    @classmethod
+    def purge(cls, before, batch_size=1000):
+        """
+        Apaga um lote de registros anteriores a ``before`` e retorna quantos
+        apagou (chame até retornar 0), como ``EmailVerification.purge``.
+        """
+        ids = list(cls.objects.filter(deleted_at__lt=before).values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return 0
+        deleted, _ = cls.objects.filter(pk__in=ids).delete()
+        return deleted
+
+
+class PictureUpload(models.Model):
+    """
+    Foto recebida e guardada em disco local, aguardando o envio ao storage
+    por um worker em segundo plano (contact/uploads.py).
+    """
+    class Meta:
+        verbose_name = 'Envio de foto'
+        verbose_name_plural = 'Envios de foto'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='contact_upload_due_idx'),
+        ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendente'),
+        (STATUS_FAILED, 'Falhou'),
+    ]
+
+    contact = models.ForeignKey(Contact, on_delete=models.CASCADE, related_name='picture_uploads', verbose_name='Contato')
+    staged_path = models.CharField(max_length=500, verbose_name='Arquivo local')
+    file_name = models.CharField(max_length=255, verbose_name='Nome do arquivo')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name='Estado')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')
+    last_error = models.TextField(blank=True, verbose_name='Último erro')
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name='Próxima tentativa')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Criado em')
+
+    def __str__(self):
+        return f"{self.file_name} ({self.get_status_display()})"
+
+
+class OutgoingEmail(models.Model):
+    """
+    Email na fila de envio. As views só criam o registro (contact/mail.py);
+    o comando send_queued_emails entrega em lotes.
+    """
+    class Meta:
+        verbose_name = 'Email na fila'
+        verbose_name_plural = 'Emails na fila'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='contact_outbox_due_idx'),
+        ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendente'),
+        (STATUS_FAILED, 'Falhou'),
+    ]
+
+    to = models.JSONField(verbose_name='Destinatários')
+    from_email = models.CharField(max_length=254, blank=True, verbose_name='Remetente')
+    subject = models.CharField(max_length=255, verbose_name='Assunto')
+    body = models.TextField(verbose_name='Texto')
+    html_body = models.TextField(blank=True, verbose_name='HTML')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name='Estado')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')
+    last_error = models.TextField(blank=True, verbose_name='Último erro')
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name='Próxima tentativa')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Criado em')
+
+    def __str__(self):
+        return f"{self.subject} para {', '.join(self.to)} ({self.get_status_display()})"
+
 
 class EmailVerification(models.Model):
     class Meta:
         verbose_name = 'Verificação de Email'
         verbose_name_plural = 'Verificações de Email'
+        indexes = [
+            # Busca do código informado pelo usuário
+            models.Index(fields=['email', 'code'], name='emailverif_email_code_idx'),
+            # Limpeza (purge_email_verifications): expirados e já usados
+            models.Index(fields=['expires_at'], name='emailverif_expires_idx'),
+            models.Index(fields=['id'], condition=models.Q(is_verified=True), name='emailverif_verified_idx'),
+        ]
     
     email = models.EmailField(max_length=254, verbose_name='Email')
     code = models.CharField(max_length=6, verbose_name='Código')
@@ -57,6 +458,28 @@ class EmailVerification(models.Model):
         """Gera um código de 6 dígitos"""
         return ''.join(random.choices(string.digits, k=6))
     
+    @classmethod
+    def find(cls, email, code):
+        """Verificação mais recente com este email e código (ou None)"""
+        return cls.objects.filter(email=email, code=code).order_by('-created_at').first()
+
+    @classmethod
+    def purge(cls, batch_size=1000, now=None):
+        """
+        Apaga um lote de códigos expirados ou já usados e retorna quantos
+        apagou. Cada lote é uma transação curta (DELETE por chave primária),
+        então a tabela nunca fica bloqueada por muito tempo; chame até
+        retornar 0.
+        """
+        now = now or timezone.now()
+        # Uma consulta por índice: com OR o SQLite percorreria a tabela toda
+        for condition in (models.Q(expires_at__lt=now), models.Q(is_verified=True)):
+            ids = list(cls.objects.filter(condition).values_list('pk', flat=True)[:batch_size])
+            if ids:
+                deleted, _ = cls.objects.filter(pk__in=ids).delete()
+                return deleted
+        return 0
+
     def is_expired(self):
         """Verifica se o código expirou"""
         return timezone.now() > self.expires_at
@@ -79,7 +502,7 @@ class EmailVerification(models.Model):
 
 
 class Profile(models.Model):
-    """Perfil simples para armazenar um ID público aleatório do usuário."""
+    """Perfil simples para armazenar o ID público do usuário (ver contact/public_ids.py)."""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     public_id = models.CharField(max_length=12, unique=True, verbose_name='ID Público')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -88,10 +511,9 @@ class Profile(models.Model):
         return f"{self.user.username} ({self.public_id})"
 
     @staticmethod
-    def generate_public_id(length=8):
-        """Gera um identificador público alfanumérico único"""
-        alphabet = string.ascii_uppercase + string.digits
-        return ''.join(random.choices(alphabet, k=length))
+    def generate_public_id(user_id):
+        """ID público do usuário: derivado do id, sem colisões e sem consultar o banco"""
+        return public_ids.encode(user_id)
 
 
 # Sinal para criar Profile automaticamente com public_id único
@@ -102,12 +524,4 @@ from django.dispatch import receiver
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
-        # Gera um public_id único
-        for _ in range(10):
-            candidate = Profile.generate_public_id()
-            if not Profile.objects.filter(public_id=candidate).exists():
-                Profile.objects.create(user=instance, public_id=candidate)
-                break
-        else:
-            # fallback (extremamente improvável)
-            Profile.objects.create(user=instance, public_id=f"U{instance.id}{int(timezone.now().timestamp())}")
\ No newline at end of file
+        Profile.objects.create(user=instance, public_id=Profile.generate_public_id(instance.pk))
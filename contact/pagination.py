@@ -0,0 +1,249 @@
+"""
+Paginação das listas de contatos.
+
+O modo ``keyset`` (padrão) navega por ``-id`` com cursores opacos: cada página
+é um ``WHERE id < cursor ORDER BY id DESC LIMIT n``, então a página N custa o
+mesmo que a primeira. Resultados de busca (anotação ``search_rank``) navegam
+por ``(-search_rank, -id)``: o cursor leva também a relevância da linha. O
+total de contatos é opcional (``none``), estimado pelo planner do PostgreSQL
+(``estimate``) ou exato (``exact``).
+
+O modo ``offset`` mantém o ``Paginator`` do Django (``COUNT(*)`` + ``OFFSET``).
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+
+from contact.search import SEARCH_RANK
+
+PER_PAGE = 10
+CURSOR_SALT = 'contact.pagination.cursor'
+
+
+def encode_cursor(direction, pk, rank=None):
+    values = [direction, pk] if rank is None else [direction, pk, rank]
+    return signing.dumps(values, salt=CURSOR_SALT)
+
+
+def decode_cursor(token):
+    """
+    Retorna ``(direção, id, relevância)`` ou ``None`` para cursores
+    ausentes/inválidos. A relevância é ``None`` fora da busca.
+    """
+    if not token:
+        return None
+
+    try:
+        direction, pk, *rank = signing.loads(token, salt=CURSOR_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+
+    if direction not in ('next', 'prev') or not isinstance(pk, int) or len(rank) > 1:
+        return None
+
+    rank = rank[0] if rank else None
+    if rank is not None and (isinstance(rank, bool) or not isinstance(rank, (int, float))):
+        return None
+
+    return direction, pk, rank
+
+
+class KeysetPage:
+    cursor_based = True
+
+    def __init__(self, object_list, has_next, has_previous, count=None, count_is_estimate=False, rank=None):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.count = count
+        self.count_is_estimate = count_is_estimate
+        self.rank = rank
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    @property
+    def next_cursor(self):
+        if self.has_next and self.object_list:
+            return self._cursor('next', self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous and self.object_list:
+            return self._cursor('prev', self.object_list[0])
+        return None
+
+    def _cursor(self, direction, row):
+        return encode_cursor(direction, row.pk, getattr(row, self.rank) if self.rank else None)
+
+
+class KeysetPaginator:
+    """
+    Pagina um queryset em ordem decrescente de ``id`` ou, com ``rank`` (nome
+    de uma anotação numérica), de ``(rank, id)``.
+    """
+
+    def __init__(self, queryset, per_page=PER_PAGE, count_mode='none', count=None, rank=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.count_mode = count_mode
+        # Total já conhecido (contadores por categoria): exato e sem COUNT/EXPLAIN
+        self.known_count = count
+        self.rank = rank
+
+    def get_page(self, cursor_token=None):
+        cursor = self._decode(cursor_token)
+        rows = list(self._page_queryset(cursor))
+        return self._page(rows, cursor, *self._count())
+
+    async def aget_page(self, cursor_token=None):
+        """Versão assíncrona de ``get_page`` (views async)."""
+        cursor = self._decode(cursor_token)
+        rows = [row async for row in self._page_queryset(cursor)]
+        return self._page(rows, cursor, *await self._acount())
+
+    def _decode(self, cursor_token):
+        cursor = decode_cursor(cursor_token)
+        # Cursor sem relevância (de outra lista) numa busca: primeira página
+        if self.rank and cursor and cursor[2] is None:
+            return None
+        return cursor
+
+    def _page_queryset(self, cursor):
+        limit = self.per_page + 1
+
+        if self.rank:
+            return self._ranked_queryset(cursor)[:limit]
+
+        if cursor is None:
+            return self.queryset.order_by('-id')[:limit]
+        if cursor[0] == 'next':
+            return self.queryset.filter(id__lt=cursor[1]).order_by('-id')[:limit]
+        return self.queryset.filter(id__gt=cursor[1]).order_by('id')[:limit]
+
+    def _ranked_queryset(self, cursor):
+        rank = self.rank
+
+        if cursor is None:
+            return self.queryset.order_by(f'-{rank}', '-id')
+
+        direction, pk, value = cursor
+        if direction == 'next':
+            after = Q(**{f'{rank}__lt': value}) | Q(**{rank: value, 'id__lt': pk})
+            return self.queryset.filter(after).order_by(f'-{rank}', '-id')
+
+        before = Q(**{f'{rank}__gt': value}) | Q(**{rank: value, 'id__gt': pk})
+        return self.queryset.filter(before).order_by(rank, 'id')
+
+    def _page(self, rows, cursor, count, is_estimate):
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if cursor is None:
+            has_next, has_previous = more, False
+        elif cursor[0] == 'next':
+            has_next, has_previous = more, True
+        else:
+            has_next, has_previous = True, more
+            rows = rows[::-1]
+
+        return KeysetPage(rows, has_next, has_previous, count, is_estimate, self.rank)
+
+    def _count(self):
+        if self.known_count is not None:
+            return self.known_count, False
+
+        if self.count_mode == 'exact':
+            return self.queryset.count(), False
+
+        if self.count_mode == 'estimate':
+            return estimate_count(self.queryset), True
+
+        return None, False
+
+    async def _acount(self):
+        if self.known_count is not None:
+            return self.known_count, False
+
+        if self.count_mode == 'exact':
+            return await self.queryset.acount(), False
+
+        if self.count_mode == 'estimate':
+            # EXPLAIN não tem versão assíncrona no ORM
+            return await sync_to_async(estimate_count)(self.queryset), True
+
+        return None, False
+
+
+def estimate_count(queryset):
+    """
+    Estimativa de linhas do planner do PostgreSQL (custo de um EXPLAIN, sem
+    varrer a tabela). Em outros bancos retorna ``None``.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def paginate_contacts(request, queryset, count=None):
+    """
+    Página de ``queryset`` conforme ``settings.CONTACT_PAGINATION``. ``count``
+    é o total, quando já conhecido.
+    """
+    mode = getattr(settings, 'CONTACT_PAGINATION', 'keyset')
+
+    if mode == 'offset':
+        paginator = _offset_paginator(queryset, count)
+        return paginator.get_page(request.GET.get('page'))
+
+    return _keyset_paginator(queryset, count).get_page(request.GET.get('cursor'))
+
+
+async def apaginate_contacts(request, queryset, count=None):
+    """Versão assíncrona de ``paginate_contacts`` (views async)."""
+    mode = getattr(settings, 'CONTACT_PAGINATION', 'keyset')
+
+    if mode == 'offset':
+        return await sync_to_async(_offset_page)(queryset, request.GET.get('page'), count)
+
+    return await _keyset_paginator(queryset, count).aget_page(request.GET.get('cursor'))
+
+
+def _keyset_paginator(queryset, count=None):
+    return KeysetPaginator(
+        queryset,
+        PER_PAGE,
+        count_mode=getattr(settings, 'CONTACT_PAGINATION_COUNT', 'none'),
+        count=count,
+        # Resultados de search_contacts mantêm a ordem por relevância
+        rank=SEARCH_RANK if SEARCH_RANK in queryset.query.annotations else None,
+    )
+
+
+def _offset_paginator(queryset, count=None):
+    paginator = Paginator(queryset, PER_PAGE)
+    if count is not None:
+        # Paginator.count é cached_property: com o total conhecido, sem COUNT(*)
+        paginator.count = count
+    return paginator
+
+
+def _offset_page(queryset, number, count=None):
+    page = _offset_paginator(queryset, count).get_page(number)
+    # Avalia aqui: o template não pode consultar o banco num contexto async
+    page.object_list = list(page.object_list)
+    return page
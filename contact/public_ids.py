@@ -0,0 +1,72 @@
+"""
+ID público dos usuários (Profile.public_id) derivado do id do usuário.
+
+O id passa por uma rede de Feistel com chave (PUBLIC_ID_KEY) sobre um
+domínio de 46 bits: é uma permutação, então ids diferentes nunca geram o
+mesmo código e não é preciso consultar o banco para evitar colisões. O
+resultado é escrito em base 36 com 9 caracteres (36^9 > 2^46), sempre 9:
+não colide com os IDs antigos, aleatórios, de 8 caracteres.
+
+A chave não pode mudar depois que houver perfis gerados com ela; por isso
+é separada da SECRET_KEY, que pode ser trocada (project/settings.py).
+"""
+import hashlib
+import string
+
+from django.conf import settings
+
+ALPHABET = string.ascii_uppercase + string.digits
+LENGTH = 9
+
+HALF_BITS = 23
+HALF_MASK = (1 << HALF_BITS) - 1
+DOMAIN = 1 << (2 * HALF_BITS)
+ROUNDS = 4
+
+
+def _key():
+    return hashlib.sha256(f'public-id:{settings.PUBLIC_ID_KEY}'.encode()).digest()
+
+
+def _round(key, index, value):
+    digest = hashlib.blake2b(value.to_bytes(3, 'big'), digest_size=4, key=key, person=bytes([index]) * 16)
+    return int.from_bytes(digest.digest(), 'big') & HALF_MASK
+
+
+def _permute(number, key, rounds):
+    left, right = number >> HALF_BITS, number & HALF_MASK
+    for index in rounds:
+        left, right = right, left ^ _round(key, index, right)
+    return (left << HALF_BITS) | right
+
+
+def encode(user_id):
+    """Código público (9 caracteres) do usuário ``user_id``."""
+    if not 0 <= user_id < DOMAIN:
+        raise ValueError(f'id fora do domínio do ID público: {user_id}')
+
+    number = _permute(user_id, _key(), range(ROUNDS))
+    chars = []
+    for _ in range(LENGTH):
+        number, digit = divmod(number, len(ALPHABET))
+        chars.append(ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def decode(public_id):
+    """Id do usuário a partir do código (None se não for um código deste formato)."""
+    if len(public_id) != LENGTH or any(char not in ALPHABET for char in public_id):
+        return None
+
+    number = 0
+    for char in public_id:
+        number = number * len(ALPHABET) + ALPHABET.index(char)
+    if number >= DOMAIN:
+        return None
+
+    # Inverso da rede: trocar as metades, aplicar as rodadas ao contrário, trocar de volta
+    return _swap(_permute(_swap(number), _key(), reversed(range(ROUNDS))))
+
+
+def _swap(number):
+    return ((number & HALF_MASK) << HALF_BITS) | (number >> HALF_BITS)
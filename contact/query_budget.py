@@ -0,0 +1,231 @@
+"""
+Orçamento de consultas SQL por view.
+
+Cada view declara quantas consultas pode fazer com ``@query_budget(n)``
+(``None`` para as que trabalham em lotes, como a importação). O
+``QueryBudgetMiddleware`` registra todas as consultas de cada request (em
+qualquer banco configurado, com ou sem DEBUG), soma o tempo gasto no banco e
+detecta repetições:
+
+* duplicadas: o mesmo SQL com os mesmos parâmetros mais de uma vez;
+* repetidas: o mesmo SQL com parâmetros diferentes, o sintoma de N+1
+  (ex.: ``contact.category.name`` dentro de um loop).
+
+Em produção (sem DEBUG nem ``QUERY_BUDGET_HEADERS``) ficam só contagens e
+hashes do SQL, não o texto e os parâmetros de cada consulta.
+
+``BEGIN``, ``SAVEPOINT`` e ``RELEASE SAVEPOINT`` não contam: dependem da
+transação em volta (o mesmo ``atomic()`` vira BEGIN no SQLite, nada no
+PostgreSQL e um savepoint dentro de um teste), não do que a view faz.
+
+Com ``QUERY_BUDGET_HEADERS`` ligado (padrão: DEBUG) a resposta leva os
+cabeçalhos ``X-DB-Queries``, ``X-DB-Time-Ms``, ``X-DB-Duplicates`` e
+``X-DB-Budget``; estourar o orçamento gera um aviso no log.
+
+Para testes e CI: ``record_queries()`` e ``check_budget()`` (usados por
+contact/budget_checks.py: testes e comando ``check_query_budgets``).
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Repetições do mesmo SQL (parâmetros diferentes) a partir das quais é N+1
+REPEATED_THRESHOLD = 3
+
+_NUMBERS = re.compile(r'\b\d+\b')
+
+# Controle de transação, fora da contagem
+_TRANSACTION_CONTROL = re.compile(r'\s*(BEGIN|SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b', re.IGNORECASE)
+
+
+def query_budget(max_queries, max_duplicates=0):
+    """
+    Declara o orçamento de consultas da view (aplique por fora de
+    login_required). ``None``: view isenta, cujo número de consultas cresce
+    com o tamanho da entrada (importação em lotes); só as contagens vão para
+    os cabeçalhos.
+    """
+    def decorator(view):
+        view.query_budget = {'max_queries': max_queries, 'max_duplicates': max_duplicates}
+        return view
+    return decorator
+
+
+def get_budget(view):
+    return getattr(view, 'query_budget', None)
+
+
+@dataclass
+class QueryLog:
+    """
+    Consultas registradas. Com ``detailed`` guarda SQL e parâmetros de cada
+    uma (``queries``: testes, DEBUG); sem, só contagens e hashes, e a memória
+    não cresce com o tamanho das consultas (uma importação grande faz
+    centenas de INSERTs com milhares de parâmetros cada).
+    """
+    detailed: bool = True
+    queries: list = field(default_factory=list)
+    count: int = 0
+    time: float = 0.0
+    # hash de (SQL, parâmetros) e do SQL sem números: vezes executado
+    identical: Counter = field(default_factory=Counter)
+    shapes: Counter = field(default_factory=Counter)
+    # Início do SQL de cada formato, para as mensagens
+    samples: dict = field(default_factory=dict)
+
+    def __call__(self, execute, sql, params, many, context):
+        if _TRANSACTION_CONTROL.match(sql):
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            frozen = _freeze(params) if not many else None
+            self._add(sql, frozen, elapsed)
+            if self.detailed:
+                self.queries.append({
+                    'sql': sql,
+                    'params': frozen,
+                    'time': elapsed,
+                    'alias': context['connection'].alias,
+                })
+
+    def _add(self, sql, params, elapsed):
+        self.count += 1
+        self.time += elapsed
+        self.identical[hash((sql, params))] += 1
+
+        shape = _NUMBERS.sub('?', sql)
+        key = hash(shape)
+        self.shapes[key] += 1
+        self.samples.setdefault(key, shape[:120])
+
+    @property
+    def time_ms(self):
+        return self.time * 1000
+
+    @property
+    def duplicates(self):
+        """Quantas execuções repetiram uma consulta idêntica (SQL e parâmetros)."""
+        return sum(times - 1 for times in self.identical.values())
+
+    @property
+    def repeated(self):
+        """``{sql: vezes}`` do mesmo SQL executado várias vezes (suspeita de N+1)."""
+        return {
+            self.samples[key]: times for key, times in self.shapes.items() if times >= REPEATED_THRESHOLD
+        }
+
+    def summary(self):
+        return {
+            'queries': self.count,
+            'time_ms': round(self.time_ms, 3),
+            'duplicates': self.duplicates,
+            'repeated': self.repeated,
+        }
+
+
+def _freeze(params):
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return tuple(sorted((key, repr(value)) for key, value in params.items()))
+    return tuple(repr(value) for value in params)
+
+
+@contextmanager
+def record_queries(aliases=None, detailed=True):
+    """Registra as consultas executadas no bloco, em todos os bancos."""
+    log = QueryLog(detailed=detailed)
+    with ExitStack() as stack:
+        for alias in aliases or connections:
+            stack.enter_context(connections[alias].execute_wrapper(log))
+        yield log
+
+
+def check_budget(log, budget):
+    """Lista de problemas (vazia se a view respeitou o orçamento)."""
+    if budget is None:
+        return ['view sem @query_budget']
+    if budget['max_queries'] is None:
+        return []
+
+    problems = []
+    if log.count > budget['max_queries']:
+        problems.append(f'{log.count} consultas (orçamento: {budget["max_queries"]})')
+
+    if log.duplicates > budget['max_duplicates']:
+        problems.append(f'{log.duplicates} consultas duplicadas')
+
+    for sql, times in log.repeated.items():
+        problems.append(f'{times}x o mesmo SQL (N+1?): {sql}')
+
+    return problems
+
+
+class QueryBudgetMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.headers = getattr(settings, 'QUERY_BUDGET_HEADERS', settings.DEBUG)
+        # SQL e parâmetros de cada consulta só para depurar; em produção
+        # bastam as contagens (ver QueryLog)
+        self.detailed = settings.DEBUG or self.headers
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with record_queries(detailed=self.detailed) as log:
+            response = self.get_response(request)
+        return self._finish(request, response, log)
+
+    async def __acall__(self, request):
+        # No ASGI o ORM roda na thread "thread-sensitive" do request (conexões
+        # são por thread): o registro precisa ser instalado nela
+        stack = ExitStack()
+        log = await sync_to_async(stack.enter_context)(record_queries(detailed=self.detailed))
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self._finish(request, response, log)
+
+    def _finish(self, request, response, log):
+        match = getattr(request, 'resolver_match', None)
+        budget = get_budget(match.func) if match else None
+        problems = check_budget(log, budget) if budget else []
+
+        if problems:
+            logger.warning('Orçamento de consultas excedido em %s: %s', request.path, '; '.join(problems))
+
+        if self.headers:
+            summary = log.summary()
+            response['X-DB-Queries'] = str(summary['queries'])
+            response['X-DB-Time-Ms'] = f'{summary["time_ms"]:.2f}'
+            response['X-DB-Duplicates'] = str(summary['duplicates'])
+            if budget:
+                response['X-DB-Budget'] = _budget_header(budget, problems)
+
+        return response
+
+
+def _budget_header(budget, problems):
+    if budget['max_queries'] is None:
+        return 'isento'
+    return f'{budget["max_queries"]}; {"excedido" if problems else "ok"}'
@@ -0,0 +1,120 @@
+"""
+Planos de execução das views de contatos.
+
+Executa as views pelo cliente de teste, captura os SELECTs em
+contact_contact e roda EXPLAIN em cada um. Uma varredura completa da tabela
+(consulta sem índice) é regressão. Usado pelo comando check_query_plans e
+pelos testes (contact/tests/test_query_plans.py).
+"""
+import html
+import re
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from contact.models import Category, Contact
+
+CONTACT_TABLE = Contact._meta.db_table
+
+# Sem cache, para que as views sempre executem suas consultas
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+# SQLite: "SCAN tabela" é varredura completa, inclusive "SCAN tabela USING
+# INDEX" (percorre o índice inteiro). Bom é "SEARCH". A tabela FTS
+# (contact_contact_fts) não casa por causa do \b.
+SQLITE_FULL_SCAN = re.compile(rf'\bSCAN {CONTACT_TABLE}\b')
+POSTGRES_FULL_SCAN = re.compile(rf'Seq Scan on {CONTACT_TABLE}\b')
+
+
+def populate(count):
+    """Cria um dono e outro usuário com ``count`` contatos cada; retorna o dono."""
+    owner = User.objects.create_user('__plan_owner__')
+    other = User.objects.create_user('__plan_other__')
+
+    category = Category.objects.create(name='__plan_category__')
+
+    for user in (owner, other):
+        Contact.objects.bulk_create(
+            Contact(
+                owner=user, first_name=f'Nome{i}', last_name='Silva', phone=f'1199999{i:04}',
+                category=category if i % 2 else None,
+            )
+            for i in range(count)
+        )
+
+    if connection.vendor == 'postgresql':
+        # Estatísticas atualizadas para o planner enxergar os dados novos
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {CONTACT_TABLE}')
+
+    return owner
+
+
+def view_queries(owner):
+    """Gera ``(rótulo, [SELECTs em contact_contact])`` de cada view, logado como ``owner``."""
+    client = Client()
+    client.force_login(owner)
+    contact = Contact.objects.filter(owner=owner).order_by('id').first()
+    category_id = Contact.objects.filter(owner=owner, category__isnull=False).values_list('category_id', flat=True)[0]
+
+    requests = [
+        ('index', 'get', reverse('contact:index'), {}),
+        ('index (category)', 'get', reverse('contact:index'), {'category': category_id}),
+        ('index (no category)', 'get', reverse('contact:index'), {'category': 'none'}),
+        ('search', 'get', reverse('contact:search'), {'q': 'Nome1'}),
+        ('search (category)', 'get', reverse('contact:search'), {'q': 'Nome1', 'category': category_id}),
+        ('contact', 'get', reverse('contact:contact', args=(contact.pk,)), {}),
+        ('update', 'get', reverse('contact:update', args=(contact.pk,)), {}),
+        ('delete', 'post', reverse('contact:delete', args=(contact.pk,)), {}),
+        ('sync', 'get', reverse('contact:api_sync'), {'limit': 100}),
+        ('autocomplete', 'get', reverse('contact:api_autocomplete'), {'q': 'Nome1'}),
+    ]
+
+    # Segunda página do index e da busca, seguindo o cursor/página da primeira
+    for label, url, data in (
+        ('index (page 2)', reverse('contact:index'), {}),
+        ('search (page 2)', reverse('contact:search'), {'q': 'Nome1'}),
+    ):
+        response = client.get(url, data, secure=True)
+        # O link já traz q/category
+        next_page = re.search(r'href="\?((?:cursor|page)=[^"]+)', response.content.decode())
+        if next_page:
+            requests.append((label, 'get', f'{url}?{html.unescape(next_page.group(1))}', {}))
+
+    # Sincronização continuando de um token
+    with override_settings(CONTACT_SYNC_WINDOW=0):
+        token = client.get(reverse('contact:api_sync'), {'limit': 100}, secure=True).json()['token']
+    requests.append(('sync (token)', 'get', reverse('contact:api_sync'), {'limit': 100, 'token': token}))
+
+    for label, method, url, data in requests:
+        with CaptureQueriesContext(connection) as captured:
+            getattr(client, method)(url, data, secure=True)
+
+        yield label, [
+            query['sql'] for query in captured.captured_queries
+            if CONTACT_TABLE in query['sql'] and query['sql'].lstrip().upper().startswith('SELECT')
+        ]
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return ' | '.join(row[-1] for row in cursor.fetchall())
+
+        # Com seq scan desligado, o planner só o escolhe se não houver índice
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute(f'EXPLAIN {sql}')
+        plan = ' | '.join(row[0].strip() for row in cursor.fetchall())
+        cursor.execute('RESET enable_seqscan')
+        return plan
+
+
+def full_scan(plan):
+    """O trecho do plano com a varredura completa de contact_contact, ou ``None``."""
+    pattern = SQLITE_FULL_SCAN if connection.vendor == 'sqlite' else POSTGRES_FULL_SCAN
+    match = pattern.search(plan)
+    return match.group(0) if match else None
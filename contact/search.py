@@ -0,0 +1,179 @@
+"""
+Busca de contatos com índice.
+
+Cada contato guarda ``search_key``: nome, sobrenome, e-mail e os dígitos do
+telefone em minúsculas e sem acentos ("José" vira "jose"). O termo buscado
+passa pela mesma normalização, e um termo com cara de telefone ("(11) 9876")
+vira só os dígitos. Todas as palavras do termo precisam aparecer na chave.
+
+- PostgreSQL: ``search_key LIKE '%palavra%'`` com índice GIN de trigramas.
+- SQLite: tabela FTS5 ``contact_contact_fts`` (tokenizer trigram) sobre
+  ``search_key``.
+- Demais bancos (ou palavras curtas demais para trigramas): ``contains``.
+
+As estruturas são criadas pela migração 0022_contact_search_key; a chave é
+recalculada a cada ``save()``/``bulk_create()`` (``SearchKeyField``) e, para
+linhas alteradas por ``update()``, pelo comando ``rebuild_search_keys``.
+"""
+import re
+import unicodedata
+
+from django.db import connections, models
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+# Trigramas precisam de pelo menos 3 caracteres
+MIN_TRIGRAM_LENGTH = 3
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'email', 'phone')
+
+# Anotação de relevância dos resultados; a paginação por cursor ordena por ela
+SEARCH_RANK = 'search_rank'
+
+# Só dígitos e a pontuação de um telefone: "(11) 98765-4321", "+55 11 9876"
+PHONE_TERM = re.compile(r'[\d\s()+.-]*\d[\d\s()+.-]*')
+
+
+def normalize(text):
+    """Minúsculas, sem acentos e com os espaços colapsados."""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(text.lower().split())
+
+
+def digits(text):
+    return ''.join(filter(str.isdigit, text or ''))
+
+
+def search_key(first_name, last_name, email, phone):
+    """Valor de ``Contact.search_key``; o nome vem primeiro (ver ``_rank_sql``)."""
+    return normalize(f'{first_name} {last_name} {email} {digits(phone)}')
+
+
+def query_words(term):
+    """Palavras normalizadas de ``term``; um telefone vira uma palavra só, de dígitos."""
+    if PHONE_TERM.fullmatch(term.strip()):
+        return [digits(term)]
+    return normalize(term).split()
+
+
+class SearchKeyField(models.TextField):
+    """
+    ``search_key`` do contato, recalculada de ``SEARCH_FIELDS`` no
+    ``pre_save()``: vale para ``save()`` e ``bulk_create()``. ``update()`` e
+    ``bulk_update()`` não chamam ``pre_save()``.
+    """
+
+    def pre_save(self, model_instance, add):
+        value = search_key(*(getattr(model_instance, field) for field in SEARCH_FIELDS))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+def rebuild_search_keys(queryset, batch_size=1000):
+    """
+    Recalcula ``search_key`` das linhas de ``queryset`` (também um model
+    histórico, nas migrações), em lotes pela chave primária. Retorna quantas
+    mudaram. Não mexe em ``version``/``updated_at``: a chave não aparece na
+    API nem na sincronização.
+    """
+    queryset = queryset.only('pk', 'search_key', *SEARCH_FIELDS).order_by('pk')
+    last_pk, changed = 0, 0
+
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return changed
+
+        stale = []
+        for contact in batch:
+            key = search_key(*(getattr(contact, field) for field in SEARCH_FIELDS))
+            if contact.search_key != key:
+                contact.search_key = key
+                stale.append(contact)
+
+        if stale:
+            queryset.bulk_update(stale, ['search_key'])
+            changed += len(stale)
+        last_pk = batch[-1].pk
+
+
+def search_contacts(queryset, term):
+    """
+    Filtra ``queryset`` pelos contatos que casam com ``term`` e ordena por
+    relevância (anotação ``search_rank``, maior é melhor) e depois por ``-id``.
+    """
+    words = query_words(term)
+    vendor = connections[queryset.db].vendor
+
+    if vendor == 'postgresql' and words:
+        return _search_postgresql(queryset, words)
+
+    if vendor == 'sqlite' and words and all(len(word) >= MIN_TRIGRAM_LENGTH for word in words):
+        return _search_sqlite(queryset, words)
+
+    return _search_fallback(queryset, words)
+
+
+def _search_fallback(queryset, words):
+    query = Q()
+    for word in words:
+        query &= Q(search_key__contains=word)
+
+    return queryset.filter(query).order_by('-id')
+
+
+def _like_pattern(term):
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def _rank_sql(column, vendor):
+    # A chave começa pelo nome: começar com a primeira palavra vale mais que
+    # só ter uma palavra que começa com ela
+    if vendor == 'postgresql':
+        starts, word_starts = f'starts_with({column}, %s)', f"strpos({column}, ' ' || %s) > 0"
+    else:
+        starts, word_starts = f'instr({column}, %s) = 1', f"instr({column}, ' ' || %s) > 0"
+    return f'CASE WHEN {starts} THEN 2 WHEN {word_starts} THEN 1 ELSE 0 END'
+
+
+def _search_postgresql(queryset, words):
+    table = queryset.model._meta.db_table
+    column = f'{table}.search_key'
+
+    match_sql = ' AND '.join(f'{column} LIKE %s' for _ in words)
+    match_params = [_like_pattern(word) for word in words]
+    rank_sql = _rank_sql(column, 'postgresql')
+
+    return (
+        queryset
+        .filter(RawSQL(match_sql, match_params, output_field=BooleanField()))
+        .annotate(**{SEARCH_RANK: RawSQL(rank_sql, [words[0], words[0]], output_field=FloatField())})
+        .order_by(f'-{SEARCH_RANK}', '-id')
+    )
+
+
+def _search_sqlite(queryset, words):
+    table = queryset.model._meta.db_table
+    fts_table = f'{table}_fts'
+    # Uma frase entre aspas por palavra: o trigram faz busca por substring
+    match = ' '.join('"{}"'.format(word.replace('"', '""')) for word in words)
+
+    # Junção direta com a tabela FTS: o SQLite parte do MATCH e calcula o
+    # bm25 uma única vez por linha encontrada. bm25 é negativo e menor = mais
+    # relevante. A relevância é anotação (não ``extra(select=...)``) para a
+    # paginação por cursor poder filtrar por ela; o ORDER BY usa a posição da
+    # coluna no SELECT, sem recalcular.
+    rank_sql = f'{_rank_sql(f"{table}.search_key", "sqlite")} - bm25({fts_table})'
+
+    return (
+        queryset
+        .extra(
+            tables=[fts_table],
+            where=[f'{fts_table}.rowid = {table}.id', f'{fts_table} MATCH %s'],
+            params=[match],
+        )
+        .annotate(**{SEARCH_RANK: RawSQL(rank_sql, [words[0], words[0]], output_field=FloatField())})
+        .order_by(f'-{SEARCH_RANK}', '-id')
+    )
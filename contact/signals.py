@@ -0,0 +1,92 @@
+import os
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from contact import cache as contact_cache
+from contact.auth_backends import forget_user
+from contact.models import Category, CategoryCount, Contact, ContactTombstone, PictureUpload
+
+# Fim do upload em segundo plano (contact/uploads.py). Argumentos: ``contact``
+# e ``upload``; ``picture_upload_failed`` também recebe ``error``.
+picture_uploaded = Signal()
+picture_upload_failed = Signal()
+
+
+@receiver([post_save, post_delete], sender=Contact)
+def invalidate_owner_list(sender, instance, **kwargs):
+    """Invalida as listas do dono (e do dono anterior, se mudou)."""
+    owners = {instance.owner_id, instance.loaded_value('owner_id')}
+
+    for owner_id in owners - {None}:
+        contact_cache.bump_owner_version_on_commit(owner_id)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_all_lists(sender, instance, **kwargs):
+    transaction.on_commit(contact_cache.bump_global_version)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_choices(sender, instance, **kwargs):
+    """Os processos relêem a lista de categorias (contact/categories.py)."""
+    # Depois do commit: quem reler antes disso ainda veria a lista antiga
+    transaction.on_commit(contact_cache.bump_categories_version)
+
+
+@receiver([post_save, pre_delete], sender=Category)
+def bump_category_contacts(sender, instance, created=False, **kwargs):
+    """O nome da categoria faz parte do contato na API: muda a versão (ETag)."""
+    if not created:
+        Contact.objects.filter(category=instance).update(
+            version=F('version') + 1, updated_at=timezone.now(),
+        )
+
+
+@receiver(pre_delete, sender=Category)
+def move_category_counts(sender, instance, **kwargs):
+    """Os contatos ficam sem categoria (SET_NULL, sem sinais): o contador vai junto."""
+    CategoryCount.merge_into_uncategorized(instance)
+
+
+def _deleted_with_owner(origin):
+    # ``origin`` é o usuário ou o queryset de usuários sendo apagado
+    return isinstance(origin, User) or getattr(origin, 'model', None) is User
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Descarta o usuário do cache de autenticação (contact/auth_backends.py)."""
+    forget_user(instance.pk)
+    # De novo depois do commit: uma requisição pode ter guardado a linha antiga
+    transaction.on_commit(lambda: forget_user(instance.pk))
+
+
+@receiver(post_delete, sender=Contact)
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    """Registra a exclusão para a sincronização incremental (contact/sync.py)."""
+    # Contatos apagados junto com o dono: não há mais quem sincronizar
+    if instance.owner_id is None or _deleted_with_owner(origin):
+        return
+    ContactTombstone.objects.create(owner_id=instance.owner_id, contact_id=instance.pk)
+
+
+@receiver(post_delete, sender=Contact)
+def decrement_category_count(sender, instance, origin=None, **kwargs):
+    # Na mesma transação do DELETE; os contadores do dono apagado vão em cascata
+    if not instance.show or instance.owner_id is None or _deleted_with_owner(origin):
+        return
+    CategoryCount.adjust(instance.owner_id, instance.category_id, -1)
+
+
+@receiver(post_delete, sender=PictureUpload)
+def remove_staged_picture(sender, instance, **kwargs):
+    """Apaga o arquivo local do envio (concluído, substituído ou do contato apagado)."""
+    try:
+        os.remove(instance.staged_path)
+    except FileNotFoundError:
+        pass
@@ -1,76 +1,289 @@
 from django.core.files.storage import Storage
 from django.core.files.base import ContentFile
 from django.conf import settings
-from supabase import create_client, Client
+from storage3 import SyncStorageClient
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import quote, urlencode
+import httpx
 import os
+import threading
+import time
 from uuid import uuid4
 
+
+# Cliente de storage compartilhado pelo processo: um único httpx.Client com
+# pool de conexões keep-alive, reaproveitado entre requests e threads (o
+# httpx.Client é thread-safe). Após um fork (workers do gunicorn com
+# --preload) o filho descarta o cliente herdado e cria o seu.
+_client = None
+_client_lock = threading.Lock()
+
+
+def _reset_client_after_fork():
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_client_after_fork)
+
+
+def _setting(name, default=None):
+    value = getattr(settings, name, None)
+    if value is None:
+        value = os.environ.get(name, default)
+    return value
+
+
+def _build_client():
+    url = _setting('SUPABASE_URL')
+    key = _setting('SUPABASE_SERVICE_KEY')
+
+    if not url or not key:
+        raise Exception("SUPABASE_URL e SUPABASE_SERVICE_KEY precisam estar configurados.")
+
+    headers = {
+        'apiKey': key,
+        'Authorization': f'Bearer {key}',
+    }
+    http_client = httpx.Client(
+        headers=headers,
+        timeout=float(_setting('SUPABASE_HTTP_TIMEOUT', 20)),
+        limits=httpx.Limits(
+            max_connections=int(_setting('SUPABASE_HTTP_MAX_CONNECTIONS', 20)),
+            max_keepalive_connections=int(_setting('SUPABASE_HTTP_MAX_KEEPALIVE', 10)),
+            keepalive_expiry=float(_setting('SUPABASE_HTTP_KEEPALIVE_EXPIRY', 60)),
+        ),
+        http2=str(_setting('SUPABASE_HTTP2', 'true')).lower() == 'true',
+        follow_redirects=True,
+    )
+
+    return SyncStorageClient(f"{url.rstrip('/')}/storage/v1/", headers, http_client=http_client)
+
+
+def get_storage_client():
+    """Cliente de storage do processo, criado na primeira chamada."""
+    global _client
+
+    client = _client
+    if client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+            client = _client
+
+    return client
+
+
+def close_storage_client():
+    """Fecha as conexões do cliente compartilhado (o próximo uso cria outro)."""
+    global _client
+
+    with _client_lock:
+        if _client is not None:
+            _client.session.close()
+            _client = None
+
+
+@lru_cache(maxsize=4096)
+def public_url(supabase_url, bucket_name, name):
+    """URL pública de um objeto, no mesmo formato de get_public_url()."""
+    return f"{supabase_url.rstrip('/')}/storage/v1/object/public/{bucket_name}/{quote(name)}"
+
+
+def sign_url_locally(supabase_url, bucket_name, name, expires_in, jwt_secret):
+    """
+    Gera a URL assinada sem ida à API: o token é o mesmo JWT (HS256, payload
+    ``{"url": "bucket/objeto"}``) que o Storage emite com o segredo JWT do
+    projeto.
+    """
+    import jwt
+
+    now = int(time.time())
+    token = jwt.encode(
+        {'url': f'{bucket_name}/{name}', 'iat': now, 'exp': now + expires_in},
+        jwt_secret,
+        algorithm='HS256',
+    )
+    return (
+        f"{supabase_url.rstrip('/')}/storage/v1/object/sign/{bucket_name}/{quote(name)}"
+        f"?{urlencode({'token': token})}"
+    )
+
+
+class TTLCache:
+    """
+    Cache LRU com TTL, seguro entre threads. Usado para os metadados dos
+    objetos (nome -> tamanho em bytes, ou ``None`` se não existe; evita
+    repetir HEADs, já que o Django chama exists() ao gerar nomes) e para as
+    URLs assinadas (válidas até pouco antes de expirar).
+    """
+
+    def __init__(self, maxsize=1024, ttl=30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """Retorna ``(encontrado, valor)``."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return False, None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[name]
+                return False, None
+
+            self._entries.move_to_end(name)
+            return True, value
+
+    def set(self, name, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[name] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, name):
+        with self._lock:
+            self._entries.pop(name, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
 class SupabaseStorage(Storage):
     def __init__(self):
-        self.supabase_url = os.environ.get('SUPABASE_URL')
-        self.supabase_key = os.environ.get('SUPABASE_SERVICE_KEY')
-        self.bucket_name = os.environ.get('SUPABASE_BUCKET', 'media')
-        self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
+        self.supabase_url = _setting('SUPABASE_URL')
+        self.supabase_key = _setting('SUPABASE_SERVICE_KEY')
+        self.bucket_name = _setting('SUPABASE_BUCKET') or 'media'
+        self.metadata = TTLCache(
+            maxsize=int(_setting('SUPABASE_METADATA_CACHE_SIZE', 1024)),
+            ttl=float(_setting('SUPABASE_METADATA_CACHE_TTL', 30)),
+        )
+        self.signed_urls = str(_setting('SUPABASE_SIGNED_URLS', 'false')).lower() == 'true'
+        self.signed_url_expires = int(_setting('SUPABASE_SIGNED_URL_EXPIRES', 3600))
+        self.jwt_secret = _setting('SUPABASE_JWT_SECRET')
+        self.signed_url_cache = TTLCache(maxsize=int(_setting('SUPABASE_URL_CACHE_SIZE', 4096)))
+
+    @property
+    def bucket(self):
+        # Proxy leve sobre o cliente compartilhado; não abre conexões
+        return get_storage_client().from_(self.bucket_name)
 
     def _save(self, name, content):
         # Gera um nome único para o arquivo
         file_name = f"{uuid4()}_{name}"
-        
+
         # Lê o conteúdo do arquivo
         content.seek(0)
         file_data = content.read()
-        
+
         # Faz upload para o Supabase Storage
         try:
             # A chamada .upload() já levanta uma exceção em caso de erro.
             # Se a linha abaixo executar sem erro, o upload foi bem-sucedido.
-            self.supabase.storage.from_(self.bucket_name).upload(
+            self.bucket.upload(
                 path=file_name,
                 file=file_data,
             )
-            
+            self.metadata.set(file_name, len(file_data))
+
             # Se chegamos até aqui, o upload funcionou.
             # Simplesmente retorne o nome do arquivo.
             return file_name
-                
+
         except Exception as e:
             # Captura qualquer exceção do upload e a relança
             # com uma mensagem mais amigável.
             raise Exception(f"Falha no upload para Supabase: {str(e)}")
-        
+
     def _open(self, name, mode='rb'):
         try:
             # Baixa o arquivo do Supabase
-            result = self.supabase.storage.from_(self.bucket_name).download(name)
+            result = self.bucket.download(name)
             return ContentFile(result)
         except Exception as e:
             raise FileNotFoundError(f"Arquivo '{name}' não encontrado: {str(e)}")
 
     def url(self, name):
-        # Retorna a URL pública do Supabase
-        try:
-            result = self.supabase.storage.from_(self.bucket_name).get_public_url(name)
-            return result
-        except:
-            return f"{self.supabase_url}/storage/v1/object/public/{self.bucket_name}/{name}"
+        # Montada localmente, sem chamar o cliente do Supabase: renderizar uma
+        # página cheia de fotos não faz nenhuma requisição ao storage.
+        if self.signed_urls:
+            return self._signed_url(name)
+        return public_url(self.supabase_url, self.bucket_name, name)
+
+    def _signed_url(self, name):
+        found, url = self.signed_url_cache.get(name)
+        if found:
+            return url
+
+        expires_in = self.signed_url_expires
+        if self.jwt_secret:
+            url = sign_url_locally(self.supabase_url, self.bucket_name, name, expires_in, self.jwt_secret)
+        else:
+            url = self.bucket.create_signed_url(name, expires_in)['signedURL']
+
+        # Reaproveita a URL até 10% antes de expirar (mínimo de 30s de folga),
+        # para nunca entregar ao navegador uma URL prestes a vencer
+        margin = max(30, expires_in // 10)
+        self.signed_url_cache.set(name, url, ttl=expires_in - margin)
+        return url
 
     def exists(self, name):
-        try:
-            self.supabase.storage.from_(self.bucket_name).download(name)
-            return True
-        except:
-            return False
+        return self._metadata(name) is not None
 
     def delete(self, name):
+        self.metadata.discard(name)
+        self.signed_url_cache.discard(name)
         try:
-            result = self.supabase.storage.from_(self.bucket_name).remove([name])
-            return result.status_code == 200
+            # remove() devolve a lista de objetos efetivamente apagados
+            result = self.bucket.remove([name])
+            return bool(result)
         except:
             return False
 
     def size(self, name):
+        size = self._metadata(name)
+        return size or 0
+
+    def _metadata(self, name):
+        """Tamanho do objeto (None se não existe), sem baixar o conteúdo."""
+        found, size = self.metadata.get(name)
+        if found:
+            return size
+
         try:
-            result = self.supabase.storage.from_(self.bucket_name).download(name)
-            return len(result)
-        except:
-            return 0
\ No newline at end of file
+            size = self._head(name)
+        except httpx.HTTPError:
+            # Sem cache: uma falha de rede não deve virar "não existe" por 30s
+            return None
+
+        self.metadata.set(name, size)
+        return size
+
+    def _head(self, name):
+        url = f"{self.supabase_url.rstrip('/')}/storage/v1/object/{self.bucket_name}/{quote(name)}"
+        response = get_storage_client().session.head(url)
+
+        if response.status_code in (400, 404):
+            return None
+        response.raise_for_status()
+
+        length = response.headers.get('content-length')
+        if length is not None:
+            return int(length)
+
+        # Sem Content-Length no HEAD: pergunta o tamanho pela rota de info
+        info = self.bucket.info(name)
+        return int(info.get('size') or info.get('metadata', {}).get('size') or 0)
@@ -0,0 +1,138 @@
+"""
+Sincronização incremental dos contatos de um usuário.
+
+O cliente guarda o ``token`` da última resposta e, na próxima vez, recebe só
+o que mudou desde então: contatos alterados (``Contact.updated_at``, índice
+``owner, updated_at, id``) e ids apagados (``ContactTombstone``). Cada fluxo é
+percorrido por keyset ``(data, id)``, em lotes de no máximo ``limit`` linhas;
+``has_more`` indica que há mais lotes a buscar com o novo token.
+
+Só entram linhas mais antigas que ``CONTACT_SYNC_WINDOW`` segundos: uma
+transação que gravou ``updated_at`` mas ainda não fez commit (ou um servidor
+com o relógio um pouco atrás) não fica para trás do token. A alteração chega
+ao cliente com esse atraso, nunca se perde.
+
+Um fluxo esgotado avança até o limite da janela, então o token só envelhece
+enquanto o cliente não sincroniza. Tokens mais antigos que
+``CONTACT_SYNC_TOMBSTONE_DAYS`` dias são recusados (``TokenExpired``): os
+registros de exclusão já foram apagados e o cliente precisa baixar tudo de
+novo (sincronizar sem token).
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+from contact.models import Contact, ContactTombstone
+
+TOKEN_SALT = 'contact.sync.token'
+
+BATCH_SIZE = 500
+MAX_BATCH_SIZE = 1000
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class TokenExpired(Exception):
+    pass
+
+
+def window():
+    return timedelta(seconds=float(getattr(settings, 'CONTACT_SYNC_WINDOW', 30)))
+
+
+def tombstone_retention():
+    return timedelta(days=int(getattr(settings, 'CONTACT_SYNC_TOMBSTONE_DAYS', 90)))
+
+
+# Token: posição (data em microssegundos, id) de cada fluxo, assinada ----------
+
+def _position(moment, pk):
+    return [(moment - EPOCH) // timedelta(microseconds=1), pk]
+
+
+def encode_token(changed, deleted):
+    return signing.dumps({'c': changed, 'd': deleted}, salt=TOKEN_SALT)
+
+
+def decode_token(token):
+    """Retorna ``(alterados, apagados)``, cada um ``(datetime, id)`` ou ``None``."""
+    try:
+        data = signing.loads(token, salt=TOKEN_SALT)
+        return tuple(
+            None if data[key] is None else (EPOCH + timedelta(microseconds=data[key][0]), int(data[key][1]))
+            for key in ('c', 'd')
+        )
+    except (signing.BadSignature, KeyError, IndexError, TypeError, ValueError, OverflowError):
+        raise InvalidToken('Token de sincronização inválido.')
+
+
+# Lotes -------------------------------------------------------------------------
+
+def _after(queryset, field, position):
+    """Linhas depois de ``position`` na ordem ``(field, id)``, pelo índice."""
+    if position is None:
+        return queryset
+    moment, pk = position
+    return queryset.filter(**{f'{field}__gte': moment}).exclude(**{field: moment, 'id__lte': pk})
+
+
+def _batch(queryset, field, position, settled, limit):
+    rows = list(
+        _after(queryset, field, position)
+        .filter(**{f'{field}__lt': settled})
+        .order_by(field, 'id')[:limit + 1]
+    )
+    more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        position = (getattr(rows[-1], field), rows[-1].pk)
+    if not more and (position is None or position < (settled, 0)):
+        # Fluxo esgotado: nada anterior a ``settled`` ainda pode aparecer. Sem
+        # isso o token de quem nunca apaga nada ficaria preso na primeira
+        # sincronização e expiraria (TokenExpired)
+        position = (settled, 0)
+    return rows, position, more
+
+
+def changes(owner, token=None, limit=BATCH_SIZE, now=None):
+    """
+    Próximo lote de alterações de ``owner`` desde ``token`` (``None``: tudo).
+    Retorna um dict com ``contacts`` (visíveis, alterados ou criados),
+    ``deleted`` (ids apagados ou ocultados), ``token`` e ``has_more``.
+    """
+    now = now or timezone.now()
+    settled = now - window()
+
+    if token:
+        changed, deleted = decode_token(token)
+        if deleted is None or deleted[0] < now - tombstone_retention():
+            raise TokenExpired('Token de sincronização expirado: sincronize sem token.')
+    else:
+        # Primeira sincronização: todos os contatos; exclusões só daqui em diante
+        changed, deleted = None, (settled, 0)
+
+    contacts, changed, more_contacts = _batch(
+        Contact.objects.filter(owner=owner).select_related('category'),
+        'updated_at', changed, settled, limit,
+    )
+    tombstones, deleted, more_tombstones = _batch(
+        ContactTombstone.objects.filter(owner=owner).only('id', 'contact_id', 'deleted_at'),
+        'deleted_at', deleted, settled, limit,
+    )
+
+    return {
+        'contacts': [contact for contact in contacts if contact.show],
+        # Ocultar tira o contato da agenda: para o cliente é uma exclusão
+        'deleted': [contact.pk for contact in contacts if not contact.show]
+                   + [tombstone.contact_id for tombstone in tombstones],
+        'token': encode_token(
+            changed and _position(*changed), _position(*deleted),
+        ),
+        'has_more': more_contacts or more_tombstones,
+    }
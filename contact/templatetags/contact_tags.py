@@ -0,0 +1,9 @@
+from django import template
+
+register = template.Library()
+
+
+@register.filter
+def picture_url(contact, width):
+    """Uso: ``{{ contact|picture_url:256 }}`` (menor variante com >= 256px)."""
+    return contact.picture_url(width)
@@ -0,0 +1,100 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from contact import bulk, categories
+from contact.forms import ContactForm
+from contact.models import Category, Contact
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'contact-tests-categories',
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE, CONTACT_CATEGORY_CACHE_TIMEOUT=60)
+class CategoryChoicesTests(TestCase):
+    """
+    A lista em memória pode estar velha (outro processo, versão local). Nos
+    testes o on_commit não roda, então a versão não muda depois das escritas.
+    """
+
+    def setUp(self):
+        cache.clear()
+        categories.clear()
+        self.addCleanup(categories.clear)
+
+    def contact_data(self, category):
+        return {'first_name': 'Ana', 'last_name': 'Silva', 'phone': '11999990000', 'category': category.pk}
+
+    def test_deleted_category_is_invalid(self):
+        category = Category.objects.create(name='Antiga')
+        categories.category_choices()
+        Category.objects.filter(pk=category.pk).delete()
+
+        # Ainda na lista em memória, mas a validação do ForeignKey a recusa
+        self.assertIn(category.pk, dict(categories.category_choices()))
+        form = ContactForm(self.contact_data(category))
+        self.assertFalse(form.is_valid())
+        self.assertIn('category', form.errors)
+
+    def test_existing_category_is_valid(self):
+        category = Category.objects.create(name='Amigos')
+
+        form = ContactForm(self.contact_data(category))
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data['category'], category)
+
+    def test_list_expires(self):
+        with mock.patch('contact.categories.time.monotonic', return_value=1000.0):
+            categories.category_choices()
+        category = Category.objects.create(name='Nova')
+
+        with mock.patch('contact.categories.time.monotonic', return_value=1059.0):
+            self.assertNotIn(category.pk, dict(categories.category_choices()))
+        with mock.patch('contact.categories.time.monotonic', return_value=1061.0):
+            self.assertIn(category.pk, dict(categories.category_choices()))
+
+
+@override_settings(CACHES=LOCMEM_CACHE, CONTACT_CATEGORY_CACHE_TIMEOUT=60)
+class BulkMoveTests(TestCase):
+    """Mover em lote para uma categoria apagada, ainda na lista em memória."""
+
+    def setUp(self):
+        cache.clear()
+        categories.clear()
+        self.addCleanup(categories.clear)
+
+        self.owner = User.objects.create_user('bulk-move')
+        self.contact = Contact.objects.create(owner=self.owner, first_name='Ana', phone='11999990000')
+        self.client.force_login(self.owner)
+
+        self.category = Category.objects.create(name='Antiga')
+        categories.category_choices()
+        Category.objects.filter(pk=self.category.pk).delete()
+
+    def test_form_error(self):
+        response = self.client.post(reverse('contact:bulk'), {
+            'action': bulk.MOVE, 'ids': [self.contact.pk], 'category': self.category.pk,
+        }, secure=True)
+
+        self.assertEqual(
+            [str(message) for message in get_messages(response.wsgi_request)],
+            ['A categoria escolhida não existe mais.'],
+        )
+        self.contact.refresh_from_db()
+        self.assertIsNone(self.contact.category_id)
+
+    def test_api_error(self):
+        response = self.client.post(reverse('contact:api_bulk'), {
+            'action': bulk.MOVE, 'ids': [self.contact.pk], 'category': self.category.pk,
+        }, content_type='application/json', secure=True)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('category', response.json()['errors'])
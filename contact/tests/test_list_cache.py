@@ -0,0 +1,56 @@
+import io
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from contact import bulk, importer
+from contact import cache as contact_cache
+from contact.models import Category, Contact
+
+LOCMEM_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'contact-tests-list-cache',
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ListVersionTests(TestCase):
+    """As versões das listas só mudam depois do commit da escrita."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('list-cache')
+
+    def setUp(self):
+        contact_cache.cache.clear()
+        self.versions = contact_cache.get_versions(self.owner.pk)
+
+    def assertBumpedOnCommit(self, write):
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+            # Ainda na transação: quem ler agora vê as linhas antigas
+            self.assertEqual(contact_cache.get_versions(self.owner.pk), self.versions)
+
+        self.assertNotEqual(contact_cache.get_versions(self.owner.pk), self.versions)
+
+    def test_save(self):
+        self.assertBumpedOnCommit(lambda: Contact.objects.create(owner=self.owner, first_name='Ana'))
+
+    def test_delete(self):
+        contact = Contact.objects.create(owner=self.owner, first_name='Ana')
+        self.versions = contact_cache.get_versions(self.owner.pk)
+        self.assertBumpedOnCommit(contact.delete)
+
+    def test_category(self):
+        self.assertBumpedOnCommit(lambda: Category.objects.create(name='Amigos'))
+
+    def test_bulk(self):
+        contact = Contact.objects.create(owner=self.owner, first_name='Ana')
+        self.versions = contact_cache.get_versions(self.owner.pk)
+        self.assertBumpedOnCommit(lambda: bulk.apply(self.owner, bulk.HIDE, [contact.pk]))
+
+    def test_import(self):
+        data = io.BytesIO('first_name,last_name,phone\nAna,Silva,11999990000\n'.encode())
+        self.assertBumpedOnCommit(lambda: importer.import_contacts(self.owner, data))
@@ -0,0 +1,72 @@
+import json
+
+import httpx
+from django.test import TestCase
+
+from contact import mail
+from contact.models import OutgoingEmail
+
+
+class FakeResend:
+    """API de lote do Resend: recusa o lote inteiro (422) se um endereço for inválido."""
+
+    def __init__(self, status_for_batch=None):
+        self.accepted = []
+        self.requests = 0
+        self.status_for_batch = status_for_batch
+
+    def __call__(self, request):
+        self.requests += 1
+        batch = json.loads(request.content)
+
+        status = self.status_for_batch(batch) if self.status_for_batch else None
+        if status:
+            return httpx.Response(status, json={'message': 'erro'})
+        if any('invalido' in address for email in batch for address in email['to']):
+            return httpx.Response(422, json={'message': 'Invalid `to` field.'})
+
+        self.accepted.extend(email['to'][0] for email in batch)
+        return httpx.Response(200, json={'data': [{'id': str(index)} for index in range(len(batch))]})
+
+
+class ResendBatchTests(TestCase):
+    """Um email recusado não derruba o restante do lote."""
+
+    def deliver(self, api, addresses):
+        for address in addresses:
+            mail.enqueue(address, 'Assunto', 'Corpo')
+
+        backend = mail.ResendBackend('test', transport=httpx.MockTransport(api))
+        self.addCleanup(backend.close)
+        return mail.deliver(backend)
+
+    def test_only_rejected_email_fails(self):
+        api = FakeResend()
+        addresses = [f'pessoa{index}@exemplo.com' for index in range(10)]
+        addresses[6] = 'invalido@'
+
+        self.assertEqual(self.deliver(api, addresses), (9, 1))
+
+        # Cada email válido foi aceito uma única vez
+        self.assertEqual(sorted(api.accepted), sorted(set(addresses) - {'invalido@'}))
+        failed = OutgoingEmail.objects.get()
+        self.assertEqual(failed.to, ['invalido@'])
+        self.assertEqual(failed.status, OutgoingEmail.STATUS_FAILED)
+        self.assertLess(api.requests, len(addresses))
+
+    def test_transient_error_in_half_keeps_it_pending(self):
+        # Depois do 422 do lote inteiro, a metade com o endereço inválido dá 503
+        api = FakeResend(lambda batch: 503 if len(batch) == 2 and batch[0]['to'] == ['invalido@'] else None)
+
+        self.assertEqual(self.deliver(api, ['invalido@', 'ana@exemplo.com', 'bia@exemplo.com', 'caio@exemplo.com']), (2, 2))
+
+        self.assertEqual(sorted(api.accepted), ['bia@exemplo.com', 'caio@exemplo.com'])
+        self.assertEqual(
+            set(OutgoingEmail.objects.values_list('status', flat=True)), {OutgoingEmail.STATUS_PENDING},
+        )
+
+    def test_other_client_errors_fail_whole_batch(self):
+        api = FakeResend(lambda batch: 403)
+
+        self.assertEqual(self.deliver(api, ['ana@exemplo.com', 'bia@exemplo.com']), (0, 2))
+        self.assertEqual(api.requests, 1)
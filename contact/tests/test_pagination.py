@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from contact.models import Contact
+from contact.pagination import KeysetPaginator, _keyset_paginator, encode_cursor
+from contact.search import SEARCH_RANK, search_contacts
+
+
+class RankedKeysetPaginationTests(TestCase):
+    """A paginação por cursor mantém a ordem de relevância da busca."""
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user('pagination')
+        # Os mais relevantes (nome começa com o termo) têm os menores ids
+        Contact.objects.bulk_create(
+            [Contact(owner=owner, first_name='Marina', last_name=f'Souza{i}') for i in range(5)]
+            + [Contact(owner=owner, first_name='Ana', last_name=f'Marinho{i}') for i in range(5)]
+            + [Contact(owner=owner, first_name='Lucas', last_name=f'Almarina{i}') for i in range(5)]
+        )
+        cls.results = search_contacts(Contact.objects.filter(owner=owner), 'marin')
+
+    def walk(self, paginator):
+        pages, token = [], None
+        while True:
+            page = paginator.get_page(token)
+            pages.append(page)
+            if not page.has_next:
+                return pages
+            token = page.next_cursor
+
+    def test_search_results_use_rank(self):
+        self.assertEqual(_keyset_paginator(self.results).rank, SEARCH_RANK)
+        self.assertIsNone(_keyset_paginator(Contact.objects.all()).rank)
+
+    def test_pages_follow_relevance_order(self):
+        expected = [contact.pk for contact in self.results]
+        pages = self.walk(KeysetPaginator(self.results, per_page=4, rank=SEARCH_RANK))
+
+        self.assertEqual([contact.pk for page in pages for contact in page], expected)
+        self.assertEqual([contact.first_name for contact in pages[0]], ['Marina'] * 4)
+
+    def test_previous_cursor_returns_same_page(self):
+        paginator = KeysetPaginator(self.results, per_page=4, rank=SEARCH_RANK)
+        pages = self.walk(paginator)
+
+        previous = paginator.get_page(pages[2].previous_cursor)
+        self.assertEqual([contact.pk for contact in previous], [contact.pk for contact in pages[1]])
+
+    def test_cursor_without_rank_starts_over(self):
+        paginator = KeysetPaginator(self.results, per_page=4, rank=SEARCH_RANK)
+        page = paginator.get_page(encode_cursor('next', 1))
+
+        self.assertFalse(page.has_previous)
+        self.assertEqual([contact.pk for contact in page], [contact.pk for contact in self.results[:4]])
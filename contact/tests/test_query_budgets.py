@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from contact import budget_checks, importer
+from contact.models import Category, Contact
+from contact.query_budget import QueryBudgetMiddleware, check_budget, record_queries
+
+
+@override_settings(ALLOWED_HOSTS=['*'], CACHES=budget_checks.EMPTY_CACHE)
+class QueryBudgetTests(TestCase):
+    """Cada view fica dentro do seu @query_budget, sem duplicadas nem N+1."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Cache vazio; populate() já deixa as categorias em memória
+        cache.clear()
+        cls.owner = budget_checks.populate(30)
+
+    def test_views_within_budget(self):
+        checked = 0
+        with budget_checks.picture_storage():
+            for label, url, log in budget_checks.view_logs(self.owner):
+                budget, problems = budget_checks.problems(url, log)
+                with self.subTest(label):
+                    self.assertEqual(problems, [], [query['sql'] for query in log.queries])
+                checked += 1
+
+        self.assertGreater(checked, 0)
+
+
+class QueryLogTests(TestCase):
+    """Sem ``detailed`` (produção) o registro guarda só contagens."""
+
+    def test_counters_without_details(self):
+        with record_queries(detailed=False) as log:
+            for pk in range(4):
+                list(Category.objects.filter(pk=pk))
+            list(Category.objects.filter(pk=0))
+
+        self.assertEqual(log.queries, [])
+        self.assertEqual((log.count, log.duplicates), (5, 1))
+        self.assertEqual(list(log.repeated.values()), [5])
+        self.assertEqual(check_budget(log, {'max_queries': 5, 'max_duplicates': 1})[0][:4], '5x o')
+
+    def test_middleware_keeps_details_only_when_debugging(self):
+        for debug, detailed in ((False, False), (True, True)):
+            with self.settings(DEBUG=debug):
+                self.assertEqual(QueryBudgetMiddleware(lambda request: None).detailed, detailed)
+
+
+@override_settings(ALLOWED_HOSTS=['*'], CACHES=budget_checks.EMPTY_CACHE, DATA_UPLOAD_MAX_NUMBER_FIELDS=None)
+class BatchEndpointBudgetTests(TestCase):
+    """Importar e agir em lote sobre milhares de contatos não gera avisos."""
+
+    ROWS = importer.BATCH_SIZE * 2 + 500
+
+    @classmethod
+    def setUpTestData(cls):
+        cache.clear()
+        cls.owner = budget_checks.populate(0)
+
+    def setUp(self):
+        self.client.force_login(self.owner)
+
+    def post(self, url, data):
+        with self.assertNoLogs('contact.query_budget', 'WARNING'), record_queries() as log:
+            response = self.client.post(url, data, secure=True)
+        self.assertLess(response.status_code, 400)
+        return log
+
+    def test_import_is_exempt(self):
+        body = 'nome,sobrenome,telefone,categoria\n' + ''.join(
+            f'Nome,Silva,(11) 9{index:04}-0000,Categoria {index % 4}\n' for index in range(self.ROWS)
+        )
+        log = self.post(reverse('contact:import'), {'file': SimpleUploadedFile('contatos.csv', body.encode())})
+
+        self.assertEqual(Contact.objects.filter(owner=self.owner).count(), self.ROWS)
+        self.assertGreater(log.count, 5)
+        self.assertEqual(budget_checks.problems(reverse('contact:import'), log)[1], [])
+
+    def test_bulk_does_not_grow_with_ids(self):
+        Contact.objects.bulk_create(
+            Contact(owner=self.owner, first_name='Nome', phone=f'1199{index:07}') for index in range(self.ROWS)
+        )
+        ids = list(Contact.objects.filter(owner=self.owner).values_list('pk', flat=True))
+
+        for action in ('hide', 'restore', 'delete'):
+            with self.subTest(action):
+                log = self.post(reverse('contact:bulk'), {'action': action, 'ids': ids, 'next': reverse('contact:hidden')})
+                self.assertEqual(budget_checks.problems(reverse('contact:bulk'), log)[1], [])
@@ -0,0 +1,23 @@
+from django.test import TestCase, override_settings
+
+from contact import query_plans
+
+
+@override_settings(ALLOWED_HOSTS=['*'], CACHES=query_plans.NO_CACHE)
+class QueryPlanTests(TestCase):
+    """Nenhuma consulta das views de contatos varre contact_contact inteira."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = query_plans.populate(200)
+
+    def test_contact_views_use_indexes(self):
+        checked = 0
+        for label, queries in query_plans.view_queries(self.owner):
+            for sql in queries:
+                plan = query_plans.explain(sql)
+                with self.subTest(label, sql=sql):
+                    self.assertIsNone(query_plans.full_scan(plan), plan)
+                checked += 1
+
+        self.assertGreater(checked, 0)
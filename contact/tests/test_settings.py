@@ -0,0 +1,57 @@
+import os
+import runpy
+from unittest import mock
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+SETTINGS_FILE = os.path.join(settings.BASE_DIR, 'project', 'settings.py')
+
+
+def load_settings(**environ):
+    environ.setdefault('SECRET_KEY', 'test')
+    environ.setdefault('PUBLIC_ID_KEY', 'test-public-id')
+    with mock.patch.dict(os.environ, environ):
+        for name in ('CACHE_BACKEND', 'CONTACT_SESSION_BACKEND', 'CONTACT_USER_CACHE_TIMEOUT', 'DEBUG'):
+            if name not in environ:
+                os.environ.pop(name, None)
+        return runpy.run_path(SETTINGS_FILE)
+
+
+class SessionDefaultsTests(SimpleTestCase):
+    """Sessão e usuário em cache só com um cache compartilhado entre workers."""
+
+    def test_local_memory_cache(self):
+        loaded = load_settings()
+
+        self.assertEqual(loaded['SESSION_ENGINE'], 'django.contrib.sessions.backends.db')
+        self.assertEqual(loaded['CONTACT_USER_CACHE_TIMEOUT'], 0)
+
+    def test_shared_cache(self):
+        loaded = load_settings(CACHE_BACKEND='django.core.cache.backends.redis.RedisCache')
+
+        self.assertEqual(loaded['SESSION_ENGINE'], 'django.contrib.sessions.backends.cached_db')
+        self.assertEqual(loaded['CONTACT_USER_CACHE_TIMEOUT'], 60)
+
+    def test_explicit_settings_win(self):
+        loaded = load_settings(CONTACT_SESSION_BACKEND='signed_cookies', CONTACT_USER_CACHE_TIMEOUT='30')
+
+        self.assertEqual(loaded['SESSION_ENGINE'], 'django.contrib.sessions.backends.signed_cookies')
+        self.assertEqual(loaded['CONTACT_USER_CACHE_TIMEOUT'], 30)
+
+
+class PublicIdKeyTests(SimpleTestCase):
+    """A chave dos IDs públicos é explícita: trocar a SECRET_KEY não a muda."""
+
+    def test_required_without_debug(self):
+        with self.assertRaises(ImproperlyConfigured):
+            load_settings(PUBLIC_ID_KEY='')
+
+    def test_independent_of_secret_key(self):
+        loaded = load_settings(SECRET_KEY='nova', PUBLIC_ID_KEY='fixa')
+
+        self.assertEqual(loaded['PUBLIC_ID_KEY'], 'fixa')
+
+    def test_debug_falls_back_to_secret_key(self):
+        self.assertEqual(load_settings(DEBUG='True', PUBLIC_ID_KEY='')['PUBLIC_ID_KEY'], 'test')
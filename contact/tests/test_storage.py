@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, override_settings
+
+from contact.fake_storage import FakeStorageServer
+from contact.supabase_storage import SupabaseStorage, close_storage_client
+
+
+class SupabaseStorageMetadataTests(SimpleTestCase):
+    """exists()/size() usam HEAD com cache por nome, sem baixar o objeto."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FakeStorageServer().start()
+        cls.addClassCleanup(cls.server.stop)
+
+    def setUp(self):
+        settings = override_settings(
+            SUPABASE_URL=self.server.url,
+            SUPABASE_SERVICE_KEY='test',
+            SUPABASE_BUCKET='media',
+            SUPABASE_HTTP2='false',
+            SUPABASE_METADATA_CACHE_TTL=30,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        # Cliente novo a cada teste, apontando para o servidor falso
+        close_storage_client()
+        self.addCleanup(close_storage_client)
+
+        self.server.objects.clear()
+        self.server.requests.clear()
+        self.server.objects[('media', 'contacts/ana.jpg')] = b'x' * 1234
+        self.storage = SupabaseStorage()
+
+    def test_exists_and_size_do_not_download(self):
+        self.assertTrue(self.storage.exists('contacts/ana.jpg'))
+        self.assertEqual(self.storage.size('contacts/ana.jpg'), 1234)
+        self.assertFalse(self.storage.exists('contacts/missing.jpg'))
+        self.assertEqual(self.storage.size('contacts/missing.jpg'), 0)
+
+        self.assertEqual(self.server.requests['download'], 0)
+        self.assertEqual(self.server.requests['info'], 0)
+
+    def test_one_head_per_name_within_ttl(self):
+        for _ in range(3):
+            self.storage.exists('contacts/ana.jpg')
+            self.storage.size('contacts/ana.jpg')
+            self.storage.exists('contacts/missing.jpg')
+
+        self.assertEqual(self.server.requests['head'], 2)
+
+    def test_head_again_after_ttl(self):
+        with mock.patch('contact.supabase_storage.time.monotonic', return_value=1000.0):
+            self.storage.exists('contacts/ana.jpg')
+        with mock.patch('contact.supabase_storage.time.monotonic', return_value=1031.0):
+            self.storage.exists('contacts/ana.jpg')
+
+        self.assertEqual(self.server.requests['head'], 2)
+
+    def test_delete_invalidates_entry(self):
+        self.assertTrue(self.storage.exists('contacts/ana.jpg'))
+        self.assertTrue(self.storage.delete('contacts/ana.jpg'))
+
+        self.assertFalse(self.storage.exists('contacts/ana.jpg'))
+        self.assertEqual(self.server.requests['head'], 2)
+
+    def test_save_caches_size(self):
+        self.assertFalse(self.storage.exists('novo.jpg'))
+
+        name = self.storage.save('novo.jpg', ContentFile(b'y' * 42))
+
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(self.storage.size(name), 42)
+        self.assertEqual(self.server.objects[('media', name)], b'y' * 42)
+        # Só o HEAD do nome inicial (get_available_name); o salvo vem do cache
+        self.assertEqual(self.server.requests['head'], 1)
+        self.assertEqual(self.server.requests['download'], 0)
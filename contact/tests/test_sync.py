@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from contact import sync
+from contact.models import Contact
+
+
+class SyncTokenTests(TestCase):
+    """O token de quem sincroniza com frequência não expira."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('sync')
+        cls.contact = Contact.objects.create(owner=cls.owner, first_name='Ana', phone='11999990000')
+
+    def test_daily_sync_without_deletions_never_expires(self):
+        now = timezone.now() + timedelta(minutes=1)
+        batch = sync.changes(self.owner, now=now)
+        self.assertEqual([contact.pk for contact in batch['contacts']], [self.contact.pk])
+
+        for _ in range(sync.tombstone_retention().days * 2):
+            now += timedelta(days=1)
+            # Não deve levantar TokenExpired (410 na API)
+            batch = sync.changes(self.owner, batch['token'], now=now)
+            self.assertEqual((batch['contacts'], batch['deleted']), ([], []))
+
+    def test_deletion_after_advanced_token_is_delivered(self):
+        token = sync.changes(self.owner)['token']
+        pk = self.contact.pk
+        self.contact.delete()
+
+        batch = sync.changes(self.owner, token, now=timezone.now() + sync.window() + timedelta(seconds=1))
+        self.assertEqual(batch['deleted'], [pk])
+
+    def test_stale_token_expires(self):
+        now = timezone.now() + timedelta(minutes=1)
+        token = sync.changes(self.owner, now=now)['token']
+
+        with self.assertRaises(sync.TokenExpired):
+            sync.changes(self.owner, token, now=now + sync.tombstone_retention() + timedelta(days=1))
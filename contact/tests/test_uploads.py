@@ -0,0 +1,108 @@
+import io
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from contact import uploads
+from contact.fake_storage import FakeStorageServer
+from contact.models import Contact, PictureUpload
+from contact.supabase_storage import SupabaseStorage, close_storage_client
+
+
+def png(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class PictureUploadProcessTests(TestCase):
+    """process() só grava a foto se o envio ainda for o atual."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FakeStorageServer().start()
+        cls.addClassCleanup(cls.server.stop)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('uploads')
+        cls.contact = Contact.objects.create(owner=cls.owner, first_name='Ana')
+
+    def setUp(self):
+        staging = tempfile.TemporaryDirectory()
+        self.addCleanup(staging.cleanup)
+
+        settings = override_settings(
+            SUPABASE_URL=self.server.url,
+            SUPABASE_SERVICE_KEY='test',
+            SUPABASE_BUCKET='media',
+            SUPABASE_HTTP2='false',
+            CONTACT_PICTURE_UPLOAD='queue',
+            CONTACT_PICTURE_STAGING_DIR=staging.name,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        close_storage_client()
+        self.addCleanup(close_storage_client)
+        self.server.objects.clear()
+
+        # O storage do campo foi criado na importação, com as configurações de então
+        field = Contact._meta.get_field('picture')
+        patcher = mock.patch.object(field, 'storage', SupabaseStorage())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def queue_picture(self, name, color):
+        contact = Contact.objects.get(pk=self.contact.pk)
+        contact.picture = SimpleUploadedFile(name, png(color), content_type='image/png')
+        uploads.save_contact(contact)
+        return contact.picture_uploads.get()
+
+    def test_upload_sets_picture(self):
+        upload = self.queue_picture('ana.png', 'red')
+
+        self.assertIsNotNone(uploads.process(upload.pk))
+
+        contact = Contact.objects.get(pk=self.contact.pk)
+        self.assertEqual(contact.picture_status, Contact.PICTURE_READY)
+        self.assertIn(('media', contact.picture.name), self.server.objects)
+        self.assertFalse(PictureUpload.objects.exists())
+
+    def test_superseded_upload_is_dropped(self):
+        old = self.queue_picture('old.png', 'red')
+        store_picture = uploads._store_picture
+
+        def store_then_supersede(contact):
+            store_picture(contact)
+            # Foto mais nova enviada enquanto a antiga ainda subia
+            self.queue_picture('new.png', 'blue')
+
+        with mock.patch.object(uploads, '_store_picture', store_then_supersede):
+            self.assertIsNone(uploads.process(old.pk))
+
+        contact = Contact.objects.get(pk=self.contact.pk)
+        self.assertEqual(contact.picture_status, Contact.PICTURE_PENDING)
+        self.assertFalse(contact.picture)
+        # Só o envio novo continua na fila, e nada do antigo ficou no storage
+        self.assertEqual(PictureUpload.objects.get().file_name, 'new.png')
+        self.assertEqual(self.server.objects, {})
+
+    def test_deleted_contact_upload_is_dropped(self):
+        upload = self.queue_picture('ana.png', 'red')
+        store_picture = uploads._store_picture
+
+        def store_then_delete(contact):
+            store_picture(contact)
+            Contact.objects.filter(pk=self.contact.pk).delete()
+
+        with mock.patch.object(uploads, '_store_picture', store_then_delete):
+            self.assertIsNone(uploads.process(upload.pk))
+
+        self.assertFalse(Contact.objects.filter(pk=self.contact.pk).exists())
+        self.assertEqual(self.server.objects, {})
@@ -0,0 +1,254 @@
+"""
+Upload de fotos em segundo plano.
+
+Com ``CONTACT_PICTURE_UPLOAD = 'sync'`` (padrão) a foto vai ao storage dentro
+do request, como sempre. Nos outros modos o request só grava o arquivo em
+disco local (``CONTACT_PICTURE_STAGING_DIR``), marca o contato como
+"Enviando" e cria um ``PictureUpload``; o envio (com as miniaturas) é feito
+depois:
+
+* ``'thread'``: por um pool de threads do próprio processo, disparado após o
+  commit da transação;
+* ``'queue'``: pelo comando ``process_picture_uploads``, rodando à parte (o
+  diretório de staging precisa ser compartilhado com ele).
+
+Falhas são repetidas com backoff exponencial até
+``CONTACT_PICTURE_UPLOAD_RETRIES`` tentativas; o comando também recolhe
+envios que ficaram para trás (processo reiniciado, thread interrompida).
+Ao terminar são enviados os sinais ``picture_uploaded`` ou
+``picture_upload_failed`` (contact/signals.py).
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.move import file_move_safe
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from contact import cache as contact_cache
+from contact.models import Contact, PictureUpload
+from contact.signals import picture_upload_failed, picture_uploaded
+
+logger = logging.getLogger(__name__)
+
+# Tempo que um worker "segura" o envio antes que outro possa retomá-lo
+LEASE = timedelta(minutes=5)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _reset_executor_after_fork():
+    # As threads do pool não existem no processo filho
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_executor_after_fork)
+
+
+def upload_mode():
+    return getattr(settings, 'CONTACT_PICTURE_UPLOAD', 'sync')
+
+
+def staging_dir():
+    return str(getattr(settings, 'CONTACT_PICTURE_STAGING_DIR', settings.BASE_DIR / 'media_staging'))
+
+
+def max_attempts():
+    return int(getattr(settings, 'CONTACT_PICTURE_UPLOAD_RETRIES', 5))
+
+
+def retry_delay(attempts):
+    base = float(getattr(settings, 'CONTACT_PICTURE_UPLOAD_BACKOFF', 5))
+    return timedelta(seconds=base * 2 ** (attempts - 1))
+
+
+def save_contact(contact):
+    """
+    Salva o contato vindo do formulário. Em modo assíncrono a foto nova é
+    só guardada localmente; a anterior continua valendo até a nova chegar.
+    """
+    picture = contact.picture
+    if upload_mode() == 'sync' or not picture or picture._committed:
+        contact.save()
+        return contact
+
+    file_name = os.path.basename(picture.name)
+    contact.picture = contact.loaded_value('picture') or ''
+    contact.picture_status = Contact.PICTURE_PENDING
+
+    with transaction.atomic():
+        contact.save()
+        # Um envio mais novo substitui o que ainda estiver na fila
+        contact.picture_uploads.all().delete()
+        upload = PictureUpload.objects.create(
+            contact=contact,
+            staged_path=_stage(picture.file, file_name),
+            file_name=file_name,
+        )
+
+    if upload_mode() == 'thread':
+        transaction.on_commit(lambda: dispatch(upload.pk))
+
+    return contact
+
+
+def _stage(file, file_name):
+    directory = staging_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{uuid4()}_{file_name}')
+
+    # Uploads grandes já estão num arquivo temporário: basta movê-lo
+    if hasattr(file, 'temporary_file_path'):
+        file_move_safe(file.temporary_file_path(), path)
+        return path
+
+    with open(path, 'wb') as destination:
+        for chunk in file.chunks():
+            destination.write(chunk)
+    return path
+
+
+def dispatch(upload_id, delay=0):
+    """Agenda o envio no pool de threads do processo."""
+    if delay > 0:
+        timer = threading.Timer(delay, dispatch, args=(upload_id,))
+        timer.daemon = True
+        timer.start()
+        return
+
+    _get_executor().submit(_run_in_thread, upload_id)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(getattr(settings, 'CONTACT_PICTURE_UPLOAD_WORKERS', 2)),
+                thread_name_prefix='picture-upload',
+            )
+        return _executor
+
+
+def _run_in_thread(upload_id):
+    close_old_connections()
+    try:
+        upload = process(upload_id)
+        if upload is not None and upload.status == PictureUpload.STATUS_PENDING:
+            dispatch(upload_id, delay=(upload.next_attempt_at - timezone.now()).total_seconds())
+    except Exception:
+        logger.exception('Erro ao processar o envio de foto %s', upload_id)
+    finally:
+        # Cada thread tem a sua conexão; não deixa nenhuma aberta
+        connection.close()
+
+
+def claim(upload_id):
+    """
+    Reserva o envio para este worker (UPDATE condicional, seguro entre
+    processos). Retorna o ``PictureUpload`` ou ``None`` se outro já pegou.
+    """
+    now = timezone.now()
+    claimed = PictureUpload.objects.filter(
+        pk=upload_id,
+        status=PictureUpload.STATUS_PENDING,
+        next_attempt_at__lte=now,
+    ).update(next_attempt_at=now + LEASE)
+
+    if not claimed:
+        return None
+    return PictureUpload.objects.select_related('contact').filter(pk=upload_id).first()
+
+
+def due_uploads(limit=100):
+    return list(
+        PictureUpload.objects
+        .filter(status=PictureUpload.STATUS_PENDING, next_attempt_at__lte=timezone.now())
+        .order_by('next_attempt_at')
+        .values_list('pk', flat=True)[:limit]
+    )
+
+
+def process(upload_id):
+    """Envia a foto ao storage. Retorna o ``PictureUpload`` (ou ``None``)."""
+    upload = claim(upload_id)
+    if upload is None:
+        return None
+
+    contact = upload.contact
+    try:
+        with open(upload.staged_path, 'rb') as staged:
+            contact.picture = File(staged, name=upload.file_name)
+            _store_picture(contact)
+    except Exception as error:
+        return _failed(upload, contact, error)
+
+    with transaction.atomic():
+        # O envio pode ter sido apagado durante o upload (contato excluído ou
+        # foto mais nova em save_contact): a trava impede que isso aconteça
+        # entre a verificação e o save
+        current = PictureUpload.objects.select_for_update().filter(pk=upload.pk).exists()
+        if current:
+            contact.picture_status = Contact.PICTURE_READY
+            contact.save(update_fields=['picture', 'picture_variants', 'picture_status'])
+            # O post_delete de PictureUpload remove o arquivo local
+            upload.delete()
+
+    if not current:
+        logger.info('Envio da foto %s descartado: contato apagado ou foto substituída', upload.pk)
+        _discard_picture(contact)
+        return None
+
+    picture_uploaded.send(sender=Contact, contact=contact, upload=upload)
+    return upload
+
+
+def _store_picture(contact):
+    """Envia a foto e as miniaturas ao storage, sem gravar o contato."""
+    contact._process_picture()
+    picture = contact.picture
+    picture.save(picture.name, picture.file, save=False)
+
+
+def _discard_picture(contact):
+    storage = contact.picture.storage
+    for name in (contact.picture.name, *contact.picture_variants.values()):
+        storage.delete(name)
+
+
+def _failed(upload, contact, error):
+    if not PictureUpload.objects.filter(pk=upload.pk).exists():
+        # Contato apagado ou foto substituída durante o envio
+        return None
+
+    upload.attempts += 1
+    upload.last_error = str(error)
+
+    if upload.attempts >= max_attempts():
+        upload.status = PictureUpload.STATUS_FAILED
+        upload.save(update_fields=['attempts', 'last_error', 'status'])
+        # update() não dispara post_save: invalida a listagem manualmente
+        Contact.objects.filter(pk=contact.pk).update(
+            picture_status=Contact.PICTURE_FAILED, version=F('version') + 1, updated_at=timezone.now(),
+        )
+        contact_cache.bump_owner_version_on_commit(contact.owner_id)
+        contact.picture_status = Contact.PICTURE_FAILED
+        logger.error('Envio da foto %s desistido após %s tentativas: %s', upload.pk, upload.attempts, error)
+        picture_upload_failed.send(sender=Contact, contact=contact, upload=upload, error=error)
+        return upload
+
+    upload.next_attempt_at = timezone.now() + retry_delay(upload.attempts)
+    upload.save(update_fields=['attempts', 'last_error', 'next_attempt_at'])
+    logger.warning('Envio da foto %s falhou (tentativa %s): %s', upload.pk, upload.attempts, error)
+    return upload
@@ -1,21 +1,41 @@
 from contact import views
+from django.conf import settings
 from django.urls import path
 
 app_name = 'contact'
 
+# No modo ASGI as views de leitura usam as versões async (contact_async.py)
+if getattr(settings, 'CONTACT_ASYNC_VIEWS', False):
+    index_view, search_view, contact_view = views.aindex, views.asearch, views.acontact
+else:
+    index_view, search_view, contact_view = views.index, views.search, views.contact
+
 urlpatterns = [
-    path('', views.index, name='index'),
-    path("search/", views.search, name="search"),
+    path('', index_view, name='index'),
+    path("search/", search_view, name="search"),
 
 
-    path('contact/<int:contact_id>/', views.contact, name='contact'),
+    path('contact/<int:contact_id>/', contact_view, name='contact'),
+    path('contact/<int:contact_id>/picture/', views.picture, name='picture'),
     path('contact/create/', views.create, name='create'),
+    path('contact/import/', views.import_contacts, name='import'),
+    path('contact/export/', views.export_contacts, name='export'),
     path('contact/<int:contact_id>/update/', views.update, name='update'),
     path('contact/<int:contact_id>/delete/', views.delete, name='delete'),
+    path('contact/bulk/', views.bulk_action, name='bulk'),
+    path('contact/hidden/', views.hidden, name='hidden'),
 
 
     path('user/create/', views.register, name='register'),
     path('user/login/', views.login_view, name='login'),
     path('user/logout/', views.logout_view, name='logout'),
     path('user/update/', views.user_update, name='user_update'),
+
+
+    # API JSON (contact/views/contact_api.py)
+    path('api/contacts/', views.api_contacts, name='api_contacts'),
+    path('api/contacts/sync/', views.api_sync, name='api_sync'),
+    path('api/contacts/bulk/', views.api_bulk, name='api_bulk'),
+    path('api/contacts/autocomplete/', views.api_autocomplete, name='api_autocomplete'),
+    path('api/contacts/<int:contact_id>/', views.api_contact, name='api_contact'),
 ]
@@ -0,0 +1,117 @@
+"""
+Regras de validação dos campos de contato.
+
+Usadas pelo ``ContactForm`` (clean_<campo>) e pela importação em lote, que
+valida milhares de linhas sem montar um formulário por linha. Cada função
+recebe o valor já sem espaços nas pontas e devolve o valor limpo ou levanta
+``ValidationError``.
+"""
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from contact.models import Contact
+
+
+def clean_first_name(first_name):
+    if not first_name:
+        raise ValidationError("Nome é obrigatório.", code='invalid')
+
+    if len(first_name.strip()) < 2:
+        raise ValidationError("Nome deve ter pelo menos 2 caracteres.", code='invalid')
+
+    # Permitir acentos e espaços, apenas não permitir números
+    if any(char.isdigit() for char in first_name):
+        raise ValidationError("Nome não pode conter números.", code='invalid')
+
+    return first_name.strip().title()
+
+
+def clean_last_name(last_name):
+    if last_name:  # Campo opcional
+        if len(last_name.strip()) < 2:
+            raise ValidationError("Sobrenome deve ter pelo menos 2 caracteres.", code='invalid')
+
+        if any(char.isdigit() for char in last_name):
+            raise ValidationError("Sobrenome não pode conter números.", code='invalid')
+
+        return last_name.strip().title()
+
+    return last_name
+
+
+def clean_phone(phone):
+    if not phone:
+        raise ValidationError("Telefone é obrigatório.", code='invalid')
+
+    # Remove caracteres especiais e espaços
+    phone_digits = ''.join(filter(str.isdigit, phone))
+
+    if len(phone_digits) < 10:
+        raise ValidationError("Telefone deve ter pelo menos 10 dígitos.", code='invalid')
+
+    if len(phone_digits) > 15:
+        raise ValidationError("Telefone deve ter no máximo 15 dígitos.", code='invalid')
+
+    return phone_digits
+
+
+def clean_email(email):
+    if email:  # Campo opcional
+        if '@' not in email or '.' not in email.split('@')[-1]:
+            raise ValidationError("Insira um endereço de e-mail válido.", code='invalid')
+        return email.lower().strip()
+
+    return email
+
+
+def clean_description(description):
+    if description:  # Campo opcional
+        if len(description.strip()) < 5:
+            raise ValidationError("Descrição deve ter pelo menos 5 caracteres.", code='invalid')
+        return description.strip()
+
+    return description
+
+
+CLEANERS = {
+    'first_name': clean_first_name,
+    'last_name': clean_last_name,
+    'phone': clean_phone,
+    'email': clean_email,
+    'description': clean_description,
+}
+
+
+def _max_length(field_name):
+    return Contact._meta.get_field(field_name).max_length
+
+
+MAX_LENGTHS = {name: _max_length(name) for name in CLEANERS}
+
+
+def validate_contact_data(data):
+    """
+    Valida um dict ``{campo: texto}`` como o ContactForm faria (tamanho
+    máximo, formato do e-mail e as regras acima). Retorna
+    ``(dados_limpos, erros)``, com ``erros`` no formato ``{campo: mensagem}``.
+    """
+    cleaned = {}
+    errors = {}
+
+    for name, cleaner in CLEANERS.items():
+        value = (data.get(name) or '').strip()
+
+        try:
+            limit = MAX_LENGTHS[name]
+            if limit and len(value) > limit:
+                raise ValidationError(
+                    f"Certifique-se de que o valor tenha no máximo {limit} caracteres (ele possui {len(value)}).",
+                    code='max_length',
+                )
+            if name == 'email' and value:
+                validate_email(value)
+            cleaned[name] = cleaner(value)
+        except ValidationError as error:
+            errors[name] = ' '.join(error.messages)
+
+    return cleaned, errors
@@ -1,3 +1,8 @@
 from .contact_views import *
 from .contact_forms import *
-from .user_forms import *
\ No newline at end of file
+from .user_forms import *
+from .contact_import import *
+from .contact_export import *
+from .contact_async import *
+from .contact_api import *
+from .contact_bulk import *
\ No newline at end of file
@@ -0,0 +1,279 @@
+"""
+API JSON dos contatos do usuário logado (autenticação pela sessão; nos
+métodos que alteram dados envie o cabeçalho ``X-CSRFToken``).
+
+    GET    /api/contacts/?cursor=...&limit=50   lista (mais recentes primeiro)
+    POST   /api/contacts/                        cria
+    GET    /api/contacts/<id>/                   detalhe
+    PUT    /api/contacts/<id>/                   substitui
+    PATCH  /api/contacts/<id>/                   altera só os campos enviados
+    DELETE /api/contacts/<id>/                   apaga
+    GET    /api/contacts/sync/?token=...&limit=500  alterações desde o token
+    GET    /api/contacts/autocomplete/?q=pre&limit=8  contatos que começam com ``q``
+    POST   /api/contacts/bulk/                   ação em lote (contact/bulk.py)
+
+Toda resposta leva um ETag forte derivado de ``Contact.version`` (na lista,
+das versões dos contatos da página). Com ``If-None-Match`` igual a resposta
+é ``304`` sem serializar nada: uma consulta indexada, sem JSON. ``PUT``,
+``PATCH`` e ``DELETE`` aceitam ``If-Match`` e respondem ``412`` se o contato
+mudou desde a versão que o cliente tem.
+
+A sincronização (contact/sync.py) devolve só os contatos alterados e os ids
+apagados desde o ``token`` da resposta anterior; ``410`` pede que o cliente
+baixe tudo de novo, sem token.
+"""
+import hashlib
+import json
+from functools import wraps
+
+from django.forms.models import model_to_dict
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from django.views.decorators.http import require_http_methods
+
+from contact import autocomplete, bulk, sync, uploads
+from contact.forms import BulkActionForm, ContactForm, category_choices
+from contact.models import Contact
+from contact.pagination import KeysetPaginator
+from contact.query_budget import query_budget
+
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+
+EDITABLE_FIELDS = ('first_name', 'last_name', 'phone', 'email', 'description', 'category')
+
+
+def api_login_required(view):
+    """Como login_required, mas responde 401 em JSON em vez de redirecionar."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'error': 'Autenticação necessária.'}, status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def serialize_contact(contact):
+    category = contact.category
+    return {
+        'id': contact.pk,
+        'first_name': contact.first_name,
+        'last_name': contact.last_name,
+        'phone': contact.phone,
+        'email': contact.email,
+        'description': contact.description,
+        'category': {'id': category.pk, 'name': category.name} if category else None,
+        'picture': contact.picture_url() or None,
+        'picture_status': contact.picture_status,
+        'create_date': contact.create_date.isoformat(),
+        'version': contact.version,
+    }
+
+
+def contact_etag(contact):
+    return quote_etag(f'{contact.pk}-{contact.version}')
+
+
+def page_etag(page, per_page):
+    state = [per_page, page.has_next, page.has_previous, [(row.pk, row.version) for row in page]]
+    return quote_etag(hashlib.sha256(json.dumps(state).encode()).hexdigest()[:32])
+
+
+def _etag_matches(header, etag, weak=True):
+    if not header:
+        return False
+    etags = parse_etags(header)
+    if weak:
+        # If-None-Match usa comparação fraca: W/"x" equivale a "x"
+        etags = [value.removeprefix('W/') for value in etags]
+    return '*' in etags or etag in etags
+
+
+def _response(data, etag, status=200):
+    response = JsonResponse(data, status=status)
+    return _with_etag(response, etag)
+
+
+def _with_etag(response, etag):
+    response['ETag'] = etag
+    # O cliente pode guardar, mas deve revalidar (If-None-Match) a cada uso
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _not_modified(etag):
+    return _with_etag(HttpResponse(status=304), etag)
+
+
+def _read_json(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _invalid(errors):
+    return JsonResponse({'errors': errors}, status=400)
+
+
+# Lista: sessão, usuário e a página; criação: + a existência da categoria
+# (validação do ForeignKey), o INSERT e o contador da categoria
+@query_budget(5)
+@api_login_required
+@require_http_methods(['GET', 'POST'])
+def api_contacts(request):
+    if request.method == 'POST':
+        return _create(request)
+
+    limit = request.GET.get('limit', '')
+    per_page = min(int(limit), API_MAX_PAGE_SIZE) if limit.isdigit() and int(limit) > 0 else API_PAGE_SIZE
+
+    paginator = KeysetPaginator(
+        Contact.objects.filter(owner=request.user, show=True).select_related('category'),
+        per_page,
+    )
+    page = paginator.get_page(request.GET.get('cursor'))
+
+    etag = page_etag(page, per_page)
+    if _etag_matches(request.headers.get('If-None-Match'), etag):
+        return _not_modified(etag)
+
+    url = reverse('contact:api_contacts')
+    return _response({
+        'results': [serialize_contact(contact) for contact in page],
+        'next': f'{url}?limit={per_page}&cursor={page.next_cursor}' if page.next_cursor else None,
+        'previous': f'{url}?limit={per_page}&cursor={page.previous_cursor}' if page.previous_cursor else None,
+    }, etag)
+
+
+def _create(request):
+    data = _read_json(request)
+    if data is None:
+        return _invalid({'__all__': ['Envie um objeto JSON.']})
+
+    form = ContactForm(data)
+    if not form.is_valid():
+        return _invalid(form.errors)
+
+    contact = form.save(commit=False)
+    contact.owner = request.user
+    uploads.save_contact(contact)
+
+    response = _response(serialize_contact(contact), contact_etag(contact), status=201)
+    response['Location'] = reverse('contact:api_contact', args=(contact.pk,))
+    return response
+
+
+# Leitura: sessão, usuário e o contato; alteração: + UPDATE, os contadores da
+# categoria antiga e da nova (se mudou) e a releitura da nova versão
+@query_budget(7)
+@api_login_required
+@require_http_methods(['GET', 'PUT', 'PATCH', 'DELETE'])
+def api_contact(request, contact_id):
+    contact = (
+        Contact.objects.select_related('category')
+        .filter(pk=contact_id, show=True, owner=request.user)
+        .first()
+    )
+    if contact is None:
+        return JsonResponse({'error': 'Contato não encontrado.'}, status=404)
+
+    etag = contact_etag(contact)
+
+    if request.method == 'GET':
+        if _etag_matches(request.headers.get('If-None-Match'), etag):
+            return _not_modified(etag)
+        return _response(serialize_contact(contact), etag)
+
+    if_match = request.headers.get('If-Match')
+    if if_match and not _etag_matches(if_match, etag, weak=False):
+        return _with_etag(
+            JsonResponse({'error': 'O contato foi alterado por outra requisição.'}, status=412), etag,
+        )
+
+    if request.method == 'DELETE':
+        contact.delete()
+        return HttpResponse(status=204)
+
+    data = _read_json(request)
+    if data is None:
+        return _invalid({'__all__': ['Envie um objeto JSON.']})
+
+    if request.method == 'PATCH':
+        data = {**model_to_dict(contact, fields=EDITABLE_FIELDS), **data}
+
+    form = ContactForm(data, instance=contact)
+    if not form.is_valid():
+        return _invalid(form.errors)
+
+    contact = uploads.save_contact(form.save(commit=False))
+    return _response(serialize_contact(contact), contact_etag(contact))
+
+
+# Sessão, usuário, contatos alterados e contatos apagados
+@query_budget(4)
+@api_login_required
+@require_http_methods(['GET'])
+def api_sync(request):
+    limit = request.GET.get('limit', '')
+    limit = min(int(limit), sync.MAX_BATCH_SIZE) if limit.isdigit() and int(limit) > 0 else sync.BATCH_SIZE
+
+    try:
+        batch = sync.changes(request.user, request.GET.get('token'), limit)
+    except sync.InvalidToken as error:
+        return _invalid({'token': [str(error)]})
+    except sync.TokenExpired as error:
+        return JsonResponse({'error': str(error)}, status=410)
+
+    response = JsonResponse({
+        'results': [serialize_contact(contact) for contact in batch['contacts']],
+        'deleted': batch['deleted'],
+        'token': batch['token'],
+        'has_more': batch['has_more'],
+    })
+    patch_cache_control(response, private=True, no_store=True)
+    return response
+
+
+# Sessão, usuário, a categoria (mover), as linhas afetadas (travadas), a ação
+# (uma consulta, ou três ao excluir: envios de foto, DELETE e registros da
+# exclusão) e os contadores por categoria (até dois upserts), qualquer que
+# seja a quantidade de ids
+@query_budget(8)
+@api_login_required
+@require_http_methods(['POST'])
+def api_bulk(request):
+    """``{"action": "delete|hide|restore|move", "ids": [...], "category": id}``"""
+    data = _read_json(request)
+    if data is None:
+        return _invalid({'__all__': ['Envie um objeto JSON.']})
+
+    categories = category_choices() if data.get('action') == bulk.MOVE else ()
+    form = BulkActionForm(data, categories=categories)
+    if not form.is_valid():
+        return _invalid(form.errors)
+
+    action = form.cleaned_data['action']
+    try:
+        count = bulk.apply(request.user, action, form.cleaned_data['ids'], form.cleaned_data.get('category'))
+    except bulk.CategoryNotFound as error:
+        return _invalid({'category': [str(error)]})
+    return JsonResponse({'action': action, 'count': count})
+
+
+# Sessão, usuário e a busca por prefixo (nenhuma com o prefixo no cache)
+@query_budget(3)
+@api_login_required
+@require_http_methods(['GET'])
+def api_autocomplete(request):
+    limit = request.GET.get('limit', '')
+    limit = min(int(limit), autocomplete.MAX_LIMIT) if limit.isdigit() and int(limit) > 0 else autocomplete.LIMIT
+
+    results = autocomplete.suggest(request.user.pk, request.GET.get('q', ''), limit)
+
+    response = JsonResponse({'results': results})
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,124 @@
+"""
+Versões ``async`` das views de leitura (index, search, contact).
+
+Usadas no modo ASGI (``CONTACT_ASYNC_VIEWS``, ligado por project/asgi.py):
+enquanto esperam o banco ou o cache elas liberam o event loop em vez de
+prender uma thread. Todo acesso ao banco é feito pelo ORM assíncrono antes
+de renderizar; o template recebe só objetos já carregados.
+"""
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import aget_object_or_404, redirect, render
+from django.template.loader import render_to_string
+
+from contact import bulk, cache as contact_cache
+from contact.facets import acategory_facets, filter_category, selected_category
+from contact.forms import BulkActionForm, acategory_choices
+from contact.models import Contact
+from contact.pagination import apaginate_contacts
+from contact.query_budget import query_budget
+from contact.search import search_contacts
+
+
+async def _get_user(request):
+    user = await request.auser()
+    # O context processor de auth lê request.user: já carregado, sem consulta síncrona
+    request.user = user
+    return user
+
+
+# sessão, usuário, contadores por categoria, página e, no PostgreSQL, a
+# estimativa do total (EXPLAIN); as categorias vêm de contact/categories.py
+@query_budget(5)
+@login_required(login_url='contact:login')
+async def asearch(request):
+    search_value = request.GET.get("q", '').strip()
+
+    if search_value == '':
+        return redirect('contact:index')
+
+    user = await _get_user(request)
+    selected = selected_category(request)
+    contacts = search_contacts(
+        filter_category(Contact.objects.filter(show=True, owner=user), selected),
+        search_value,
+    )
+
+    page_obj = await apaginate_contacts(request, contacts)
+    facets, _ = await acategory_facets(request, user, selected)
+
+    context = {
+        'page_obj': page_obj,
+        'facets': facets,
+        'bulk_form': BulkActionForm(actions=bulk.LIST_ACTIONS, categories=await acategory_choices()),
+        'site_title': 'Search -'
+    }
+
+    return render(
+        request,
+        'contact/index.html',
+        context
+    )
+
+
+# sessão, usuário, contadores por categoria e página; o total vem dos
+# contadores, sem COUNT nem EXPLAIN
+@query_budget(4)
+@login_required(login_url='contact:login')
+async def aindex(request):
+    user = await _get_user(request)
+    cache_key = await contact_cache.alist_cache_key(user.pk, request.GET.urlencode())
+    contact_list = await contact_cache.aget_list_fragment(cache_key)
+
+    if contact_list is None:
+        selected = selected_category(request)
+        facets, count = await acategory_facets(request, user, selected)
+
+        contacts = filter_category(
+            Contact.objects.filter(owner=user, show=True),
+            selected,
+        ).order_by('-id')
+
+        page_obj = await apaginate_contacts(request, contacts, count=count)
+
+        contact_list = render_to_string(
+            'contact/partials/_contact_list.html',
+            {'page_obj': page_obj, 'facets': facets},
+            request=request,
+        )
+        await contact_cache.aset_list_fragment(cache_key, contact_list)
+
+    context = {
+        'contact_list': contact_list,
+        'bulk_form': BulkActionForm(actions=bulk.LIST_ACTIONS, categories=await acategory_choices()),
+        'site_title': 'Meus Contatos'
+    }
+
+    return render(
+        request,
+        'contact/index.html',
+        context
+    )
+
+
+@query_budget(3)
+@login_required(login_url='contact:login')
+async def acontact(request, contact_id):
+    user = await _get_user(request)
+    # select_related: o template mostra contact.category.name
+    single_contact = await aget_object_or_404(
+        Contact.objects.select_related('category'),
+        pk=contact_id, show=True, owner=user
+    )
+
+    site_title = f'{single_contact.first_name} {single_contact.last_name} -'
+
+    context = {
+        'contact': single_contact,
+        'site_title': site_title
+    }
+
+    return render(
+        request,
+        'contact/contact.html',
+        context
+    )
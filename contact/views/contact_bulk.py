@@ -0,0 +1,72 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect, render
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
+
+from contact import bulk
+from contact.forms import BulkActionForm, category_choices
+from contact.models import Contact
+from contact.pagination import paginate_contacts
+from contact.query_budget import query_budget
+
+SUCCESS_MESSAGES = {
+    bulk.DELETE: '{count} contato(s) excluído(s).',
+    bulk.HIDE: '{count} contato(s) ocultado(s).',
+    bulk.RESTORE: '{count} contato(s) restaurado(s).',
+    bulk.MOVE: '{count} contato(s) movido(s).',
+}
+
+
+def _redirect_back(request):
+    next_url = request.POST.get('next', '')
+    if url_has_allowed_host_and_scheme(next_url, {request.get_host()}, request.is_secure()):
+        return redirect(next_url)
+    return redirect('contact:index')
+
+
+# Sessão, usuário, a categoria (mover), as linhas afetadas (travadas), a ação
+# (excluir: envios de foto, DELETE e registros da exclusão) e os contadores
+# por categoria (um upsert com e outro sem categoria), qualquer que seja a
+# quantidade de ids
+@query_budget(8)
+@require_POST
+@login_required(login_url='contact:login')
+def bulk_action(request):
+    form = BulkActionForm(request.POST, categories=category_choices())
+
+    if not form.is_valid():
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return _redirect_back(request)
+
+    action = form.cleaned_data['action']
+    try:
+        count = bulk.apply(request.user, action, form.cleaned_data['ids'], form.cleaned_data.get('category'))
+    except bulk.CategoryNotFound as error:
+        messages.error(request, str(error))
+        return _redirect_back(request)
+
+    messages.success(request, SUCCESS_MESSAGES[action].format(count=count))
+    return _redirect_back(request)
+
+
+# sessão, usuário, página e, no PostgreSQL, a estimativa do total (EXPLAIN)
+@query_budget(4)
+@login_required(login_url='contact:login')
+def hidden(request):
+    contacts = Contact.objects.filter(owner=request.user, show=False).order_by('-id')
+    page_obj = paginate_contacts(request, contacts)
+
+    context = {
+        'page_obj': page_obj,
+        'bulk_form': BulkActionForm(actions=bulk.HIDDEN_ACTIONS),
+        'site_title': 'Ocultos -',
+    }
+
+    return render(
+        request,
+        'contact/index.html',
+        context
+    )
@@ -0,0 +1,25 @@
+from django.http import Http404, StreamingHttpResponse
+from django.contrib.auth.decorators import login_required
+from contact.models import Contact
+from contact import exporter
+from contact.query_budget import query_budget
+
+
+@query_budget(3)
+@login_required(login_url='contact:login')
+def export_contacts(request):
+    file_format = request.GET.get('format', 'csv')
+
+    if file_format not in exporter.FORMATS:
+        raise Http404('Formato de exportação inválido.')
+
+    content_type, extension = exporter.FORMATS[file_format]
+    contacts = Contact.objects.filter(owner=request.user, show=True)
+
+    # Gerado sob demanda enquanto é enviado; nada é montado em memória
+    response = StreamingHttpResponse(
+        exporter.export_contacts(contacts, file_format),
+        content_type=content_type,
+    )
+    response['Content-Disposition'] = f'attachment; filename="contatos.{extension}"'
+    return response
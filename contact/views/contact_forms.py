@@ -3,11 +3,16 @@ from django.shortcuts import redirect,get_object_or_404, render
 from django.db.models import Q
 from contact.forms import ContactForm
 from contact.models import Contact
+from contact import uploads
 from django.core.paginator import Paginator
 from django.urls import reverse
 from django.contrib.auth.decorators import login_required
+from contact.query_budget import query_budget
 
 
+# sessão, usuário, a existência da categoria (validação do ForeignKey), o
+# INSERT e o contador da categoria do novo contato (CategoryCount)
+@query_budget(5)
 @login_required(login_url='contact:login')
 def create(request):
     form_action = reverse('contact:create')
@@ -19,14 +24,12 @@ def create(request):
         'form': form,
         'form_action': form_action,
         }
-        
-        print(form)
     
         if form.is_valid():
          
             contact = form.save(commit=False)
             contact.owner = request.user
-            contact.save()
+            uploads.save_contact(contact)
             return redirect('contact:index')
         
         
@@ -48,6 +51,9 @@ def create(request):
         context
         )
 
+# o save() relê a versão incrementada no banco (Contact.version) e, se a
+# categoria mudou, ajusta os contadores da antiga e da nova (CategoryCount)
+@query_budget(7)
 @login_required(login_url='contact:login')
 def update(request, contact_id):
     contact = get_object_or_404(Contact, pk=contact_id, show=True, owner = request.user)
@@ -63,7 +69,7 @@ def update(request, contact_id):
         }
     
         if form.is_valid():
-            contact = form.save()
+            contact = uploads.save_contact(form.save(commit=False))
             return redirect('contact:contact', contact_id=contact.pk)
 
         return render(
@@ -83,9 +89,15 @@ def update(request, contact_id):
         context
         )
 
+# inclui o registro da exclusão para a sincronização (ContactTombstone) e o
+# contador da categoria (CategoryCount)
+@query_budget(7)
 @login_required(login_url='contact:login')
 def delete(request, contact_id):
-    contact = get_object_or_404(Contact, pk=contact_id, show=True)
+    contact = get_object_or_404(
+        Contact.objects.select_related('category'),
+        pk=contact_id, show=True, owner=request.user
+    )
     confirmation = request.POST.get('confirmation','no')
 
     if confirmation == 'yes':
@@ -0,0 +1,43 @@
+from django.shortcuts import render
+from django.urls import reverse
+from django.contrib.auth.decorators import login_required
+from contact.forms import ContactImportForm
+from contact import importer
+from contact.query_budget import query_budget
+
+
+# Isenta: por lote de importer.BATCH_SIZE linhas, o INSERT (dividido pelo
+# limite de parâmetros do banco: um no PostgreSQL, vários no SQLite) e os
+# contadores por categoria; cresce com o tamanho do arquivo
+@query_budget(None)
+@login_required(login_url='contact:login')
+def import_contacts(request):
+    form_action = reverse('contact:import')
+    report = None
+
+    if request.method == 'POST':
+        form = ContactImportForm(request.POST, request.FILES)
+
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            file_format = importer.detect_format(upload.name, upload.read(64))
+            upload.seek(0)
+
+            # Lido em streaming; uploads grandes ficam em arquivo temporário
+            report = importer.import_contacts(request.user, upload, file_format)
+            form = ContactImportForm()
+    else:
+        form = ContactImportForm()
+
+    context = {
+        'form': form,
+        'form_action': form_action,
+        'report': report,
+        'site_title': 'Importar -',
+    }
+
+    return render(
+        request,
+        'contact/import.html',
+        context
+    )
@@ -1,9 +1,19 @@
 from django.shortcuts import redirect,get_object_or_404, render
-from django.db.models import Q
+from django.template.loader import render_to_string
+from django.http import Http404
 from contact.models import Contact
-from django.core.paginator import Paginator
+from contact.search import search_contacts
+from contact.pagination import paginate_contacts
+from contact import cache as contact_cache
 from django.contrib.auth.decorators import login_required
+from contact.query_budget import query_budget
+from contact import bulk
+from contact.facets import category_facets, filter_category, selected_category
+from contact.forms import BulkActionForm, category_choices
 
+# sessão, usuário, contadores por categoria, página e, no PostgreSQL, a
+# estimativa do total (EXPLAIN); as categorias vêm de contact/categories.py
+@query_budget(5)
 @login_required(login_url='contact:login')
 def search(request):
     search_value = request.GET.get("q",'').strip()
@@ -11,21 +21,21 @@ def search(request):
     if search_value == '':
         return redirect('contact:index')
 
-    contacts = Contact.objects.filter(show=True,
-                       owner=request.user               
-                                      )\
-    .filter(
-        Q(first_name__icontains=search_value) |
-        Q(last_name__icontains=search_value) |
-        Q(phone__icontains=search_value) |
-        Q(email__icontains= search_value)).order_by('-id')
+    # Busca indexada e ordenada por relevância (ver contact/search.py)
+    selected = selected_category(request)
+    contacts = search_contacts(
+        filter_category(Contact.objects.filter(show=True, owner=request.user), selected),
+        search_value,
+    )
 
-    paginator = Paginator(contacts, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate_contacts(request, contacts)
+    # As quantidades do painel são da agenda toda, não só dos resultados
+    facets, _ = category_facets(request, request.user, selected)
 
     context = {
         'page_obj': page_obj,
+        'facets': facets,
+        'bulk_form': BulkActionForm(actions=bulk.LIST_ACTIONS, categories=category_choices()),
         'site_title':'Search -'
     }
 
@@ -35,21 +45,40 @@ def search(request):
         context
     )
 
+# sessão, usuário, contadores por categoria e página; o total vem dos
+# contadores, sem COUNT nem EXPLAIN
+@query_budget(4)
 @login_required(login_url='contact:login')
 def index(request):
- 
-    contacts = Contact.objects.filter(
-        owner=request.user, 
-        show=True
-    ).order_by('-id')
-
-    # Paginação dos resultados
-    paginator = Paginator(contacts, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
-    
+    # Fragmento (tabela + paginação) em cache por dono/página; uma página em
+    # cache não toca o banco (ver contact/cache.py)
+    cache_key = contact_cache.list_cache_key(request.user.pk, request.GET.urlencode())
+    contact_list = contact_cache.get_list_fragment(cache_key)
+
+    if contact_list is None:
+        # Filtro e painel por categoria (ver contact/facets.py); os contadores
+        # mudam junto com a versão do dono, então o painel também vai no cache
+        selected = selected_category(request)
+        facets, count = category_facets(request, request.user, selected)
+
+        contacts = filter_category(
+            Contact.objects.filter(owner=request.user, show=True),
+            selected,
+        ).order_by('-id')
+
+        # Paginação dos resultados (keyset ou offset, ver contact/pagination.py)
+        page_obj = paginate_contacts(request, contacts, count=count)
+
+        contact_list = render_to_string(
+            'contact/partials/_contact_list.html',
+            {'page_obj': page_obj, 'facets': facets},
+            request=request,
+        )
+        contact_cache.set_list_fragment(cache_key, contact_list)
+
     context = {
-        'page_obj': page_obj,
+        'contact_list': contact_list,
+        'bulk_form': BulkActionForm(actions=bulk.LIST_ACTIONS, categories=category_choices()),
         'site_title':'Meus Contatos'
     }
 
@@ -59,12 +88,14 @@ def index(request):
         context
     )
 
+@query_budget(3)
 @login_required(login_url='contact:login')
 def contact(request, contact_id):
     # single_contact = Contact.objects.filter(pk=contact_id).first()
+    # select_related: o template mostra contact.category.name
     single_contact = get_object_or_404(
-        Contact, pk=contact_id, show=True, owner=request.user
-        
+        Contact.objects.select_related('category'),
+        pk=contact_id, show=True, owner=request.user
     )
 
     site_title = f'{single_contact.first_name} {single_contact.last_name} -' 
@@ -80,3 +111,19 @@ def contact(request, contact_id):
         context
     )
 
+
+@query_budget(3)
+@login_required(login_url='contact:login')
+def picture(request, contact_id):
+    """Redireciona para a menor variante da foto com pelo menos ``?w=`` px."""
+    single_contact = get_object_or_404(
+        Contact, pk=contact_id, show=True, owner=request.user
+    )
+
+    if not single_contact.picture:
+        raise Http404('Contato sem foto.')
+
+    width = request.GET.get('w', '')
+    url = single_contact.picture_url(int(width) if width.isdigit() else None)
+
+    return redirect(url)
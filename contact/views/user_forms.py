@@ -5,7 +5,10 @@ from contact.forms import RegisterUpdateForm
 from django.contrib import auth
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.decorators import login_required
+from contact.query_budget import query_budget
 
+# nome de usuário livre?, INSERT do usuário e do perfil
+@query_budget(3)
 def register(request):
     form = RegisterForm()
     
@@ -28,6 +31,8 @@ def register(request):
         }
     )
 
+# sessão, usuário, e-mail e nome de usuário livres e o UPDATE
+@query_budget(5)
 @login_required(login_url='contact:login')
 def user_update(request):
     form = RegisterUpdateForm(instance=request.user)
@@ -59,6 +64,9 @@ def user_update(request):
 
 
 
+# usuário, a nova sessão (existe? e INSERT), last_login e a sessão com o
+# usuário logado
+@query_budget(5)
 def login_view(request):
     form = AuthenticationForm(request)
 
@@ -79,6 +87,7 @@ def login_view(request):
         }
     )
 
+@query_budget(4)
 @login_required(login_url='contact:login')
 def logout_view(request):
     auth.logout(request)
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+# Modo ASGI: views de leitura async (CONTACT_ASYNC_VIEWS em project/settings.py)
+os.environ.setdefault('CONTACT_ASYNC_VIEWS', 'true')
 
 application = get_asgi_application()
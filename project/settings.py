@@ -6,6 +6,7 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 
 load_dotenv()
@@ -43,8 +44,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primeiro, para contar também as consultas de sessão e autenticação
+    'contact.query_budget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'contact.middleware.WhiteNoiseMiddleware',  # WhiteNoise com suporte a ASGI
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -90,6 +93,35 @@ if not DEBUG:
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
 
+# Backend do cache padrão (ver CACHES). Local-memory e dummy não são
+# compartilhados entre workers: o que um processo apaga continua no cache dos
+# outros (sessão encerrada, usuário desativado ou com a senha trocada).
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache')
+SHARED_CACHE = CACHE_BACKEND not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Sessões: 'cached_db' (lidas do cache, gravadas no cache e no banco),
+# 'signed_cookies' (a sessão inteira no cookie assinado, sem consulta nem
+# escrita; o logout não invalida uma cópia do cookie) ou 'db'. O padrão é
+# 'cached_db' só com cache compartilhado.
+CONTACT_SESSION_BACKEND = os.environ.get('CONTACT_SESSION_BACKEND', 'cached_db' if SHARED_CACHE else 'db')
+SESSION_ENGINE = f'django.contrib.sessions.backends.{CONTACT_SESSION_BACKEND}'
+
+# Mensagens só no cookie: nunca gravam na sessão
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+# Usuário logado em cache (contact/auth_backends.py). O ModelBackend fica
+# depois só para as sessões abertas antes dele, que guardam o caminho do backend.
+AUTHENTICATION_BACKENDS = [
+    'contact.auth_backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# Tempo (s) do usuário logado no cache; 0 desliga (padrão sem cache compartilhado)
+CONTACT_USER_CACHE_TIMEOUT = int(os.environ.get('CONTACT_USER_CACHE_TIMEOUT', '60' if SHARED_CACHE else '0'))
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -114,11 +146,91 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Paginação das listas de contatos: 'keyset' (cursor, custo constante por
+# página) ou 'offset' (Paginator do Django). No modo keyset o total pode ser
+# 'none', 'estimate' (planner do PostgreSQL) ou 'exact' (COUNT(*)).
+CONTACT_PAGINATION = os.environ.get('CONTACT_PAGINATION', 'keyset')
+CONTACT_PAGINATION_COUNT = os.environ.get('CONTACT_PAGINATION_COUNT', 'estimate')
+
+# Views de leitura (index, search, contact) assíncronas. Ligado pelo
+# project/asgi.py: sob ASGI elas não prendem uma thread esperando o banco.
+CONTACT_ASYNC_VIEWS = os.environ.get('CONTACT_ASYNC_VIEWS', 'false').lower() == 'true'
+
+# Cache: local-memory por padrão. Com vários workers configure um backend
+# compartilhado (ex.: CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# e CACHE_LOCATION=redis://...) para a invalidação valer em todos.
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+# Tempo (s) de vida dos fragmentos renderizados da lista de contatos
+CONTACT_LIST_CACHE_TIMEOUT = int(os.environ.get('CONTACT_LIST_CACHE_TIMEOUT', '300'))
+
+# Tempo (s) máximo que cada processo reaproveita a lista de categorias em
+# memória (contact/categories.py), mesmo sem ver a versão mudar
+CONTACT_CATEGORY_CACHE_TIMEOUT = int(os.environ.get('CONTACT_CATEGORY_CACHE_TIMEOUT', '60'))
+
+# Entradas do cache em memória (por processo) do autocomplete; 0 desliga
+CONTACT_AUTOCOMPLETE_CACHE_SIZE = int(os.environ.get('CONTACT_AUTOCOMPLETE_CACHE_SIZE', '0'))
+
+# Lados (px) das miniaturas quadradas geradas no upload das fotos de contato
+CONTACT_PICTURE_SIZES = (64, 256, 640)
+
+# Upload da foto: 'sync' (dentro do request), 'thread' (pool de threads do
+# processo) ou 'queue' (comando process_picture_uploads). Nos dois últimos o
+# request só grava o arquivo em CONTACT_PICTURE_STAGING_DIR.
+CONTACT_PICTURE_UPLOAD = os.environ.get('CONTACT_PICTURE_UPLOAD', 'sync')
+CONTACT_PICTURE_STAGING_DIR = os.environ.get('CONTACT_PICTURE_STAGING_DIR', str(BASE_DIR / 'media_staging'))
+CONTACT_PICTURE_UPLOAD_WORKERS = int(os.environ.get('CONTACT_PICTURE_UPLOAD_WORKERS', '2'))
+CONTACT_PICTURE_UPLOAD_RETRIES = int(os.environ.get('CONTACT_PICTURE_UPLOAD_RETRIES', '5'))
+CONTACT_PICTURE_UPLOAD_BACKOFF = float(os.environ.get('CONTACT_PICTURE_UPLOAD_BACKOFF', '5'))
+
+# Sincronização incremental (/api/contacts/sync/): alterações mais novas que
+# CONTACT_SYNC_WINDOW segundos esperam a próxima sincronização (transações
+# ainda abertas, relógios dos servidores); exclusões ficam registradas por
+# CONTACT_SYNC_TOMBSTONE_DAYS dias.
+CONTACT_SYNC_WINDOW = float(os.environ.get('CONTACT_SYNC_WINDOW', '30'))
+CONTACT_SYNC_TOMBSTONE_DAYS = int(os.environ.get('CONTACT_SYNC_TOMBSTONE_DAYS', '90'))
+
+# Chave do ID público dos usuários (contact/public_ids.py). NUNCA pode mudar
+# depois que houver perfis criados: com outra chave todos os IDs públicos
+# mudam (links antigos quebram e os novos podem colidir com os gravados).
+# Por isso não depende da SECRET_KEY, que pode ser trocada (com
+# SECRET_KEY_FALLBACKS). Obrigatória sem DEBUG; instalações que usavam a
+# SECRET_KEY como chave devem definir PUBLIC_ID_KEY com o valor dela.
+PUBLIC_ID_KEY = os.environ.get('PUBLIC_ID_KEY')
+if not PUBLIC_ID_KEY:
+    if not DEBUG:
+        raise ImproperlyConfigured('Defina PUBLIC_ID_KEY (chave fixa dos IDs públicos dos usuários).')
+    # Só em desenvolvimento
+    PUBLIC_ID_KEY = SECRET_KEY
+
 # Storage Configuration for Supabase S3
 SUPABASE_URL = os.environ.get('SUPABASE_URL')
 SUPABASE_BUCKET = os.environ.get('SUPABASE_BUCKET')
 SUPABASE_SERVICE_KEY = os.environ.get('SUPABASE_SERVICE_KEY')
 
+# Cliente HTTP compartilhado do Supabase Storage (pool keep-alive por processo)
+SUPABASE_HTTP_TIMEOUT = float(os.environ.get('SUPABASE_HTTP_TIMEOUT', '20'))
+SUPABASE_HTTP_MAX_CONNECTIONS = int(os.environ.get('SUPABASE_HTTP_MAX_CONNECTIONS', '20'))
+SUPABASE_HTTP_MAX_KEEPALIVE = int(os.environ.get('SUPABASE_HTTP_MAX_KEEPALIVE', '10'))
+SUPABASE_HTTP_KEEPALIVE_EXPIRY = float(os.environ.get('SUPABASE_HTTP_KEEPALIVE_EXPIRY', '60'))
+SUPABASE_HTTP2 = os.environ.get('SUPABASE_HTTP2', 'true')
+
+# Cache (por processo) de metadados dos objetos usados por exists()/size()
+SUPABASE_METADATA_CACHE_SIZE = int(os.environ.get('SUPABASE_METADATA_CACHE_SIZE', '1024'))
+SUPABASE_METADATA_CACHE_TTL = float(os.environ.get('SUPABASE_METADATA_CACHE_TTL', '30'))
+
+# URLs das fotos: públicas (montadas localmente) ou assinadas com expiração.
+# Com SUPABASE_JWT_SECRET as assinaturas também são geradas localmente.
+SUPABASE_SIGNED_URLS = os.environ.get('SUPABASE_SIGNED_URLS', 'false')
+SUPABASE_SIGNED_URL_EXPIRES = int(os.environ.get('SUPABASE_SIGNED_URL_EXPIRES', '3600'))
+SUPABASE_JWT_SECRET = os.environ.get('SUPABASE_JWT_SECRET')
+SUPABASE_URL_CACHE_SIZE = int(os.environ.get('SUPABASE_URL_CACHE_SIZE', '4096'))
+
 # [CORREÇÃO #4] Lógica de armazenamento correta
 if not DEBUG and SUPABASE_URL:
     # Configurações para produção (Supabase)
@@ -148,6 +260,13 @@ DEFAULT_FROM_EMAIL = os.environ.get('SMTP_FROM', EMAIL_HOST_USER)
 RESEND_API_KEY = os.environ.get('RESEND_API_KEY', '')
 RESEND_FROM_EMAIL = os.environ.get('RESEND_FROM_EMAIL')
 
+# Fila de emails (contact/mail.py): as views só enfileiram; o comando
+# send_queued_emails entrega. 'auto' = Resend se houver RESEND_API_KEY,
+# senão SMTP; 'fake' não envia nada (testes).
+EMAIL_QUEUE_BACKEND = os.environ.get('EMAIL_QUEUE_BACKEND', 'auto')
+EMAIL_QUEUE_RETRIES = int(os.environ.get('EMAIL_QUEUE_RETRIES', '6'))
+EMAIL_QUEUE_BACKOFF = float(os.environ.get('EMAIL_QUEUE_BACKOFF', '30'))
+
 # Carregamento de configurações locais (opcional, bom para manter)
 try:
     from project.local_settings import *